@@ -1,35 +1,68 @@
 import polars as pl
+import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 import os
-from src.utils import load_config, get_logger
-from src.features import create_features
+from src.utils import load_config, get_logger, timed
+from src.features import add_rolling_features, create_features, save_processed_data
+from src.data import scan_raw
+from src.feature_store import FeatureStore
+
+def correlation_matrix(lf: pl.LazyFrame) -> pd.DataFrame:
+    """
+    Computes the Pearson correlation matrix of all numeric columns inside Polars.
+    Only the numeric columns are read (projection pushdown) and a single row of
+    pairwise coefficients is collected.
+    """
+    schema = lf.collect_schema()
+    columns = [name for name, dtype in schema.items() if dtype.is_numeric()]
+
+    pairs = [(a, b) for i, a in enumerate(columns) for b in columns[i + 1:]]
+    row = lf.select([pl.corr(a, b).alias(f"{a}|{b}") for a, b in pairs]).collect().row(0)
+
+    matrix = pd.DataFrame(1.0, index=columns, columns=columns)
+    for (a, b), value in zip(pairs, row):
+        matrix.loc[a, b] = matrix.loc[b, a] = value
+    return matrix
 
 def main():
     logger = get_logger("Analysis & Features")
     config = load_config()
     
     raw_path = config["data"]["raw_path"]
+    raw_parquet_dir = config["data"].get("raw_parquet_dir")
     processed_path = config["data"]["processed_path"]
+    processed_parquet_path = config["data"]["processed_parquet_path"]
     
-    # 1. Load Data
-    logger.info(f"Loading raw data from {raw_path}")
-    if not os.path.exists(raw_path):
+    # 1. Load Data (lazy: Parquet output of 01_ingestion.py, falling back to the CSV)
+    logger.info(f"Loading raw data from {raw_parquet_dir or raw_path}")
+    try:
+        lf = scan_raw(raw_path, raw_parquet_dir)
+    except FileNotFoundError:
         logger.error("Raw data not found! Run 01_ingestion.py first.")
         return
-
-    df = pl.read_csv(raw_path)
     
-    # 2. Feature Engineering
-    df = create_features(df)
+    # 2. Feature Engineering + typed Parquet output (streamed, never collected)
+    store_config = config.get("feature_store", {})
+    # Makine başına kayan pencere özellikleri (features.rolling.enabled ile açılır)
+    rolling_config = config["features"].get("rolling", {})
+    with timed("feature_engineering", logger):
+        if store_config.get("enabled", False):
+            # Incremental: only raw rows above the high-water mark are processed
+            store = FeatureStore(store_config["path"], store_config.get("watermark_column", "id"), rolling_config)
+            store.update(lf)
+            processed = store.scan()
+        else:
+            save_processed_data(add_rolling_features(create_features(lf), rolling_config), processed_parquet_path)
+            processed = pl.scan_parquet(processed_parquet_path)
     
-    # 3. Analysis: Correlation Matrix
+    # 3. Analysis: Correlation Matrix (computed in Polars on the numeric columns only)
     logger.info("Generating correlation matrix...")
-    pdf = df.to_pandas()
     plt.figure(figsize=(10, 8))
-    correlation_matrix = pdf.select_dtypes(include=['float64', 'int64']).corr()
+    with timed("correlation_matrix", logger):
+        corr = correlation_matrix(processed)
     
-    sns.heatmap(correlation_matrix, annot=True, cmap='RdYlGn', fmt=".2f")
+    sns.heatmap(corr, annot=True, cmap='RdYlGn', fmt=".2f")
     plt.title("Correlation Analysis")
     
     output_plot = config.get("reports", {}).get("correlation_plot", "outputs/correlation_analysis.png")
@@ -37,10 +70,10 @@ def main():
     plt.savefig(output_plot)
     logger.info(f"Correlation plot saved to {output_plot}")
     
-    # 4. Save Processed Data
-    os.makedirs(os.path.dirname(processed_path), exist_ok=True)
-    df.write_csv(processed_path)
-    logger.info(f"Processed data saved to {processed_path}")
+    # 4. CSV export for tools that cannot read Parquet (streamed from the Parquet data)
+    if config["data"].get("export_csv", True):
+        with timed("csv_export", logger):
+            save_processed_data(processed, processed_path)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
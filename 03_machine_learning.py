@@ -1,71 +1,46 @@
-import polars as pl
-import os
-from sklearn.model_selection import train_test_split
-from src.utils import load_config, get_logger
+import pandas as pd
+from src.utils import load_config, get_logger, timed
 from src.model import train_model, evaluate_model, save_model
+from src.training_cache import load_training_data
+from src.tuning import tune
+from src.inference import CompiledForest
+from src.registry import ModelRegistry
+from src.explain import GLOBAL_ARTIFACT, compute_global_explanations
 
 def main():
     logger = get_logger("Machine Learning")
     config = load_config()
     
-    processed_path = config["data"]["processed_path"]
     model_path = config.get("model", {}).get("path", "src/models/maintenance_model.pkl")
+    family = config.get("model", {}).get("family", "random_forest")
     
-    # 1. Load Processed Data
-    logger.info(f"Loading processed data from {processed_path}")
-    if not os.path.exists(processed_path):
-        logger.error("Processed data not found! Run 02_analysis_and_features.py first.")
-        return
-
-    df = pl.read_csv(processed_path)
-    
-    # 2. Feature Selection
+    # 1. Feature Selection
     features = config.get("features", {}).get("numerical", [])
-    target = config.get("features", {}).get("target", "target")
     
     if not features:
         logger.warning("No features defined in config, using defaults.")
         features = ["air_temp_c", "process_temp_c", "rpm", "torque", "tool_wear", "power_factor", "temp_diff"]
-        
-    X = df.select(features).to_pandas()
-    y = df.select(target).to_pandas().values.ravel()
-    
-    # 3. Split Data
-    test_size = config.get("base", {}).get("test_size", 0.2)
-    random_state = config.get("base", {}).get("random_state", 42)
+        config.setdefault("features", {})["numerical"] = features
     
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=test_size, random_state=random_state, stratify=y
-    )
+    # 2-3. Load Processed Data + Split Data
+    # Cached, memory-mapped arrays keyed by the data content hash and the feature list;
+    # the processed data is only parsed when the cache key changes.
+    try:
+        with timed("load_training_data", logger):
+            X_train, X_test, y_train, y_test, folds = load_training_data(config)
+    except FileNotFoundError:
+        logger.error("Processed data not found! Run 02_analysis_and_features.py first.")
+        return
     
+    # Final model and evaluation keep the feature names (the API passes named columns)
+    X_train_df = pd.DataFrame(X_train, columns=features, copy=False)
+    X_test_df = pd.DataFrame(X_test, columns=features, copy=False)
 
     # 4. Hiperparametre Optimizasyonu (Optuna)
-    import optuna
-    from sklearn.model_selection import cross_val_score
-    from sklearn.metrics import make_scorer, f1_score
-
-    def objective(trial):
-        # Denenecek parametre aralıkları
-        params = {
-            "n_estimators": trial.suggest_int("n_estimators", 50, 300),
-            "max_depth": trial.suggest_int("max_depth", 5, 30),
-            "min_samples_split": trial.suggest_int("min_samples_split", 2, 10),
-            "min_samples_leaf": trial.suggest_int("min_samples_leaf", 1, 5),
-            "random_state": random_state
-        }
-        
-        # Modeli oluştur (Log kirliliğini önlemek için direkt sklearn kullanıyoruz)
-        from sklearn.ensemble import RandomForestClassifier
-        model = RandomForestClassifier(**params)
-        
-        # Cross Validation skoru
-        score = cross_val_score(model, X_train, y_train, cv=3, scoring="f1").mean()
-        return score
-
+    # Paralel worker'lar, fold bazlı pruning ve kalıcı storage (yarıda kalırsa kaldığı yerden devam eder)
     logger.info("Optuna optimizasyonu başlıyor...")
-    optuna.logging.set_verbosity(optuna.logging.WARNING) # Sadece önemli mesajları göster
-    study = optuna.create_study(direction="maximize")
-    study.optimize(objective, n_trials=20) # 20 deneme yapacağız
+    with timed("tuning", logger):
+        study = tune(X_train, y_train, config, folds=folds)
 
     best_params = study.best_params
     logger.info(f"En iyi parametreler bulundu: {best_params}")
@@ -85,20 +60,21 @@ def main():
         mlflow.log_params(best_params)
         
         # Modeli eğit
-        model = train_model(X_train, y_train, best_params)
+        with timed("training", logger):
+            model = train_model(X_train_df, y_train, best_params, family=family)
         
         # Modeli kaydet (MLflow artifact olarak)
         mlflow.sklearn.log_model(model, "model")
         
         # 5. Evaluate Model ve Metrikleri Kaydet
-        report_str = evaluate_model(model, X_test, y_test)
+        report_str = evaluate_model(model, X_test_df, y_test)
         
         # Classification report string dönüyor, biz ana metrikleri (accuracy, f1) ayrıca hesaplayıp loglayalım
         # evaluate_model log basıyor ama metrik değerlerini sözlük olarak dönmüyor
         # Bu yüzden burada manuel hesaplayıp mlflow'a atalım
         from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
         
-        y_pred = model.predict(X_test)
+        y_pred = model.predict(X_test_df)
         metrics = {
             "accuracy": accuracy_score(y_test, y_pred),
             "f1_score": f1_score(y_test, y_pred),
@@ -111,6 +87,45 @@ def main():
     
     # 6. Save Model (Lokal dosya sistemine de kaydedelim ki API kullansın)
     save_model(model, model_path)
+    
+    # Kompakt artefakt: API/dashboard "compiled" motorla pickle açmadan memory-map ile yükler
+    compact_path = config.get("model", {}).get("compact_path")
+    if compact_path:
+        try:
+            CompiledForest.from_sklearn(model).save(compact_path)
+        except TypeError as e:
+            logger.warning(f"Kompakt artefakt oluşturulamadı: {e}")
+
+    # 7. Sürümlü kayıt defterine yayınla; CURRENT güncellenince API yeni modeli kesintisiz yükler
+    registry_path = config.get("registry", {}).get("path")
+    if registry_path:
+        # Global SHAP özetleri (önem sıralaması, bağımlılık eğrileri) eğitimde bir kez hesaplanır;
+        # API ve dashboard bunları diskten okur
+        artifacts = {}
+        global_config = config.get("explain", {}).get("global", {})
+        if global_config.get("enabled", False):
+            logger.info("Global SHAP özetleri hesaplanıyor...")
+            try:
+                with timed("global_explanations", logger):
+                    artifacts[GLOBAL_ARTIFACT] = compute_global_explanations(
+                        model, X_train_df, y_train, features,
+                        sample_size=global_config.get("sample_size", 2000),
+                        chunk_size=global_config.get("chunk_size", 250),
+                        n_jobs=global_config.get("n_jobs", -1),
+                        dependence_features=global_config.get("dependence_features", []),
+                        grid_bins=global_config.get("grid_bins", 20),
+                        random_state=config["base"]["random_state"]
+                    )
+            except Exception as e:
+                logger.warning(f"Global SHAP özetleri oluşturulamadı: {e}")
+
+        version = ModelRegistry(registry_path).publish(model, {
+            "family": family,
+            "features": features,
+            "params": best_params,
+            "metrics": metrics,
+        }, artifacts=artifacts)
+        logger.info(f"Model sürümü yayınlandı: {version}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,14 +2,20 @@ import polars as pl
 import plotly.express as px
 import plotly.graph_objects as go
 import os
+from src.utils import load_config, get_logger, timed
+from src.data import scan_features
 
+@timed("dashboard_summary", get_logger("Dashboard Summary"))
 def dashboard_olustur():
-    # 1. İşlenmiş veriyi yükle
-    if not os.path.exists("data/processed/refined_sensor_data.csv"):
+    # 1. İşlenmiş veriyi yükle (sadece grafikte kullanılan sütunlar okunur)
+    config = load_config()
+    try:
+        lf = scan_features(config)
+    except FileNotFoundError:
         print("❌ Hata: İşlenmiş veri bulunamadı! Lütfen önce 02_analysis_and_features.py dosyasını çalıştır.")
         return
 
-    df = pl.read_csv("data/processed/refined_sensor_data.csv").to_pandas()
+    df = lf.select(["rpm", "torque", "target", "air_temp_c", "tool_wear", "power_factor"]).collect().to_pandas()
     
     print("🎨 Dashboard hazırlanıyor...")
 
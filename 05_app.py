@@ -3,14 +3,21 @@ import polars as pl
 import pandas as pd
 import joblib
 import plotly.express as px
+import plotly.graph_objects as go
+import numpy as np
 import os
 from src.utils import load_config, get_logger
-from src.features import create_features
-import shap
-import matplotlib.pyplot as plt
-import time
+from src.features import create_features, FeatureVectorizer, FEATURE_FORMULAS, OnlineRollingFeatures
+from src.data import feature_source_files
 from src.simulator import generate_live_data
-from src.database import init_db, insert_record, fetch_history
+from src.database import init_db, insert_record, fetch_history_page, BufferedWriter
+from datetime import datetime, timedelta
+from src.inference import load_predictor as load_inference_predictor, array_predictor
+from src.registry import ModelRegistry, LEGACY_VERSION
+from src.envelope import data_version, load_envelope
+from src.prediction_cache import from_config as prediction_cache_from_config
+from src.live import LiveProducer
+from collections import deque
 
 # Veritabanını Başlat (Eğer yoksa oluşturur)
 init_db()
@@ -26,15 +33,115 @@ st.set_page_config(
     layout="wide"
 )
 
-# Modeli Yükle
+# Aktif model sürümü: kayıt defterindeki CURRENT, yoksa params.yaml -> model.path
+# Önbellekler sürüme göre anahtarlanır; yeni sürüm yayınlanınca bir sonraki rerun'da yüklenir.
+registry = ModelRegistry(config.get("registry", {}).get("path", "src/models/registry"))
+model_version = registry.current_version() or LEGACY_VERSION
+
+# Modeli Yükle (sadece SHAP analizi için gerekir; ilk ihtiyaçta yüklenir)
 @st.cache_resource
-def load_model():
+def load_model(version: str):
+    if version != LEGACY_VERSION:
+        return registry.load_model(version)
     model_path = config["model"]["path"]
     if os.path.exists(model_path):
         return joblib.load(model_path)
     return None
 
-model = load_model()
+# Tahmin motoru (params.yaml -> model.engine); "compiled" ve kompakt artefakt varsa pickle açılmaz
+@st.cache_resource
+def load_predictor(version: str):
+    try:
+        if version != LEGACY_VERSION:
+            return registry.load_predictor(version, config["model"].get("engine", "sklearn"))
+        return load_inference_predictor(config["model"])
+    except FileNotFoundError:
+        return None
+
+predictor = load_predictor(model_version)
+
+# Tahmin yolu: özellik sırası model yüklenirken bir kez sabitlenir, okumalar doğrudan
+# NumPy matrisine yazılır (Polars -> pandas dönüşümü yok)
+@st.cache_resource
+def load_array_model(version: str):
+    base = load_predictor(version)
+    if base is None:
+        return None, None
+    return array_predictor(base), FeatureVectorizer.for_model(base, config["features"]["numerical"])
+
+array_model, vectorizer = load_array_model(model_version)
+
+# SHAP explainer modelle birlikte önbellekte tutulur (her rerun'da yeniden kurulmaz);
+# aynı girdi için açıklamalar Explainer içinde memoize edilir
+@st.cache_resource
+def load_explainer(version: str):
+    model = load_model(version)
+    if model is None:
+        return None
+    try:
+        from src.explain import Explainer
+    except ImportError:
+        return None
+    explain_config = config.get("explain", {})
+    # Dashboard tek satır açıkladığı için arka plan gerektirmeyen modlar kullanılır
+    mode = explain_config.get("mode", "exact")
+    return Explainer(model, config["features"]["numerical"],
+                     mode="exact" if mode == "interventional" else mode,
+                     max_trees=explain_config.get("max_trees"), version=version,
+                     cache_size=explain_config.get("cache_size", 1024))
+
+# Eğitimde hesaplanan global SHAP özetleri (sürümle birlikte diskte); yeniden hesaplanmaz
+@st.cache_data
+def load_global_explanations(version: str):
+    if version == LEGACY_VERSION:
+        return None
+    from src.explain import GLOBAL_ARTIFACT
+    return registry.load_artifact(version, GLOBAL_ARTIFACT)
+
+# Analiz grafiği için önceden toplanmış çalışma zarfı (veri sürümüne göre önbellekte)
+@st.cache_data
+def get_envelope(version: str):
+    return load_envelope(config)
+
+# Ham sensör alanları; tahmin önbelleğinin anahtarı
+RAW_FIELDS = ["air_temp", "process_temp", "rpm", "torque", "tool_wear"]
+
+# Tahmin önbelleği tüm oturumlarda paylaşılır; slider aynı değerdeyken her rerun'da model çağrılmaz
+@st.cache_resource
+def get_prediction_cache():
+    return prediction_cache_from_config(RAW_FIELDS, config.get("prediction_cache", {}))
+
+prediction_cache = get_prediction_cache()
+
+# Canlı akış: tüm oturumların paylaştığı tek arka plan üreticisi. Okuma üretimi, tahmin ve
+# veritabanı yazımı tick başına bir kez yapılır; sayfalar sadece yeni kayıtları okur.
+live_config = config.get("live", {})
+
+def predict_readings(readings: list) -> list:
+    proba = array_model.predict_proba(vectorizer.transform({field: [reading[field] for reading in readings] for field in RAW_FIELDS}))
+    labels = array_model.classes_[proba.argmax(axis=1)]
+    return [
+        {"prediction": int(label), "probability": float(p),
+         "power_factor": float(FEATURE_FORMULAS["power_factor"](reading)),
+         "temp_diff": float(FEATURE_FORMULAS["temp_diff"](reading))}
+        for label, p, reading in zip(labels, proba[:, 1], readings)
+    ]
+
+@st.cache_resource
+def get_live_producer():
+    rolling_config = config["features"].get("rolling", {})
+    producer = LiveProducer(
+        generate_live_data,
+        interval_s=live_config.get("interval_seconds", 2),
+        capacity=live_config.get("buffer_size", 1000),
+        writer=BufferedWriter(flush_rows=live_config.get("flush_rows", 100), flush_interval_ms=1000)
+        if live_config.get("log_predictions", True) else None,
+        rolling=OnlineRollingFeatures(rolling_config.get("window", 10), rolling_config.get("columns"),
+                                      window_seconds=rolling_config.get("window_seconds"),
+                                      time_col=rolling_config.get("time_col", "timestamp")),
+        idle_timeout_s=live_config.get("idle_timeout_seconds", 30)
+    )
+    return producer.start()
 
 # Başlık ve Açıklama
 st.title("🏭 Endüstriyel Kestirimci Bakım Dashboard")
@@ -47,6 +154,10 @@ Bu uygulama, üretim hattındaki makinelerden gelen sensör verilerini analiz ed
 st.sidebar.header("⚙️ Veri Kaynağı")
 mode = st.sidebar.radio("Mod Seçiniz", ["Manuel Giriş", "Canlı Veri Simülasyonu 📡"])
 
+if prediction_cache:
+    cache_stats = prediction_cache.stats()
+    st.sidebar.caption(f"Tahmin önbelleği: {cache_stats['size']} kayıt, isabet oranı %{cache_stats['hit_rate']*100:.0f}")
+
 def user_input_features():
     # Manuel Mod
     if mode == "Manuel Giriş":
@@ -63,55 +174,94 @@ def user_input_features():
         st.sidebar.info("📡 Canlı veri akışı simüle ediliyor...")
         
         
-        # Session State kullanarak veriyi tutabiliriz
-        if 'live_data' not in st.session_state:
-            st.session_state['live_data'] = generate_live_data()
-            
-        sim_data = st.session_state['live_data']
+        # Arka plan üreticisi (ilk oturumda başlar, sonrakiler paylaşır)
+        producer = get_live_producer()
+        producer.set_predict_fn(predict_readings if predictor else None)
+
+        sim_data = producer.latest()
+        if sim_data is None:
+            sim_data = producer.tick()[0]
+        st.session_state["live_snapshot"] = sim_data
         
-        # Her 2 saniyede bir yenilemek için rerun butonu
-        if st.sidebar.button("Veriyi Yenile 🔄"):
-             st.session_state['live_data'] = generate_live_data()
-             sim_data = st.session_state['live_data'] # Güncel veriyi al
+        # Tam sayfa (grafik, SHAP) son okumayla yenilenir; canlı panel kendi kendine güncellenir
+        st.sidebar.button("Veriyi Yenile 🔄")
              
         # Otomatik akış kontrolü (Checkbox)
         # Key vererek session state'de tutulmasını sağlıyoruz
-        st.sidebar.checkbox("Otomatik Yenile (2sn)", key="auto_refresh")
+        st.sidebar.checkbox(f"Otomatik Yenile ({live_config.get('interval_seconds', 2)}sn)", key="auto_refresh")
             
-        # Değerleri gösterelim (düzenlenemez olarak)
-        
         # Değerleri gösterelim (düzenlenemez olarak)
         st.sidebar.metric("Hava Sıcaklığı", f"{sim_data['air_temp']:.2f} K")
         st.sidebar.metric("Tork", f"{sim_data['torque']:.2f} Nm")
         
-        # Değerleri değişkenlere ata ki aşağıdaki 'data' sözlüğü kullansın
+        # Değerleri değişkenlere ata ki aşağıdaki ham okuma sözlüğü kullansın
         air_temp = sim_data['air_temp']
         process_temp = sim_data['process_temp']
         rpm = sim_data['rpm']
         torque = sim_data['torque']
         tool_wear = sim_data['tool_wear']
 
-    # Ham veri oluştur (Hesaplanan sütunlar olmadan)
-    data = {
+    # Ham okuma (hesaplanan sütunlar olmadan); tahmin, kayıt ve önbellek anahtarı bundan üretilir
+    return {
         "air_temp": air_temp,
         "process_temp": process_temp,
         "rpm": rpm,
         "torque": torque,
         "tool_wear": tool_wear
     }
-    
-    # Polars DataFrame oluştur ve Feature Engineering uygula
-    df = pl.DataFrame([data])
-    df_processed = create_features(df)
-    
-    # Modele uygun pandas dataframe'e çevir
-    full_df = df_processed.to_pandas()
-    
+
+# SHAP için tam özellik tablosu; sadece bu bölümde gerekir ve ham okumaya göre önbellektedir
+@st.cache_data
+def feature_frame(raw_items: tuple) -> pd.DataFrame:
+    full_df = create_features(pl.DataFrame([dict(raw_items)])).to_pandas()
     # Modelin beklediği sütunları seç (params.yaml'dan)
-    model_features = config["features"]["numerical"]
-    return full_df[model_features], full_df
+    return full_df[config["features"]["numerical"]]
 
-input_df, full_input_df = user_input_features()
+raw_row = user_input_features()
+live_mode = mode == "Canlı Veri Simülasyonu 📡"
+
+def render_live_panel():
+    """
+    Canlı KPI'lar ve risk trendi. Fragment olarak sadece bu bölüm yeniden çalışır;
+    her tick'te yalnızca son okunandan sonraki kayıtlar alınır.
+    """
+    window = st.session_state.setdefault("live_window", deque(maxlen=live_config.get("window", 120)))
+    new_items, st.session_state["live_cursor"] = get_live_producer().read(st.session_state.get("live_cursor", 0))
+    window.extend(new_items)
+
+    kpi1, kpi2, kpi3 = st.columns(3)
+    latest = window[-1] if window else None
+    if latest is None or "prediction" not in latest:
+        kpi1.metric("Durum", "Model Yok" if not predictor else "Veri bekleniyor")
+        kpi2.metric("Olasılık", "-")
+        return
+
+    prediction, probability = latest["prediction"], latest["probability"]
+    kpi1.metric(
+        label="Tahmin Edilen Durum",
+        value="ARIZA RİSKİ" if prediction == 1 else "NORMAL",
+        delta="-Riskli" if prediction == 1 else "+Güvenli",
+        delta_color="inverse"
+    )
+    kpi2.metric(
+        label="Arıza Olasılığı",
+        value=f"%{probability*100:.1f}",
+        delta=f"{probability*100:.1f}% Risk",
+        delta_color="inverse"
+    )
+    kpi3.metric(
+        label="Güç Faktörü (W)",
+        value=f"{latest['power_factor']:.2f}",
+        help="Tork x Devir Hızı"
+    )
+
+    trend = pd.DataFrame([item for item in window if "probability" in item])
+    st.line_chart(trend.set_index("timestamp")[["probability"]])
+
+if live_mode:
+    # Otomatik yenileme açıksa fragment belirli aralıkla kendi başına yeniden çalışır
+    run_every = live_config.get("interval_seconds", 2) if st.session_state.get("auto_refresh") else None
+    live_panel = st.fragment(run_every=run_every)(render_live_panel)
 
 # Ana Sayfa Düzeni (Kolonlar)
 
@@ -121,48 +271,61 @@ tab_live, tab_history = st.tabs(["📡 Canlı İzleme", "📚 Geçmiş Kayıtlar
 with tab_live:
     # KPI Metrikleri
     st.markdown("### 📊 Anlık Durum Özeti")
-    kpi1, kpi2, kpi3 = st.columns(3)
-
-    # Hesaplanan değerleri al (full_input_df'ten)
-    power_factor = full_input_df["power_factor"][0]
-    temp_diff = full_input_df["temp_diff"][0]
 
-    if model:
-        # Model sadece input_df (filtrelenmiş) kullanır
-        prediction = model.predict(input_df)[0]
-        probability = model.predict_proba(input_df)[0][1]
-        
-        # --- VERİTABANI KAYDI ---
-        # Sadece otomatik yenileme modunda veya butonla tetiklenen modda kaydetmek mantıklı.
-        # Manuel modda sürekli slider değişiminde kayıt atmasın (demo için).
-        # Ama kullanıcı "Manuel" girip sonucu görmek istiyor. Kaydedelim.
-        # Kayıt verisi hazırla (Raw inputlar + Tahmin)
-        record_data = full_input_df.to_dict(orient="records")[0]
-        insert_record(record_data, int(prediction), float(probability))
-        # ------------------------
-        
-        kpi1.metric(
-            label="Tahmin Edilen Durum",
-            value="ARIZA RİSKİ" if prediction == 1 else "NORMAL",
-            delta="-Riskli" if prediction == 1 else "+Güvenli",
-            delta_color="inverse"
-        )
-        
-        kpi2.metric(
-            label="Arıza Olasılığı",
-            value=f"%{probability*100:.1f}",
-            delta=f"{probability*100:.1f}% Risk",
-            delta_color="inverse"
-        )
+    if live_mode:
+        # Canlı modda KPI'lar fragment içinde güncellenir; tahmin ve kayıt üreticide yapıldı
+        live_panel()
+        if predictor:
+            # Sayfadaki diğer bölümler için üreticinin son okumasındaki tahmin kullanılır
+            snapshot = st.session_state["live_snapshot"]
+            if "prediction" not in snapshot:
+                snapshot = {**snapshot, **predict_readings([snapshot])[0]}
+            prediction, probability = snapshot["prediction"], snapshot["probability"]
     else:
-        kpi1.metric("Durum", "Model Yok")
-        kpi2.metric("Olasılık", "-")
+        kpi1, kpi2, kpi3 = st.columns(3)
 
-    kpi3.metric(
-        label="Güç Faktörü (W)",
-        value=f"{power_factor:.2f}",
-        help="Tork x Devir Hızı"
-    )
+        # Hesaplanan değer ham okumadan, serving formülüyle alınır
+        power_factor = FEATURE_FORMULAS["power_factor"](raw_row)
+
+        if predictor:
+            # Önce önbelleğe bak (anahtar: model sürümü + nicemlenmiş ham okumalar)
+            cached = prediction_cache.get(model_version, raw_row) if prediction_cache else None
+            if cached is None:
+                # Model özellikleri ham okumadan doğrudan hesaplanır; etiket olasılıktan türetilir
+                proba = array_model.predict_proba(vectorizer.transform_row(raw_row))[0]
+                cached = (int(array_model.classes_[proba.argmax()]), float(proba[1]))
+                if prediction_cache:
+                    prediction_cache.put(model_version, raw_row, cached)
+            prediction, probability = cached
+            
+            # --- VERİTABANI KAYDI ---
+            # Manuel modda kullanıcının girdiği değer ve sonuç kaydedilir
+            # (canlı modda kayıtları arka plan üreticisi toplu yazar).
+            insert_record(raw_row, int(prediction), float(probability))
+            # ------------------------
+            
+            kpi1.metric(
+                label="Tahmin Edilen Durum",
+                value="ARIZA RİSKİ" if prediction == 1 else "NORMAL",
+                delta="-Riskli" if prediction == 1 else "+Güvenli",
+                delta_color="inverse"
+            )
+            
+            kpi2.metric(
+                label="Arıza Olasılığı",
+                value=f"%{probability*100:.1f}",
+                delta=f"{probability*100:.1f}% Risk",
+                delta_color="inverse"
+            )
+        else:
+            kpi1.metric("Durum", "Model Yok")
+            kpi2.metric("Olasılık", "-")
+
+        kpi3.metric(
+            label="Güç Faktörü (W)",
+            value=f"{power_factor:.2f}",
+            help="Tork x Devir Hızı"
+        )
 
     st.markdown("---")
 
@@ -173,12 +336,11 @@ with tab_live:
         st.subheader("📝 Girilen Değerler")
         # Sadece ham verileri gösterelim, kafa karışıklığı olmasın
         display_cols = ["rpm", "torque", "tool_wear", "air_temp", "process_temp"]
-        # full_input_df'te tüm sütunlar var
-        st.write(full_input_df[display_cols].T)
+        st.write(pd.Series(raw_row)[display_cols])
 
         
         st.subheader("🔍 Tahmin")
-        if model:
+        if predictor:
             # Tahmin zaten yukarıda yapıldı (prediction, probability)
             if prediction == 1:
                 st.error(f"⚠️ DİKKAT: Arıza Riski Yüksek! (%{probability*100:.2f})")
@@ -189,23 +351,40 @@ with tab_live:
 
     with col2:
         st.subheader("📊 Analiz Grafiği")
-        # Geçmiş veriyi yükle (bağlam oluşturmak için)
-        processed_path = config["data"]["processed_path"]
-        if os.path.exists(processed_path):
-            df_hist = pl.read_csv(processed_path).to_pandas()
-            
-            # Görselleştirme
-            fig = px.scatter(
-                df_hist, x="rpm", y="torque", color="target",
-                color_continuous_scale=["#2ecc71", "#e74c3c"], # Yeşil, Kırmızı
-                title="Makine Çalışma Zarfları (RPM vs Tork)",
-                opacity=0.3
+        # Çalışma zarfı: veri sürümü başına bir kez hesaplanan 2D yoğunluk + arıza örneği
+        # (grafik boyutu veri büyüdükçe artmaz)
+        try:
+            envelope = get_envelope(data_version(feature_source_files(config)))
+        except FileNotFoundError:
+            envelope = None
+
+        if envelope is not None:
+            x_edges = np.asarray(envelope["x_edges"])
+            y_edges = np.asarray(envelope["y_edges"])
+            counts = np.asarray(envelope["counts"], dtype=float)
+
+            # Görselleştirme (log ölçekli yoğunluk; boş hücreler şeffaf)
+            fig = go.Figure(go.Heatmap(
+                x=(x_edges[:-1] + x_edges[1:]) / 2,
+                y=(y_edges[:-1] + y_edges[1:]) / 2,
+                z=np.where(counts > 0, np.log10(np.maximum(counts, 1)), np.nan),
+                colorscale="Greens",
+                colorbar=dict(title="log10(n)"),
+                name="Yoğunluk"
+            ))
+            fig.add_scatter(
+                x=envelope["failure_sample"]["rpm"],
+                y=envelope["failure_sample"]["torque"],
+                mode="markers",
+                marker=dict(size=5, color="#e74c3c", opacity=0.6),
+                name="Arıza (örnek)"
             )
+            fig.update_layout(title=f"Makine Çalışma Zarfları (RPM vs Tork, {envelope['rows']:,} kayıt)")
             
-            # Güncel noktayı büyük bir işaretle ekle (full_input_df kullanmalıyız)
+            # Güncel noktayı büyük bir işaretle ekle
             fig.add_scatter(
-                x=full_input_df["rpm"], 
-                y=full_input_df["torque"],
+                x=[raw_row["rpm"]],
+                y=[raw_row["torque"]],
                 mode='markers',
                 marker=dict(size=20, color='blue', symbol='x'),
                 name="Güncel Değer"
@@ -221,14 +400,23 @@ with tab_live:
     st.markdown("---")
     st.subheader("🤖 Yapay Zeka Karar Analizi (XAI)")
 
-    if model:
+    explainer = load_explainer(model_version) if predictor else None
+    if explainer:
         # SHAP Analizi
         try:
-            # Explainer oluştur
-            explainer = shap.TreeExplainer(model)
-            
-            # Tek bir gözlem için SHAP değerlerini hesapla
-            shap_values = explainer(input_df)
+            # Ağır kütüphaneler sadece bu bölüm çizilirken yüklenir
+            import shap
+            import matplotlib.pyplot as plt
+
+            # Önbellekteki explainer; aynı girdi için SHAP değerleri yeniden hesaplanmaz
+            input_df = feature_frame(tuple(raw_row.items()))
+            values = explainer.explain(input_df)
+            explanation_to_plot = shap.Explanation(
+                values=values[0],
+                base_values=explainer.base_value,
+                data=input_df[explainer.feature_names].iloc[0].to_numpy(),
+                feature_names=explainer.feature_names
+            )
             
             # Görselleştirme
             col_shap1, col_shap2 = st.columns([2, 1])
@@ -239,14 +427,6 @@ with tab_live:
                 # Waterfall Plot
                 fig_shap, ax = plt.subplots(figsize=(8, 5))
                 
-                explanation_to_plot = None
-                if len(shap_values.shape) == 3:
-                     # (Sample, Feature, Class) -> (1, 7, 2) -> Arıza (1) sınıfı
-                     explanation_to_plot = shap_values[0, :, 1]
-                else:
-                     # (Sample, Feature) -> (1, 7)
-                     explanation_to_plot = shap_values[0]
-                
                 shap.plots.waterfall(explanation_to_plot, show=False)
                 st.pyplot(fig_shap, clear_figure=True)
                 
@@ -265,12 +445,53 @@ with tab_live:
             # Hata detayını gizleyip daha temiz bir mesaj verebiliriz veya geliştirme aşamasında açık tutabiliriz.
             # st.code(traceback.format_exc())
 
+    # Global açıklamalar: eğitim sırasında hesaplanan özetler diskten okunur
+    global_summary = load_global_explanations(model_version)
+    if global_summary:
+        st.markdown(f"**Genel Özellik Önemi (ortalama |SHAP|, {global_summary['sample_size']} örnek)**")
+        col_global1, col_global2 = st.columns(2)
+        with col_global1:
+            st.bar_chart(pd.Series(global_summary["mean_abs_shap"], name="mean |SHAP|"))
+        with col_global2:
+            for feature, curve in global_summary["dependence"].items():
+                st.caption(f"{feature} bağımlılık eğrisi")
+                st.line_chart(pd.DataFrame({"SHAP": curve["mean_shap"]}, index=curve["bin_centers"]))
+
 with tab_history:
     st.markdown("### 📜 Geçmiş Raporlar")
-    st.info("Sistem tarafından kaydedilen son 100 işlem kaydı aşağıdadır.")
-    
-    # Veritabanından verileri çek
-    df_logs = fetch_history(limit=100)
+    st.info("Sistem tarafından kaydedilen işlem kayıtları sayfa sayfa (100'er) aşağıdadır.")
+
+    # Zaman aralığı ve durum filtresi (veritabanında indeksli sütunlar üzerinde çalışır)
+    filter_col1, filter_col2 = st.columns(2)
+    time_ranges = {"Son 1 Saat": timedelta(hours=1), "Son 24 Saat": timedelta(days=1), "Son 7 Gün": timedelta(days=7), "Tümü": None}
+    range_label = filter_col1.selectbox("Zaman Aralığı", list(time_ranges), index=1)
+    status_label = filter_col2.selectbox("Durum", ["Tümü", "Riskli", "Normal"])
+
+    range_delta = time_ranges[range_label]
+    start = datetime.now() - range_delta if range_delta else None
+    status_filter = None if status_label == "Tümü" else status_label
+
+    # Keyset sayfalama: filtre değişince ilk sayfaya dön
+    filter_key = (range_label, status_label)
+    if st.session_state.get("history_filter") != filter_key:
+        st.session_state["history_filter"] = filter_key
+        st.session_state["history_cursors"] = [None]
+    cursors = st.session_state["history_cursors"]
+
+    # Veritabanından sadece gösterilen sütunları çek
+    history_columns = ["timestamp", "air_temp", "process_temp", "rpm", "torque", "tool_wear", "prediction", "probability", "status"]
+    df_logs, next_cursor = fetch_history_page(
+        limit=100, before_id=cursors[-1], start=start, status=status_filter, columns=history_columns
+    )
+
+    page_col1, page_col2, page_col3 = st.columns([1, 1, 4])
+    if page_col1.button("⬅️ Daha Yeni", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    if page_col2.button("Daha Eski ➡️", disabled=next_cursor is None):
+        cursors.append(next_cursor)
+        st.rerun()
+    page_col3.caption(f"Sayfa {len(cursors)}")
     
     if not df_logs.empty:
         # Zaman Serisi Grafiği (Risk Olasılığı)
@@ -296,20 +517,3 @@ with tab_history:
         )
     else:
         st.warning("Henüz hiç kayıt bulunamadı.")
-
-# ---------------------------------------------------------
-# OTOMATİK YENİLEME MANTIĞI (Scriptin en sonunda olmalı)
-# ---------------------------------------------------------
-# Eğer "Canlı Veri" modundaysak ve kullanıcı "Otomatik Yenile"yi seçtiyse:
-# 1. Tüm grafikleri çizdir (yukarıdaki kodlar çalıştı).
-# 2. 2 saniye bekle.
-# 3. Yeni veriyi üret ve kaydet.
-# 4. Sayfayı yenile (Başa dön).
-
-if mode == "Canlı Veri Simülasyonu 📡" and st.session_state.get("auto_refresh"):
-    time.sleep(2)
-    st.session_state["live_data"] = generate_live_data()
-    st.rerun()
-
-
-
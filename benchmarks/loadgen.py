@@ -0,0 +1,146 @@
+"""
+Load generator: replays the vectorized fleet simulator against the API.
+
+Requests are scheduled open-loop at a fixed target rate (request i is due at
+start + i / rate), so a slow server does not slow the generator down. Latency
+is measured from the scheduled send time, which includes time spent waiting
+for a free connection (no coordinated omission). Reports achieved throughput
+and latency percentiles.
+
+Usage:
+    python -m benchmarks.loadgen --url http://localhost:8000 --rate 200 --duration 30
+    python -m benchmarks.loadgen --in-process --rate 100 --duration 5 --batch-size 50
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import time
+import numpy as np
+import polars as pl
+import httpx
+from src.simulator import FleetSimulator
+from src.utils import get_logger
+
+logger = get_logger("Load Generator")
+
+RAW_FIELDS = ["air_temp", "process_temp", "rpm", "torque", "tool_wear"]
+
+def payloads(n_machines: int, seed: int, batch_size: int):
+    """
+    Endless stream of request bodies: one reading for /predict, or a columnar
+    batch of batch_size readings for /predict/batch. Rows left over at the end
+    of a simulator frame are carried into the next batch, so batches larger
+    than a frame work and no readings are skipped.
+    """
+    simulator = FleetSimulator(n_machines, seed=seed)
+    pending = None
+    for frame in simulator.stream(batch_ticks=max(1, max(1000, batch_size) // n_machines)):
+        frame = frame.select(RAW_FIELDS)
+        if batch_size <= 1:
+            columns = frame.to_dict(as_series=False)
+            for i in range(frame.height):
+                yield {field: columns[field][i] for field in RAW_FIELDS}
+            continue
+        pending = frame if pending is None else pl.concat([pending, frame])
+        while pending.height >= batch_size:
+            yield {"columns": pending.head(batch_size).to_dict(as_series=False)}
+            pending = pending.slice(batch_size)
+
+def summarize(latencies: list, statuses: list, elapsed: float, rate: float, batch_size: int) -> dict:
+    latencies_ms = np.asarray(latencies) * 1000
+    ok = sum(1 for status in statuses if status == 200)
+    summary = {
+        "target_rps": rate,
+        "sent": len(statuses),
+        "ok": ok,
+        "errors": len(statuses) - ok,
+        "elapsed_s": round(elapsed, 3),
+        "achieved_rps": round(ok / elapsed, 1) if elapsed else 0.0,
+        "rows_per_s": round(ok * max(batch_size, 1) / elapsed, 1) if elapsed else 0.0,
+    }
+    if len(latencies_ms):
+        for q in (50, 90, 95, 99):
+            summary[f"p{q}_ms"] = round(float(np.percentile(latencies_ms, q)), 3)
+        summary["max_ms"] = round(float(latencies_ms.max()), 3)
+    return summary
+
+async def run_load(client: httpx.AsyncClient, path: str, rate: float, duration: float,
+                   concurrency: int, bodies) -> tuple:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], []
+    total = int(rate * duration)
+
+    async def send(body, scheduled):
+        async with semaphore:
+            try:
+                response = await client.post(path, json=body)
+                status = response.status_code
+            except httpx.HTTPError as e:
+                logger.debug(f"Request failed: {e}")
+                status = 0
+        latencies.append(time.perf_counter() - scheduled)
+        statuses.append(status)
+
+    tasks = []
+    start = time.perf_counter()
+    for i in range(total):
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(next(bodies), scheduled)))
+    await asyncio.gather(*tasks)
+    return latencies, statuses, time.perf_counter() - start
+
+async def main_async(args) -> dict:
+    path = "/predict/batch" if args.batch_size > 1 else "/predict"
+    bodies = payloads(args.machines, args.seed, args.batch_size)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    if args.in_process:
+        # Sunucu olmadan ölçüm: uygulama aynı süreçte ASGI üzerinden çağrılır. ASGITransport
+        # lifespan'i çalıştırmaz; init_db, registry izleyicisi ve kapanışta log boşaltma için
+        # uygulamanın lifespan'i burada açılır.
+        from src.api import app
+        transport = httpx.ASGITransport(app=app)
+        client = httpx.AsyncClient(transport=transport, base_url="http://loadgen", timeout=args.timeout)
+        lifespan = app.router.lifespan_context(app)
+    else:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits)
+        lifespan = contextlib.nullcontext()
+
+    async with lifespan, client:
+        # Isınma: model yüklemesi ölçüme girmesin
+        await client.get("/ready")
+        latencies, statuses, elapsed = await run_load(client, path, args.rate, args.duration,
+                                                      args.concurrency, bodies)
+    return {"endpoint": path, "batch_size": args.batch_size,
+            **summarize(latencies, statuses, elapsed, args.rate, args.batch_size)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay simulated fleet readings against the prediction API.")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--in-process", action="store_true", help="Call src.api.app in-process instead of --url")
+    parser.add_argument("--rate", type=float, default=100, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to send requests for")
+    parser.add_argument("--concurrency", type=int, default=64, help="Max in-flight requests")
+    parser.add_argument("--batch-size", type=int, default=1, help="Rows per request (>1 uses /predict/batch)")
+    parser.add_argument("--machines", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--output", default=None, help="Optional JSON file for the summary")
+    args = parser.parse_args()
+
+    summary = asyncio.run(main_async(args))
+    print(json.dumps(summary, indent=2))
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+        logger.info(f"Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Model family comparison: accuracy vs. cost/latency.
+
+Trains every family in src.model.MODEL_FAMILIES on the cached training split
+and reports training time, model size on disk, single-row latency, 10k-row
+batch throughput, F1 and recall. Tree ensembles are also measured with the
+compiled inference engine.
+
+Usage:
+    python -m benchmarks.model_families [--families random_forest extra_trees] [--output outputs/model_benchmark.json]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import f1_score, recall_score
+from src.inference import CompiledForest
+from src.model import MODEL_FAMILIES, train_model
+from src.training_cache import load_training_data
+from src.utils import load_config, get_logger
+
+logger = get_logger("Model Benchmark")
+
+# Karşılaştırma için makul varsayılanlar (params.yaml -> benchmark.families ile ezilebilir)
+DEFAULT_PARAMS = {
+    "random_forest": {"n_estimators": 200, "max_depth": 15, "min_samples_split": 5},
+    "extra_trees": {"n_estimators": 200, "max_depth": 15, "min_samples_split": 5},
+    "hist_gradient_boosting": {"max_iter": 200, "max_depth": 8, "learning_rate": 0.1},
+}
+
+def median_latency_ms(fn, X, repeats: int) -> float:
+    fn(X)  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+def benchmark_family(family, params, X_train, X_test, y_train, y_test, repeats):
+    start = time.perf_counter()
+    model = train_model(X_train, y_train, params, family=family)
+    train_seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "model.pkl")
+        joblib.dump(model, path)
+        size_mb = os.path.getsize(path) / 1e6
+
+    y_pred = model.predict(X_test)
+    accuracy = {"f1": float(f1_score(y_test, y_pred)), "recall": float(recall_score(y_test, y_pred))}
+
+    # 10k satırlık batch: test kümesi tekrarlanarak oluşturulur
+    batch = pd.concat([X_test] * int(np.ceil(10_000 / len(X_test))), ignore_index=True).iloc[:10_000]
+
+    engines = {"sklearn": model}
+    try:
+        engines["compiled"] = CompiledForest.from_sklearn(model)
+    except TypeError:
+        pass
+
+    results = []
+    for engine, predictor in engines.items():
+        single_ms = median_latency_ms(predictor.predict_proba, X_test.iloc[:1], repeats)
+        batch_ms = median_latency_ms(predictor.predict_proba, batch, max(3, repeats // 20))
+        results.append({
+            "family": family,
+            "engine": engine,
+            "train_seconds": round(train_seconds, 3),
+            "model_size_mb": round(size_mb, 3),
+            "single_row_ms": round(single_ms, 3),
+            "batch_10k_rows_per_s": round(10_000 / (batch_ms / 1000)),
+            **{k: round(v, 4) for k, v in accuracy.items()},
+        })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare model families on accuracy and serving cost.")
+    parser.add_argument("--families", nargs="+", default=list(MODEL_FAMILIES), choices=list(MODEL_FAMILIES))
+    parser.add_argument("--repeats", type=int, default=100, help="Timed single-row calls per engine")
+    parser.add_argument("--output", default="outputs/model_benchmark.json")
+    args = parser.parse_args()
+
+    config = load_config()
+    features = config["features"]["numerical"]
+    random_state = config.get("base", {}).get("random_state", 42)
+    overrides = config.get("benchmark", {}).get("families", {})
+
+    X_train, X_test, y_train, y_test, _ = load_training_data(config)
+    X_train = pd.DataFrame(X_train, columns=features)
+    X_test = pd.DataFrame(X_test, columns=features)
+
+    rows = []
+    for family in args.families:
+        params = {**DEFAULT_PARAMS.get(family, {}), **overrides.get(family, {}), "random_state": random_state}
+        logger.info(f"Benchmarking {family} with {params}")
+        rows.extend(benchmark_family(family, params, X_train, X_test, y_train, y_test, args.repeats))
+
+    table = pd.DataFrame(rows)
+    print(table.to_string(index=False))
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(rows, f, indent=2)
+    logger.info(f"Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""
+Performance benchmark suite for the pipeline and serving paths.
+
+Benchmarks:
+    features   create_features on 10k / 1M / 10M rows (eager and lazy)
+    ingest     raw CSV (ingest_data) vs. Parquet (stream_ingest + scan_raw)
+    inference  predict_proba: sklearn vs. compiled engine, 1 row and 10k rows
+    api        /predict and /predict/batch via TestClient and a real uvicorn
+    database   insert_record / insert_records / fetch_history(_page)
+
+The api and database benchmarks use a temporary SQLite database as a
+stand-in unless --db-backend postgres is given (then the DB_* environment
+variables are used).
+
+Results are written as JSON. With --baseline, every case is compared to the
+saved baseline and the run fails (exit code 1) if a median time regresses by
+more than --tolerance, or if no case has a baseline entry at all. Cases
+missing from the baseline are listed as warnings.
+
+Usage:
+    python -m benchmarks.run [--only features api] [--quick]
+    python -m benchmarks.run --save-baseline
+    python -m benchmarks.run --baseline benchmarks/baseline.json --tolerance 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+import polars as pl
+from src.utils import load_config, get_logger
+
+logger = get_logger("Benchmark Suite")
+
+RAW_FIELDS = ["air_temp", "process_temp", "rpm", "torque", "tool_wear"]
+
+def measure(fn, repeats: int = 5, warmup: int = 1) -> dict:
+    """
+    Runs fn warmup + repeats times and returns timing statistics in milliseconds.
+    """
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": round(float(np.median(timings)), 4),
+        "min_ms": round(float(np.min(timings)), 4),
+        "max_ms": round(float(np.max(timings)), 4),
+        "repeats": repeats,
+    }
+
+def result(benchmark: str, case: str, stats: dict, **extra) -> dict:
+    row = {"benchmark": benchmark, "case": case, **stats, **extra}
+    logger.info(f"{benchmark:<10} {case:<40} median {stats['median_ms']:.3f} ms")
+    return row
+
+def raw_frame(n_rows: int, seed: int = 42) -> pl.DataFrame:
+    # Simülatörden ham sensör verisi (create_features'ın beklediği sütunlar)
+    from src.simulator import FleetSimulator
+    n_machines = min(n_rows, 1000)
+    frame = FleetSimulator(n_machines, seed=seed).generate(-(-n_rows // n_machines)).head(n_rows)
+    return frame.select(RAW_FIELDS + ["anomaly"])
+
+def sample_rows(n: int) -> dict:
+    return raw_frame(n).select(RAW_FIELDS).to_dict(as_series=False)
+
+def bench_features(config, sizes, repeats):
+    from src.features import create_features
+    results = []
+    for n in sizes:
+        df = raw_frame(n)
+        reps = repeats if n <= 1_000_000 else max(1, repeats // 3)
+        results.append(result("features", f"eager rows={n}", measure(lambda: create_features(df), reps), rows=n))
+        lf = df.lazy()
+        results.append(result("features", f"lazy rows={n}",
+                              measure(lambda: create_features(lf).collect(), reps), rows=n))
+    return results
+
+def bench_ingest(config, sizes, repeats):
+    from src.data import RAW_COLUMN_MAP, ingest_data, stream_ingest, scan_raw
+    inverse = {new: old for old, new in RAW_COLUMN_MAP.items()}
+    results = []
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            raw = raw_frame(n).with_row_index("id", offset=1).rename({"anomaly": "target"})
+            raw = raw.with_columns(pl.col("target").cast(pl.Int8)).rename(inverse, strict=False)
+            csv_path = os.path.join(tmp, "raw.csv")
+            parquet_dir = os.path.join(tmp, "raw_parquet")
+            raw.write_csv(csv_path)
+
+            # ingest_data dosya varsa indirmeyi atlar; ölçülen süre CSV okumadır
+            results.append(result("ingest", f"csv read rows={n}",
+                                  measure(lambda: ingest_data(None, csv_path), repeats), rows=n,
+                                  size_mb=round(os.path.getsize(csv_path) / 1e6, 3)))
+            results.append(result("ingest", f"csv->parquet convert rows={n}",
+                                  measure(lambda: stream_ingest(csv_path, parquet_dir), max(1, repeats // 2), warmup=0),
+                                  rows=n))
+            parquet_mb = sum(os.path.getsize(os.path.join(parquet_dir, f)) for f in os.listdir(parquet_dir)) / 1e6
+            results.append(result("ingest", f"parquet read rows={n}",
+                                  measure(lambda: scan_raw(csv_path, parquet_dir).collect(), repeats), rows=n,
+                                  size_mb=round(parquet_mb, 3)))
+    return results
+
+def bench_inference(config, sizes, repeats):
+    import joblib
+    from src.features import create_features, FeatureVectorizer, RAW_INPUTS
+    from src.inference import CompiledForest
+
+    model = joblib.load(config["model"]["path"])
+    features = config["features"]["numerical"]
+    engines = {"sklearn": model}
+    try:
+        engines["compiled"] = CompiledForest.from_sklearn(model)
+    except TypeError:
+        pass
+
+    X = create_features(raw_frame(10_000)).to_pandas()[features]
+    results = []
+    for engine, predictor in engines.items():
+        for n in (1, 100, 10_000):
+            batch = X.iloc[:n]
+            results.append(result("inference", f"{engine} predict_proba rows={n}",
+                                  measure(lambda: predictor.predict_proba(batch), repeats * 4), rows=n))
+
+    # İstek yolundaki özellik hazırlığı: Polars -> pandas gidiş-dönüşü vs. doğrudan NumPy
+    vectorizer = FeatureVectorizer.for_model(model, features)
+    raw = raw_frame(10_000).select(RAW_INPUTS).to_dict(as_series=False)
+    for n in (1, 100, 10_000):
+        columns = {field: values[:n] for field, values in raw.items()}
+        results.append(result("inference", f"polars features rows={n}",
+                              measure(lambda: create_features(pl.DataFrame(columns)).to_pandas()[features], repeats * 4), rows=n))
+        results.append(result("inference", f"vectorizer features rows={n}",
+                              measure(lambda: vectorizer.transform(columns), repeats * 4), rows=n))
+    return results
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _api_cases(post, repeats, results, transport):
+    # Her çağrı farklı okumalar gönderir; aksi halde tahmin önbelleği ölçülmüş olur
+    n_single = repeats * 10 + 1
+    rows = sample_rows(n_single + (repeats + 1) * 1000)
+    singles = iter([{field: values[i] for field, values in rows.items()} for i in range(n_single)])
+    batches = iter([{field: values[start:start + 1000] for field, values in rows.items()}
+                    for start in range(n_single, n_single + (repeats + 1) * 1000, 1000)])
+
+    results.append(result("api", f"{transport} /predict single",
+                          measure(lambda: post("/predict", next(singles)), repeats * 10)))
+    results.append(result("api", f"{transport} /predict/batch rows=1000",
+                          measure(lambda: post("/predict/batch", {"columns": next(batches)}), repeats), rows=1000))
+
+def _use_database(backend: str, tmp: str) -> dict:
+    """
+    Points src.database (and child processes via the returned env) at the
+    benchmark database: a temporary SQLite file unless backend is postgres.
+    """
+    from src import database
+    database.close_pool()
+    if backend != "sqlite":
+        return dict(os.environ)
+    database.DB_BACKEND = "sqlite"
+    database.DB_PATH = os.path.join(tmp, "bench.db")
+    return {**os.environ, "DB_BACKEND": "sqlite", "DB_PATH": database.DB_PATH}
+
+def bench_api(config, sizes, repeats, backend="sqlite"):
+    with tempfile.TemporaryDirectory() as tmp:
+        # Tahmin kayıtları (write-behind) da benchmark veritabanına yazılır
+        env = _use_database(backend, tmp)
+        return _bench_api(repeats, env)
+
+def _bench_api(repeats, env):
+    import httpx
+    from fastapi.testclient import TestClient
+    from src.api import app
+
+    results = []
+    with TestClient(app) as client:
+        def post(path, body):
+            response = client.post(path, json=body)
+            response.raise_for_status()
+        _api_cases(post, repeats, results, "testclient")
+
+    # Gerçek sunucu: ayrı süreçte uvicorn (ağ yığını + serileştirme dahil)
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api:app", "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=30) as client:
+            deadline = time.time() + 60
+            while True:
+                try:
+                    if client.get("/ready").status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if time.time() > deadline or server.poll() is not None:
+                    raise RuntimeError("uvicorn did not become ready")
+                time.sleep(0.2)
+
+            def post(path, body):
+                client.post(path, json=body).raise_for_status()
+            _api_cases(post, repeats, results, "uvicorn")
+    finally:
+        server.terminate()
+        server.wait(10)
+    return results
+
+def bench_database(config, sizes, repeats, backend="sqlite"):
+    from src import database
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        _use_database(backend, tmp)
+        database.init_db()
+
+        rows = sample_rows(1000)
+        records = [database.make_record({f: rows[f][i] for f in RAW_FIELDS}, i % 2, 0.5) for i in range(1000)]
+        single = {f: rows[f][0] for f in RAW_FIELDS}
+
+        results.append(result("database", f"{backend} insert_record",
+                              measure(lambda: database.insert_record(single, 0, 0.1), repeats * 10)))
+        results.append(result("database", f"{backend} insert_records rows=1000",
+                              measure(lambda: database.insert_records(records), repeats), rows=1000))
+        results.append(result("database", f"{backend} fetch_history limit=100",
+                              measure(lambda: database.fetch_history(limit=100), repeats * 4)))
+        results.append(result("database", f"{backend} fetch_history_page status filter",
+                              measure(lambda: database.fetch_history_page(limit=100, status="Riskli"), repeats * 4)))
+        database.close_pool()
+    return results
+
+BENCHMARKS = {
+    "features": bench_features,
+    "ingest": bench_ingest,
+    "inference": bench_inference,
+    "api": bench_api,
+    "database": bench_database,
+}
+
+def compare(results: list, baseline: list, tolerance: float) -> tuple:
+    """
+    Returns (regressions, unmatched): the cases whose median time grew by
+    more than ``tolerance`` (relative) compared to the baseline, and the
+    cases that have no baseline entry to compare against.
+    """
+    previous = {(row["benchmark"], row["case"]): row for row in baseline}
+    regressions, unmatched = [], []
+    for row in results:
+        base = previous.get((row["benchmark"], row["case"]))
+        if base is None or not base["median_ms"]:
+            unmatched.append(row)
+            continue
+        change = row["median_ms"] / base["median_ms"] - 1
+        row["baseline_median_ms"] = base["median_ms"]
+        row["change"] = round(change, 4)
+        if change > tolerance:
+            regressions.append(row)
+    return regressions, unmatched
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the performance benchmark suite.")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10_000, 1_000_000, 10_000_000],
+                        help="Row counts for the features and ingest benchmarks")
+    parser.add_argument("--quick", action="store_true", help="Small sizes and few repeats (smoke run)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--db-backend", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--output", default="outputs/benchmarks/latest.json")
+    parser.add_argument("--baseline", default=None, help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown of the median")
+    parser.add_argument("--save-baseline", default=None, nargs="?", const="benchmarks/baseline.json",
+                        help="Also write the results as the new baseline")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.sizes = [10_000, 100_000]
+        args.repeats = 3
+
+    config = load_config()
+    results = []
+    for name in args.only:
+        logger.info(f"Running {name} benchmarks...")
+        if name in ("api", "database"):
+            results.extend(BENCHMARKS[name](config, args.sizes, args.repeats, args.db_backend))
+        else:
+            results.extend(BENCHMARKS[name](config, args.sizes, args.repeats))
+
+    regressions, unmatched = [], []
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions, unmatched = compare(results, json.load(f)["results"], args.tolerance)
+        for row in unmatched:
+            logger.warning(f"No baseline for {row['benchmark']} {row['case']} (not compared)")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    for path in filter(None, [args.output, args.save_baseline]):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Results saved to {path}")
+
+    if regressions:
+        for row in regressions:
+            logger.error(f"REGRESSION {row['benchmark']} {row['case']}: "
+                         f"{row['baseline_median_ms']:.3f} -> {row['median_ms']:.3f} ms ({row['change']:+.0%})")
+        sys.exit(1)
+    elif args.baseline and len(unmatched) == len(results):
+        # Örn. --quick sonuçları tam boyutlu baseline ile: hiçbir durum karşılaştırılmadı
+        logger.error(f"No case matched the baseline {args.baseline}; nothing was compared "
+                     f"(was it recorded with the same --quick/--sizes settings?)")
+        sys.exit(1)
+    elif args.baseline:
+        compared = len(results) - len(unmatched)
+        logger.info(f"No regressions above {args.tolerance:.0%} against {args.baseline} "
+                    f"({compared} case(s) compared, {len(unmatched)} without baseline)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Throughput scaling of the multi-process API (gunicorn + uvicorn workers).
+
+For each worker count, the API is started with gunicorn.conf.py (model
+preloaded before fork) and driven open-loop by the load generator at a rate
+above its capacity, so the achieved throughput is the saturation throughput.
+Requests rejected by load shedding (429) are reported separately. Efficiency
+is throughput relative to perfect linear scaling of the 1-worker result.
+
+Workers share the machine with the load generator; on small machines leave
+a core free (--workers 1 2 3 on a 4-core box).
+
+Usage:
+    python -m benchmarks.scaling                      # 1, 2, 4, ... up to the core count
+    python -m benchmarks.scaling --workers 1 2 4 --rate 2000 --duration 15
+    python -m benchmarks.scaling --batch-size 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+from benchmarks.loadgen import payloads, run_load, summarize
+from benchmarks.run import _free_port, _use_database
+from src.serving import worker_count
+from src.utils import get_logger
+
+logger = get_logger("Scaling Benchmark")
+
+def default_worker_counts() -> list:
+    cores = worker_count()
+    counts, n = [], 1
+    while n < cores:
+        counts.append(n)
+        n *= 2
+    return counts + [cores]
+
+def start_server(workers: int, port: int, env: dict) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "-w", str(workers),
+         "-b", f"127.0.0.1:{port}", "--log-level", "warning", "src.api:app"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env
+    )
+    with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=30) as client:
+        deadline = time.time() + 120
+        while True:
+            try:
+                if client.get("/ready").status_code == 200:
+                    return server
+            except httpx.HTTPError:
+                pass
+            if time.time() > deadline or server.poll() is not None:
+                server.terminate()
+                raise RuntimeError(f"gunicorn ({workers} workers) did not become ready")
+            time.sleep(0.2)
+
+async def drive(port: int, args) -> dict:
+    path = "/predict/batch" if args.batch_size > 1 else "/predict"
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=args.timeout, limits=limits) as client:
+        # Isınma: her worker modeli ve bağlantıları hazırlasın
+        bodies = payloads(args.machines, args.seed, args.batch_size)
+        await run_load(client, path, min(args.rate, 200), 1.0, args.concurrency, bodies)
+        latencies, statuses, elapsed = await run_load(client, path, args.rate, args.duration,
+                                                      args.concurrency, bodies)
+    summary = summarize(latencies, statuses, elapsed, args.rate, args.batch_size)
+    summary["shed_429"] = statuses.count(429)
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API throughput vs. gunicorn worker count.")
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    parser.add_argument("--rate", type=float, default=1500, help="Target requests per second (above capacity)")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=128, help="Max in-flight requests")
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--machines", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--db-backend", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--output", default="outputs/benchmarks/scaling.json")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        env = _use_database(args.db_backend, tmp)
+        for workers in args.workers or default_worker_counts():
+            port = _free_port()
+            server = start_server(workers, port, env)
+            try:
+                summary = asyncio.run(drive(port, args))
+            finally:
+                server.terminate()
+                server.wait(30)
+            results.append({"workers": workers, **summary})
+            logger.info(f"workers={workers}: {summary['achieved_rps']} req/s, "
+                        f"p99 {summary.get('p99_ms', '-')} ms, 429: {summary['shed_429']}")
+
+    base = results[0]["achieved_rps"] / results[0]["workers"] if results and results[0]["achieved_rps"] else None
+    print(f"{'workers':>8} {'req/s':>10} {'rows/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'429':>6} {'efficiency':>10}")
+    for r in results:
+        r["efficiency"] = round(r["achieved_rps"] / (base * r["workers"]), 3) if base else None
+        print(f"{r['workers']:>8} {r['achieved_rps']:>10} {r['rows_per_s']:>10} {r.get('p50_ms', '-'):>9} "
+              f"{r.get('p99_ms', '-'):>9} {r['shed_429']:>6} {r['efficiency'] if r['efficiency'] is not None else '-':>10}")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump({"cpu_count": worker_count(), "rate": args.rate, "batch_size": args.batch_size,
+                   "results": results}, f, indent=2)
+    logger.info(f"Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
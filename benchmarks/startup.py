@@ -0,0 +1,89 @@
+"""
+Cold-start benchmark: pickle (joblib) vs. compact memory-mapped model artifact.
+
+Each variant runs in a fresh Python process (like a new uvicorn worker) and
+reports the time to import + load the model, the time of the first
+prediction, and resident memory (Linux /proc). The compact artifact is exported from the pickle
+into a temporary directory when model.compact_path does not exist yet.
+
+Usage:
+    python -m benchmarks.startup [--runs 5] [--output outputs/startup_benchmark.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import joblib
+import numpy as np
+from src.inference import CompiledForest
+from src.utils import load_config, get_logger
+
+logger = get_logger("Startup Benchmark")
+
+# Tek örnek satır (model feature sırasıyla)
+SAMPLE_ROW = [26.85, 36.85, 1500, 40.0, 100, 60000.0, 10.0]
+
+CHILD_SCRIPT = """
+import json, os, time
+start = time.perf_counter()
+{load}
+loaded = time.perf_counter()
+{predict}
+predicted = time.perf_counter()
+print(json.dumps({{
+    "load_seconds": loaded - start,
+    "first_predict_ms": (predicted - loaded) * 1000,
+    # ru_maxrss exec sonrası üst sürecin değerini taşıyabilir; anlık RSS'i /proc'tan okuyoruz
+    "rss_mb": int(open("/proc/self/statm").read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6,
+}}))
+"""
+
+def variants(model_path: str, compact_path: str) -> dict:
+    return {
+        "pickle": {
+            "load": f"import joblib\nmodel = joblib.load({model_path!r})",
+            # Pickle model isimli sütunlarla eğitildi; API gibi DataFrame ile çağırıyoruz
+            "predict": f"import pandas as pd\nmodel.predict_proba(pd.DataFrame([{SAMPLE_ROW!r}], columns=list(model.feature_names_in_)))",
+        },
+        "compact_mmap": {
+            "load": f"from src.inference import CompiledForest\nmodel = CompiledForest.load({compact_path!r}, mmap=True)",
+            "predict": f"import numpy as np\nmodel.predict_proba(np.asarray([{SAMPLE_ROW!r}]))",
+        },
+    }
+
+def run_child(load: str, predict: str) -> dict:
+    script = CHILD_SCRIPT.format(load=load, predict=predict)
+    output = subprocess.run([sys.executable, "-W", "ignore", "-c", script],
+                            capture_output=True, text=True, check=True, cwd=os.getcwd())
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare model cold-start cost of pickle vs. compact artifact.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", default="outputs/startup_benchmark.json")
+    args = parser.parse_args()
+
+    config = load_config()
+    model_path = config["model"]["path"]
+    compact_path = config["model"].get("compact_path")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if not compact_path or not os.path.exists(os.path.join(compact_path, "meta.json")):
+            compact_path = os.path.join(tmp, "compact")
+            CompiledForest.from_sklearn(joblib.load(model_path)).save(compact_path)
+
+        results = {}
+        for name, variant in variants(model_path, compact_path).items():
+            runs = [run_child(variant["load"], variant["predict"]) for _ in range(args.runs)]
+            results[name] = {key: round(float(np.median([run[key] for run in runs])), 3) for key in runs[0]}
+            logger.info(f"{name}: {results[name]}")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    logger.info(f"Results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
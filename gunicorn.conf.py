@@ -0,0 +1,46 @@
+# Üretim API servisi: gunicorn master + uvicorn worker süreçleri
+#   gunicorn -c gunicorn.conf.py src.api:app
+# Ayarlar params.yaml -> api.serving'den okunur; komut satırı (-w, -b) bunları ezer.
+import gc
+from src.utils import load_config, get_logger
+from src.serving import free_slot, worker_count
+
+serving = load_config().get("api", {}).get("serving", {})
+
+bind = serving.get("bind", "0.0.0.0:8000")
+workers = worker_count(serving.get("workers"))
+worker_class = "uvicorn_worker.UvicornWorker"
+timeout = serving.get("timeout_seconds", 60)
+graceful_timeout = serving.get("graceful_timeout_seconds", 30)
+# preload: uygulama (ve model) master'da bir kez yüklenir, worker'lar fork ile
+# aynı bellek sayfalarını paylaşır (copy-on-write)
+preload_app = serving.get("preload", True)
+
+def when_ready(server):
+    if not preload_app:
+        return
+    logger = get_logger("gunicorn")
+    from fastapi import HTTPException
+    from src.api import get_active_model
+    try:
+        version = get_active_model()[0]
+        logger.info(f"Model fork öncesi yüklendi: {version}")
+    except HTTPException as e:
+        # Model yoksa worker'lar ilk istekte yüklemeyi yeniden dener
+        logger.warning(f"Model fork öncesi yüklenemedi: {e.detail}")
+    # Yüklenen nesneleri GC taramasından çıkar; worker'larda sayfalar gereksiz kopyalanmaz
+    gc.freeze()
+
+# Metrikler süreç belleğinde tutulur; her worker ayrı kazınmalıdır. Worker'lar sabit bir
+# slot numarası alır: metriklere worker="<slot>" etiketi eklenir ve metrics_port + slot
+# portunda kendi /metrics uç noktası açılır (Prometheus'ta worker başına bir hedef).
+metrics_port = serving.get("metrics_port")
+
+def pre_fork(server, worker):
+    worker.slot = free_slot(getattr(w, "slot", None) for w in server.WORKERS.values())
+
+def post_fork(server, worker):
+    from src.api import metrics
+    metrics.set_const_labels(worker=worker.slot)
+    if metrics_port:
+        metrics.start_http_server(metrics_port + worker.slot)
@@ -1,26 +1,110 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-import joblib
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, Field, ValidationError
+from typing import List, Optional, Literal
+from contextlib import asynccontextmanager
 import polars as pl
 import pandas as pd
-import os
-from src.features import create_features
-from src.utils import load_config
+import threading
+import asyncio
+from src.features import create_features, FeatureVectorizer
+from src.utils import load_config, get_logger, timed
+from src.metrics import MetricsRegistry, MetricsMiddleware, SIZE_BUCKETS, register_process_metrics
+from src.batching import MicroBatcher
+from src.prediction_cache import from_config as prediction_cache_from_config
+from src.registry import ModelRegistry, LEGACY_VERSION, load_active_predictor, load_model_version
+from src.inference import array_predictor
+from src.serving import InferencePool, Overloaded, ConcurrencyLimitMiddleware
+from src.explain import Explainer, GLOBAL_ARTIFACT, sample_background
+from src.data import scan_features
+from src.database import init_db, make_record, BufferedWriter
 
 # Yükleme ve Ayarlar
 config = load_config()
-app = FastAPI(
-    title="Manufacturing Analytics API",
-    description="Endüstriyel Kestirimci Bakım Modeli API'si",
-    version="1.0.0"
-)
+logger = get_logger(__name__)
+
+# Model import sırasında değil, ilk istekte (veya /ready çağrısında) yüklenir.
+# Çıkarım motoru: "sklearn" (varsayılan) veya "compiled" (kompakt artefakt varsa memory-map ile)
+# Aktif model (sürüm, predictor, vectorizer) üçlüsü olarak tek referansta tutulur; yeniden
+# yüklemede referans atomik olarak değiştirilir, devam eden istekler eski modelle tamamlanır.
+# Özellik sırası model yüklenirken bir kez sabitlenir; predictor bu sırayla dizilmiş
+# NumPy matrisi alır (Polars -> pandas dönüşümü yok).
+_active_model = None
+_model_lock = threading.Lock()
+
+def load_active_model():
+    version, predictor = load_active_predictor(config)
+    vectorizer = FeatureVectorizer.for_model(predictor, config["features"]["numerical"])
+    return version, array_predictor(predictor), vectorizer
+
+def get_active_model():
+    global _active_model
+    if _active_model is None:
+        with _model_lock:
+            if _active_model is None:
+                try:
+                    _active_model = load_active_model()
+                except FileNotFoundError as e:
+                    raise HTTPException(status_code=503, detail=str(e))
+    return _active_model
+
+def get_predictor():
+    return get_active_model()[1]
+
+def reload_model():
+    """
+    Kayıt defterindeki CURRENT sürümü yükler ve aktif modelle değiştirir.
+    Yükleme başarısız olursa eski model hizmet vermeye devam eder.
+    """
+    global _active_model
+    with _model_lock:
+        previous = _active_model[0] if _active_model is not None else None
+        _active_model = load_active_model()
+    logger.info(f"Aktif model sürümü: {_active_model[0]}")
+    return previous, _active_model[0]
 
-# Modeli Yükle
-model_path = config["model"]["path"]
-if not os.path.exists(model_path):
-    raise FileNotFoundError(f"Model dosyası bulunamadı: {model_path}")
+registry_config = config.get("registry", {})
 
-model = joblib.load(model_path)
+async def watch_registry(interval: float):
+    """
+    CURRENT pointer'ını periyodik olarak kontrol eder; sürüm değişince modeli yeniden yükler.
+    """
+    registry = ModelRegistry(registry_config["path"])
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            version = await run_in_threadpool(registry.current_version)
+            if version and _active_model is not None and version != _active_model[0]:
+                await run_in_threadpool(reload_model)
+        except Exception as e:
+            # İzleyici durmamalı; hatalı sürümde eski model kullanılmaya devam eder
+            logger.error(f"Model yeniden yükleme hatası: {e}")
+
+# Prometheus metrikleri: istek sayıları/hataları, aşama bazlı gecikmeler, batch boyutları
+metrics = MetricsRegistry()
+REQUESTS = metrics.counter("api_requests_total", "HTTP requests by route and status.", ("method", "path", "status"))
+ERRORS = metrics.counter("api_request_errors_total", "HTTP responses with status >= 400.", ("method", "path", "status"))
+REQUEST_LATENCY = metrics.histogram("api_request_duration_seconds", "End-to-end request latency.", ("method", "path"))
+STAGE_LATENCY = metrics.histogram("api_stage_duration_seconds",
+                                  "Latency of prediction stages (validation, cache_lookup, create_features, inference).",
+                                  ("stage",))
+BATCH_ROWS = metrics.histogram("api_prediction_batch_rows", "Rows per prediction call.", buckets=SIZE_BUCKETS)
+MODEL_ROWS = metrics.histogram("api_model_batch_rows", "Rows sent to the model per call (after the cache).", buckets=SIZE_BUCKETS)
+metrics.gauge("api_model_info", "Active model version and engine.", ("version", "engine")).set_function(
+    lambda: {} if _active_model is None else {(_active_model[0], type(_active_model[1]).__name__): 1})
+register_process_metrics(metrics)
+
+def observe_stage(stage: str, seconds: float):
+    STAGE_LATENCY.observe(seconds, stage=stage)
+
+# Ham sensör alanları (istek şemasıyla aynı sırada)
+RAW_FIELDS = ["air_temp", "process_temp", "rpm", "torque", "tool_wear"]
+MAX_BATCH_SIZE = config.get("api", {}).get("max_batch_size", 1000)
+
+# Tekrarlanan/yakın okumalar için LRU tahmin önbelleği (model sürümü değişince temizlenir)
+prediction_cache = prediction_cache_from_config(RAW_FIELDS, config.get("prediction_cache", {}))
 
 # İstek Şeması
 class PredictionRequest(BaseModel):
@@ -34,41 +118,394 @@ class PredictionResponse(BaseModel):
     prediction: int
     probability: float
     status: str
+    model_version: str
+
+# Toplu istek: satır listesi (rows) veya sütun dizileri (columns) kabul edilir.
+# Boyut sınırı şemadadır: sınırı aşan liste doğrulama sırasında kesilir (413).
+class ColumnarBatch(BaseModel):
+    air_temp: List[float] = Field(max_length=MAX_BATCH_SIZE)
+    process_temp: List[float] = Field(max_length=MAX_BATCH_SIZE)
+    rpm: List[int] = Field(max_length=MAX_BATCH_SIZE)
+    torque: List[float] = Field(max_length=MAX_BATCH_SIZE)
+    tool_wear: List[int] = Field(max_length=MAX_BATCH_SIZE)
+
+class BatchPredictionRequest(BaseModel):
+    rows: Optional[List[PredictionRequest]] = Field(default=None, max_length=MAX_BATCH_SIZE)
+    columns: Optional[ColumnarBatch] = None
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[PredictionResponse]
+
+# SHAP açıklama isteği: satırlar + hız/doğruluk seçenekleri
+class ExplainRequest(BaseModel):
+    rows: List[PredictionRequest]
+    mode: Optional[Literal["exact", "approximate", "interventional"]] = None
+    max_trees: Optional[int] = None
+
+class ExplainResponse(BaseModel):
+    model_version: str
+    mode: str
+    base_value: float
+    feature_names: List[str]
+    shap_values: List[List[float]]
+
+def predict_columns(data: dict) -> list:
+    """
+    Sütun sözlüğü halindeki ham okumaları tek seferde tahmin eder.
+    Feature engineering tüm batch için bir kez çalışır, model bir kez çağrılır;
+    etiket olasılıklardan türetilir (predict + predict_proba çift çağrısı yok).
+    Önbellekte bulunan okumalar modele gönderilmez. Sonuçlar giriş sırasıyla döner.
+    """
+    # Sürüm, model ve özellik sırası aynı anda okunur
+    version, predictor, vectorizer = get_active_model()
+    size = len(data[RAW_FIELDS[0]])
+    rows = [{field: data[field][i] for field in RAW_FIELDS} for i in range(size)]
+
+    BATCH_ROWS.observe(size)
+
+    # Önbellekte olanlar modele gönderilmez
+    results = [None] * size
+    if prediction_cache is not None:
+        with timed("cache_lookup", observer=observe_stage):
+            results = [prediction_cache.get(version, row) for row in rows]
+    missing = [i for i, result in enumerate(results) if result is None]
+
+    if missing:
+        MODEL_ROWS.observe(len(missing))
+        subset = data if len(missing) == size else {field: [data[field][i] for i in missing] for field in RAW_FIELDS}
+
+        # Feature Engineering: model özellikleri doğrudan modelin sırasıyla matrise yazılır
+        with timed("create_features", observer=observe_stage):
+            features = vectorizer.transform(subset)
+
+        # Tahmin (tek predict_proba çağrısı); havuz varsa ayrı süreçte
+        with timed("inference", observer=observe_stage):
+            pool = get_inference_pool()
+            proba = pool.predict_proba(version, features) if pool is not None else predictor.predict_proba(features)
+            labels = predictor.classes_[proba.argmax(axis=1)]
+
+        for i, label, probability in zip(missing, labels, proba[:, 1]):
+            results[i] = {
+                "prediction": int(label),
+                "probability": float(probability),
+                "status": "Arıza Riski Yüksek" if label == 1 else "Normal",
+                "model_version": version
+            }
+            if prediction_cache is not None:
+                prediction_cache.put(version, rows[i], results[i])
+
+    # Tahminleri write-behind kuyruğuna at (veritabanı yazımı istek yolunda beklenmez)
+    if prediction_log is not None:
+        for row, result in zip(rows, results):
+            prediction_log.write(make_record(row, result["prediction"], result["probability"]))
+    # Önbellekteki sözlük paylaşıldığı için kopyası döndürülür
+    return [dict(result) for result in results]
+
+def predict_rows(rows: list) -> list:
+    """
+    Satır (dict) listesini sütunlara çevirip predict_columns ile tahmin eder.
+    """
+    data = {field: [row[field] for row in rows] for field in RAW_FIELDS}
+    return predict_columns(data)
+
+# Explainer'lar (mod, ağaç sınırı) başına bir kez kurulur; model sürümü değişince yenilenir
+explain_config = config.get("explain", {})
+_explainers = {}
+_explainers_lock = threading.Lock()
+
+def get_explainer(mode: str, max_trees: int = None) -> Explainer:
+    version = get_active_model()[0]
+    key = (version, mode, max_trees)
+    explainer = _explainers.get(key)
+    if explainer is None:
+        with _explainers_lock:
+            explainer = _explainers.get(key)
+            if explainer is None:
+                features = config["features"]["numerical"]
+                background = None
+                if mode == "interventional":
+                    # Temsili arka plan: global açıklamalarla aynı, sınıf oranını koruyan tohumlu örneklem
+                    # (dosya sırasındaki ilk satırlar base value'yu ve katkıları yanlı yapar);
+                    # tüm tablo belleğe alınmaz, sadece hedef sütun ve seçilen satırlar okunur
+                    background = sample_background(scan_features(config), features, config["features"]["target"],
+                                                   explain_config.get("background_size", 100),
+                                                   config.get("base", {}).get("random_state", 42))
+                explainer = Explainer(load_model_version(config, version), features, mode=mode,
+                                      background=background, max_trees=max_trees, version=version,
+                                      cache_size=explain_config.get("cache_size", 1024))
+                # Eski sürümlere ait explainer'ları bırak
+                for old_key in [k for k in _explainers if k[0] != version]:
+                    del _explainers[old_key]
+                _explainers[key] = explainer
+    return explainer
+
+# Eğitimde hesaplanan global açıklamalar; sürüm başına bir kez diskten okunur
+_global_explanations = {}
+
+def get_global_explanations(version: str):
+    if version not in _global_explanations:
+        summary = None
+        if version != LEGACY_VERSION:
+            summary = ModelRegistry(registry_config["path"]).load_artifact(version, GLOBAL_ARTIFACT)
+        _global_explanations.clear()
+        _global_explanations[version] = summary
+    return _global_explanations[version]
+
+def explain_columns(data: dict, mode: str, max_trees: int = None) -> dict:
+    """
+    Ham okumalar için arıza sınıfının SHAP değerlerini tek çağrıda hesaplar.
+    """
+    explainer = get_explainer(mode, max_trees)
+    full_df = create_features(pl.DataFrame(data)).to_pandas()
+    values = explainer.explain(full_df)
+    return {
+        "model_version": explainer.version,
+        "mode": mode,
+        "base_value": float(explainer.base_value),
+        "feature_names": explainer.feature_names,
+        "shap_values": values.tolist()
+    }
+
+# Çıkarım süreç havuzu (isteğe bağlı); ilk tahminde kurulur, böylece gunicorn preload'da
+# master sürecinde alt süreç başlatılmaz
+serving_config = config.get("api", {}).get("serving", {})
+_inference_pool = None
+_pool_lock = threading.Lock()
+
+def get_inference_pool():
+    global _inference_pool
+    if _inference_pool is None and serving_config.get("inference_processes", 0) > 0:
+        with _pool_lock:
+            if _inference_pool is None:
+                _inference_pool = InferencePool(
+                    serving_config["inference_processes"],
+                    max_pending=serving_config.get("inference_max_pending"),
+                    queue_timeout_ms=serving_config.get("inference_queue_timeout_ms", 0),
+                    version=get_active_model()[0]
+                )
+    return _inference_pool
+
+# Eşzamanlı tekil /predict isteklerini birleştiren micro-batcher
+batching_config = config.get("api", {}).get("micro_batching", {})
+batcher = None
+if batching_config.get("enabled", False):
+    batcher = MicroBatcher(
+        predict_rows,
+        max_batch_size=batching_config.get("max_batch_size", 64),
+        max_wait_ms=batching_config.get("max_wait_ms", 2.0)
+    )
+
+# Tahmin kayıtları için sınırlı, arka planda toplu yazan kuyruk (write-behind).
+# Yazıcı (ve iş parçacığı) import'ta değil uygulama açılışında kurulur; o zamana kadar
+# (ve lifespan çalışmayan ortamlarda) None'dır ve tahminler kaydedilmez.
+logging_config = config.get("api", {}).get("prediction_logging", {})
+prediction_log = None
+
+def start_prediction_log() -> BufferedWriter:
+    init_db()
+    return BufferedWriter(
+        flush_rows=logging_config.get("batch_size", 500),
+        flush_interval_ms=logging_config.get("flush_interval_ms", 1000),
+        max_pending=logging_config.get("max_pending", 10000),
+        # Tampon doluyken yazar kısa süre bekler (backpressure), sonra kaydı düşürür
+        enqueue_timeout_ms=logging_config.get("enqueue_timeout_ms", 50)
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global prediction_log
+    if logging_config.get("enabled", False):
+        prediction_log = await run_in_threadpool(start_prediction_log)
+    watcher = None
+    if registry_config.get("path") and registry_config.get("watch", False):
+        watcher = asyncio.create_task(watch_registry(registry_config.get("poll_interval_seconds", 5)))
+    yield
+    if watcher is not None:
+        watcher.cancel()
+    # Kapanışta arka plan görevlerini durdur
+    if batcher is not None:
+        await batcher.stop()
+    # Kuyrukta kalan tahmin kayıtlarını veritabanına yaz
+    if prediction_log is not None:
+        await run_in_threadpool(prediction_log.close)
+    if _inference_pool is not None:
+        await run_in_threadpool(_inference_pool.shutdown)
+
+app = FastAPI(
+    title="Manufacturing Analytics API",
+    description="Endüstriyel Kestirimci Bakım Modeli API'si",
+    version="1.0.0",
+    lifespan=lifespan
+)
+# Yük atma: süreç başına eşzamanlı tahmin isteği sınırı, kuyruk doluysa 429.
+# MetricsMiddleware en dışta kalır, reddedilen istekler de sayılır.
+SHED = metrics.counter("api_shed_requests_total", "Requests rejected with 429 (concurrency limit or full inference pool).", ("path",))
+if serving_config.get("max_concurrency"):
+    app.add_middleware(ConcurrencyLimitMiddleware,
+                       max_concurrency=serving_config["max_concurrency"],
+                       max_queue=serving_config.get("max_queue", 0),
+                       retry_after=serving_config.get("retry_after_seconds", 1),
+                       shed=SHED)
+app.add_middleware(MetricsMiddleware, requests=REQUESTS, errors=ERRORS, latency=REQUEST_LATENCY)
+
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request, exc: Overloaded):
+    # Çıkarım havuzu dolu: istek beklemeden reddedilir
+    SHED.inc(path=request.url.path)
+    return JSONResponse(status_code=429, content={"detail": str(exc)},
+                        headers={"Retry-After": str(serving_config.get("retry_after_seconds", 1))})
+
+# Kuyruk/önbellek durumları kazıma anında okunur
+metrics.gauge("api_batching_queue_depth", "Requests waiting in the micro-batcher.").set_function(
+    lambda: batcher.stats()["queue_depth"] if batcher is not None else None)
+metrics.gauge("api_prediction_log_pending", "Prediction records waiting to be written.").set_function(
+    lambda: prediction_log.stats()["pending"] if prediction_log is not None else None)
+metrics.gauge("api_prediction_log_dropped", "Prediction records dropped because the queue was full.").set_function(
+    lambda: prediction_log.stats()["rows_dropped"] if prediction_log is not None else None)
+metrics.gauge("api_inference_pool_pending", "Calls queued or running in the inference process pool.").set_function(
+    lambda: _inference_pool.pending if _inference_pool is not None else None)
+metrics.gauge("api_prediction_cache_entries", "Entries in the prediction cache.").set_function(
+    lambda: prediction_cache.stats()["size"] if prediction_cache is not None else None)
+metrics.gauge("api_prediction_cache_hits", "Prediction cache hits since start.").set_function(
+    lambda: prediction_cache.hits if prediction_cache is not None else None)
+metrics.gauge("api_prediction_cache_misses", "Prediction cache misses since start.").set_function(
+    lambda: prediction_cache.misses if prediction_cache is not None else None)
 
 @app.get("/")
 def read_root():
     return {"message": "API Çalışıyor. Tahmin için /predict endpoint'ini kullanın."}
 
-@app.post("/predict", response_model=PredictionResponse)
-def predict(request: PredictionRequest):
-    # Veriyi hazırla
-    data = {
-        "air_temp": request.air_temp,
-        "process_temp": request.process_temp,
-        "rpm": request.rpm,
-        "torque": request.torque,
-        "tool_wear": request.tool_wear
-    }
-    
-    # Feature Engineering
-    df = pl.DataFrame([data])
-    full_df = create_features(df).to_pandas()
-    
-    # Modelin beklediği sütunları seç
-    model_features = config["features"]["numerical"]
-    df_processed = full_df[model_features]
-    
-    # Tahmin
-    prediction = model.predict(df_processed)[0]
-    probability = model.predict_proba(df_processed)[0][1]
-    
-    status = "Arıza Riski Yüksek" if prediction == 1 else "Normal"
-    
-    return {
-        "prediction": int(prediction),
-        "probability": float(probability),
-        "status": status
-    }
+@app.get("/ready")
+async def ready():
+    # Hazırlık kontrolü: model henüz yüklenmediyse burada yüklenir
+    try:
+        predictor = await run_in_threadpool(get_predictor)
+    except HTTPException as e:
+        return JSONResponse(status_code=503, content={"ready": False, "detail": e.detail})
+    return {"ready": True, "engine": type(predictor).__name__, "model_version": _active_model[0]}
+
+@app.get("/model")
+async def model_info():
+    version, predictor, _ = await run_in_threadpool(get_active_model)
+    return {"model_version": version, "engine": type(predictor).__name__}
+
+@app.post("/model/reload")
+async def model_reload():
+    # Yeni sürümü yükle; hata olursa aktif model değişmez
+    try:
+        previous, version = await run_in_threadpool(reload_model)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {"previous_version": previous, "model_version": version, "reloaded": previous != version}
+
+def parse_body(model, body: bytes):
+    """
+    İstek gövdesini doğrudan JSON'dan şemaya göre doğrular; hata biçimi FastAPI'nin
+    kendi doğrulamasıyla aynıdır (422, loc "body" ile başlar). Batch boyutu sınırını
+    aşan listeler 413 döner.
+    """
+    try:
+        return model.model_validate_json(body)
+    except ValidationError as e:
+        if any(error["type"] == "too_long" for error in e.errors()):
+            raise HTTPException(status_code=413, detail=f"Batch boyutu en fazla {MAX_BATCH_SIZE} olabilir.")
+        errors = [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        raise RequestValidationError(errors, body=body)
+
+def json_body(model) -> dict:
+    # Gövde uç noktada ayrıştırıldığı için şema OpenAPI'ye elle eklenir
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": model.model_json_schema()}}}}
+
+# Tahmin uç noktaları gövdeyi kendileri ayrıştırır: "validation" aşaması JSON çözme ve
+# Pydantic doğrulamasını da kapsar (FastAPI'nin gövde işleme süresi ölçülmez kalmaz)
+@app.post("/predict", response_model=PredictionResponse, openapi_extra=json_body(PredictionRequest))
+async def predict(http_request: Request):
+    body = await http_request.body()
+    with timed("validation", observer=observe_stage):
+        request = parse_body(PredictionRequest, body)
+        row = {field: getattr(request, field) for field in RAW_FIELDS}
+
+    # Micro-batching açıksa eşzamanlı isteklerle birlikte tek model çağrısında tahmin edilir
+    if batcher is not None:
+        return await batcher.submit(row)
+    results = await run_in_threadpool(predict_rows, [row])
+    return results[0]
+
+@app.get("/metrics")
+def metrics_endpoint():
+    return Response(metrics.render(), media_type=MetricsRegistry.CONTENT_TYPE)
+
+@app.get("/batching/stats")
+def batching_stats():
+    model_version = _active_model[0] if _active_model is not None else None
+    if batcher is None:
+        return {"enabled": False, "model_version": model_version}
+    return {"enabled": True, "model_version": model_version, **batcher.stats()}
+
+@app.get("/logging/stats")
+def logging_stats():
+    if prediction_log is None:
+        return {"enabled": False}
+    return {"enabled": True, **prediction_log.stats()}
+
+@app.get("/cache/stats")
+def cache_stats():
+    if prediction_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **prediction_cache.stats()}
+
+def batch_columns(request: BatchPredictionRequest) -> dict:
+    """
+    Toplu isteği kontrol edip sütun sözlüğüne çevirir (hatalarda HTTPException).
+    """
+    if (request.rows is None) == (request.columns is None):
+        raise HTTPException(status_code=422, detail="'rows' veya 'columns' alanlarından yalnızca biri gönderilmelidir.")
+
+    # Satır listesini sütun sözlüğüne çevir
+    if request.rows is not None:
+        data = {field: [getattr(row, field) for row in request.rows] for field in RAW_FIELDS}
+    else:
+        data = {field: getattr(request.columns, field) for field in RAW_FIELDS}
+        if len({len(values) for values in data.values()}) > 1:
+            raise HTTPException(status_code=422, detail="Tüm sütun dizileri aynı uzunlukta olmalıdır.")
+    return data
+
+@app.post("/predict/batch", response_model=BatchPredictionResponse, openapi_extra=json_body(BatchPredictionRequest))
+async def predict_batch(http_request: Request):
+    body = await http_request.body()
+    with timed("validation", observer=observe_stage):
+        data = batch_columns(parse_body(BatchPredictionRequest, body))
+    if not data[RAW_FIELDS[0]]:
+        return {"predictions": []}
+    return {"predictions": await run_in_threadpool(predict_columns, data)}
+
+@app.get("/explain/global")
+async def explain_global():
+    version = (await run_in_threadpool(get_active_model))[0]
+    summary = await run_in_threadpool(get_global_explanations, version)
+    if summary is None:
+        raise HTTPException(status_code=404, detail=f"{version} sürümü için global açıklama artefaktı yok.")
+    return {"model_version": version, **summary}
+
+@app.post("/explain", response_model=ExplainResponse)
+def explain(request: ExplainRequest):
+    mode = request.mode or explain_config.get("mode", "exact")
+    # İstekteki ağaç sınırı yapılandırmadaki sınırı aşamaz
+    limits = [limit for limit in (request.max_trees, explain_config.get("max_trees")) if limit]
+    max_trees = min(limits) if limits else None
+
+    batch_size = len(request.rows)
+    max_size = explain_config.get("max_batch_size", 256)
+    if batch_size > max_size:
+        raise HTTPException(status_code=413, detail=f"Batch boyutu {batch_size}, izin verilen en fazla {max_size}.")
+    if batch_size == 0:
+        raise HTTPException(status_code=422, detail="En az bir satır gönderilmelidir.")
+
+    data = {field: [getattr(row, field) for row in request.rows] for field in RAW_FIELDS}
+    try:
+        return explain_columns(data, mode, max_trees)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
 
 if __name__ == "__main__":
     import uvicorn
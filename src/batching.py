@@ -0,0 +1,134 @@
+import asyncio
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Batch boyutu histogramı için üst sınırlar (Prometheus tarzı kümülatif değil, kova başına sayım)
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+
+class MicroBatcher:
+    """
+    Collects concurrent single-item requests into one batch call.
+
+    Items submitted within ``max_wait_ms`` of the first queued item (up to
+    ``max_batch_size``) are passed together to ``predict_fn``, which runs in
+    the default executor so the event loop stays responsive. Each caller gets
+    back its own element of the returned list.
+    """
+
+    def __init__(self, predict_fn, max_batch_size: int = 64, max_wait_ms: float = 2.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._loop = None
+        self._queue = None
+        self._worker = None
+        # Kuyruktan alınmış, sonucu henüz dağıtılmamış istekler (toplanan/çalışan batch)
+        self._inflight = []
+
+        self.batches_total = 0
+        self.items_total = 0
+        self.last_batch_size = 0
+        self.max_seen_batch_size = 0
+        self.batch_size_counts = {bucket: 0 for bucket in BATCH_SIZE_BUCKETS + ["+Inf"]}
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        # Event loop değiştiyse (ör. test istemcisi) kuyruğu ve worker'ı yeniden kur
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, item):
+        """
+        Queues one item and waits for its result.
+        """
+        self._ensure_started()
+        future = self._loop.create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def stop(self):
+        """
+        Cancels the worker task; pending callers (queued or in the batch being
+        collected or computed) receive CancelledError.
+        """
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+
+        pending = list(self._inflight)
+        self._inflight = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.cancel()
+
+    async def _collect(self) -> list:
+        batch = self._inflight = []
+        batch.append(await self._queue.get())
+        deadline = self._loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            # Kuyrukta bekleyenleri beklemeden al
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            items = [item for item, _ in batch]
+            self._record(len(items))
+
+            try:
+                results = await self._loop.run_in_executor(None, self.predict_fn, items)
+            except Exception as e:
+                logger.error(f"Micro-batch inference error: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                self._inflight = []
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            self._inflight = []
+
+    def _record(self, size: int):
+        self.batches_total += 1
+        self.items_total += size
+        self.last_batch_size = size
+        self.max_seen_batch_size = max(self.max_seen_batch_size, size)
+        bucket = next((b for b in BATCH_SIZE_BUCKETS if size <= b), "+Inf")
+        self.batch_size_counts[bucket] += 1
+
+    def stats(self) -> dict:
+        """
+        Returns queue depth and batch size metrics.
+        """
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batches_total": self.batches_total,
+            "items_total": self.items_total,
+            "mean_batch_size": self.items_total / self.batches_total if self.batches_total else 0.0,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size_seen": self.max_seen_batch_size,
+            "batch_size_counts": {str(k): v for k, v in self.batch_size_counts.items()},
+        }
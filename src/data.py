@@ -1,29 +1,134 @@
 import polars as pl
 import os
+import shutil
+import urllib.request
 from src.utils import get_logger
+from src.feature_store import FeatureStore
 
 logger = get_logger(__name__)
 
-def ingest_data(url: str, raw_path: str) -> pl.DataFrame:
+# UCI AI4I ham sütun isimleri -> proje içi isimler
+RAW_COLUMN_MAP = {
+    "UDI": "id",
+    "Air temperature [K]": "air_temp",
+    "Process temperature [K]": "process_temp",
+    "Rotational speed [rpm]": "rpm",
+    "Torque [Nm]": "torque",
+    "Tool wear [min]": "tool_wear",
+    "Machine failure": "target"
+}
+
+def download_raw(url: str, raw_path: str, chunk_size: int = 1 << 20) -> str:
     """
-    Downloads data from a URL and saves it to a local path.
+    Streams a remote file to disk in fixed-size chunks (skips if it already exists).
     """
     if os.path.exists(raw_path):
         logger.info(f"Data already exists at {raw_path}")
-        return pl.read_csv(raw_path)
-        
+        return raw_path
+
     logger.info(f"Downloading data from {url}...")
+    os.makedirs(os.path.dirname(raw_path), exist_ok=True)
+    tmp_path = raw_path + ".part"
     try:
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(raw_path), exist_ok=True)
-        
-        df = pl.read_csv(url)
-        df.write_csv(raw_path)
-        logger.info(f"Data saved to {raw_path}")
-        return df
+        with urllib.request.urlopen(url) as response, open(tmp_path, "wb") as f:
+            shutil.copyfileobj(response, f, chunk_size)
+        os.replace(tmp_path, raw_path)
     except Exception as e:
         logger.error(f"Error downloading data: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
         raise e
+    logger.info(f"Data saved to {raw_path}")
+    return raw_path
+
+def ingest_data(url: str, raw_path: str) -> pl.DataFrame:
+    """
+    Downloads data from a URL and saves it to a local path.
+    """
+    download_raw(url, raw_path)
+    return pl.read_csv(raw_path)
+
+def scan_csv_renamed(path: str) -> pl.LazyFrame:
+    """
+    Lazily scans a raw CSV and applies the column rename (no-op if already renamed).
+    """
+    return pl.scan_csv(path).rename(RAW_COLUMN_MAP, strict=False)
+
+def stream_ingest(source: str, parquet_dir: str, rows_per_file: int = 500_000) -> str:
+    """
+    Streams a raw CSV into a directory of Parquet files without loading it into memory.
+
+    The rename is applied lazily and the query is executed by Polars' streaming
+    engine via sink_parquet, split into files of at most rows_per_file rows.
+    Output is written next to the target and swapped in once complete.
+    """
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"Data file not found at {source}")
+
+    tmp_dir = parquet_dir.rstrip("/") + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    logger.info(f"Streaming {source} -> {parquet_dir} ({rows_per_file} rows/file)...")
+    scan_csv_renamed(source).sink_parquet(
+        pl.PartitionBy(tmp_dir, max_rows_per_file=rows_per_file),
+        mkdir=True
+    )
+
+    shutil.rmtree(parquet_dir, ignore_errors=True)
+    os.replace(tmp_dir, parquet_dir)
+    logger.info(f"Parquet dataset saved to {parquet_dir}")
+    return parquet_dir
+
+def scan_raw(raw_path: str, parquet_dir: str = None) -> pl.LazyFrame:
+    """
+    Returns the renamed raw dataset as a LazyFrame, preferring the Parquet
+    output of stream_ingest and falling back to the CSV.
+    """
+    if parquet_dir and os.path.isdir(parquet_dir) and os.listdir(parquet_dir):
+        return pl.scan_parquet(os.path.join(parquet_dir, "*.parquet"))
+    if not os.path.exists(raw_path):
+        raise FileNotFoundError(f"Data file not found at {raw_path}")
+    return scan_csv_renamed(raw_path)
+
+def scan_processed(processed_path: str, parquet_path: str = None) -> pl.LazyFrame:
+    """
+    Returns the processed (feature engineered) dataset as a LazyFrame,
+    preferring the typed Parquet file and falling back to the CSV export.
+    """
+    if parquet_path and os.path.exists(parquet_path):
+        return pl.scan_parquet(parquet_path)
+    if not os.path.exists(processed_path):
+        raise FileNotFoundError(f"Data file not found at {processed_path}")
+    return pl.scan_csv(processed_path)
+
+def _feature_store(config: dict):
+    store_config = config.get("feature_store", {})
+    if not store_config.get("enabled", False):
+        return None
+    store = FeatureStore(store_config["path"], store_config.get("watermark_column", "id"))
+    return store if store.files() else None
+
+def feature_source_files(config: dict) -> list:
+    """
+    Returns the files scan_features reads from (used for content hashing).
+    """
+    store = _feature_store(config)
+    if store is not None:
+        return store.files()
+    parquet_path = config["data"].get("processed_parquet_path")
+    if parquet_path and os.path.exists(parquet_path):
+        return [parquet_path]
+    return [config["data"]["processed_path"]]
+
+def scan_features(config: dict) -> pl.LazyFrame:
+    """
+    Returns the processed features configured in params.yaml: the incremental
+    feature store when enabled and populated, otherwise the processed files.
+    """
+    store = _feature_store(config)
+    if store is not None:
+        return store.scan()
+    return scan_processed(config["data"]["processed_path"], config["data"].get("processed_parquet_path"))
 
 def load_data(path: str) -> pl.DataFrame:
     """
@@ -1,5 +1,12 @@
 import psycopg2
+import psycopg2.pool
+import psycopg2.extras
+import sqlite3
+import threading
+import time
+import weakref
 import pandas as pd
+from contextlib import contextmanager
 from datetime import datetime
 import os
 from src.utils import get_logger
@@ -13,8 +20,38 @@ DB_USER = os.getenv("DB_USER", "admin")
 DB_PASS = os.getenv("DB_PASS", "secret123")
 DB_PORT = os.getenv("DB_PORT", "5432")
 
+# "postgres" (varsayılan) veya yerel geliştirme/test için "sqlite"
+DB_BACKEND = os.getenv("DB_BACKEND", "postgres")
+DB_PATH = os.getenv("DB_PATH", "data/manufacturing.db")
+
+# Bağlantı havuzu ayarları
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+# Postgres'te logs tablosunu aylık aralık bölümlerine (partition) ayır
+DB_PARTITION_LOGS = os.getenv("DB_PARTITION_LOGS", "0") == "1"
+DB_PARTITION_MONTHS_AHEAD = int(os.getenv("DB_PARTITION_MONTHS_AHEAD", "3"))
+
+# Bu süreden uzun boşta kalan bağlantı, kullanılmadan önce "SELECT 1" ile sınanır (saniye)
+DB_HEALTHCHECK_INTERVAL = float(os.getenv("DB_HEALTHCHECK_INTERVAL", "30"))
+
+# logs tablosuna yazılan sütunlar (id veritabanı tarafından atanır)
+LOG_COLUMNS = [
+    "timestamp", "air_temp", "process_temp", "rpm", "torque",
+    "tool_wear", "prediction", "probability", "status"
+]
+# Sorgularda seçilebilecek sütunlar (projeksiyon için beyaz liste)
+HISTORY_COLUMNS = ["id"] + LOG_COLUMNS
+
 def get_connection():
+    """
+    Havuzdan bağımsız, yeni bir ham bağlantı açar.
+    """
     try:
+        if DB_BACKEND == "sqlite":
+            if os.path.dirname(DB_PATH):
+                os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+            return sqlite3.connect(DB_PATH, check_same_thread=False)
+
         conn = psycopg2.connect(
             host=DB_HOST,
             database=DB_NAME,
@@ -30,21 +67,322 @@ def get_connection():
         # Veritabanı kritik olduğu için hatayı loglayıp fırlatmak daha dürüst bir yaklaşım.
         raise e
 
+class _SQLitePool:
+    """
+    psycopg2 havuzuyla aynı arayüze (getconn/putconn/closeall) sahip basit SQLite havuzu.
+    """
+    def __init__(self, maxconn: int):
+        self.maxconn = maxconn
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def getconn(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return get_connection()
+
+    def putconn(self, conn, close=False):
+        with self._lock:
+            if close or len(self._idle) >= self.maxconn:
+                conn.close()
+            else:
+                self._idle.append(conn)
+
+    def closeall(self):
+        with self._lock:
+            for conn in self._idle:
+                conn.close()
+            self._idle = []
+
+class _BoundedPool:
+    """
+    Havuz, bağlantı yuvaları ve boşta bekleyen bağlantıların son kullanım zamanları tek
+    nesnede tutulur; close_pool veya fork sonrası hepsi birlikte yenilenir.
+    """
+    def __init__(self, pool, maxconn: int):
+        self._pool = pool
+        # Havuz boşken ThreadedConnectionPool hata fırlatır; semafor ile bekletiyoruz
+        self.slots = threading.BoundedSemaphore(maxconn)
+        # Anahtar bağlantı nesnesinin kendisi (id() yeniden kullanılabilir); kayıt sadece
+        # bağlantı havuzda boşta beklerken tutulur
+        self._last_used = {}
+
+    def getconn(self):
+        """
+        (bağlantı, son kullanım zamanı) döner; yeni açılan bağlantı için zaman 0'dır.
+        """
+        conn = self._pool.getconn()
+        return conn, self._last_used.pop(conn, 0)
+
+    def putconn(self, conn, close=False):
+        if not close:
+            self._last_used[conn] = time.monotonic()
+        self._pool.putconn(conn, close=close)
+        # Havuzun kendi kapattığı (ör. minconn fazlası) bağlantının kaydı da bırakılır
+        if close or getattr(conn, "closed", 0):
+            self._last_used.pop(conn, None)
+
+    def closeall(self):
+        self._pool.closeall()
+        self._last_used.clear()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> _BoundedPool:
+    """
+    Süreç genelinde paylaşılan bağlantı havuzunu (ilk çağrıda) oluşturur.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                if DB_BACKEND == "sqlite":
+                    pool = _SQLitePool(DB_POOL_MAX)
+                else:
+                    pool = psycopg2.pool.ThreadedConnectionPool(
+                        DB_POOL_MIN, DB_POOL_MAX,
+                        host=DB_HOST,
+                        database=DB_NAME,
+                        user=DB_USER,
+                        password=DB_PASS,
+                        port=DB_PORT
+                    )
+                _pool = _BoundedPool(pool, DB_POOL_MAX)
+    return _pool
+
+def close_pool():
+    """
+    Havuzdaki tüm bağlantıları kapatır (uygulama kapanışı ve testler için).
+    Açık bağlantılar, ödünç aldıkları eski havuza ve onun yuvalarına geri döner.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+def _reset_pool_after_fork():
+    # fork sonrası (ör. gunicorn preload) çocuk süreç ebeveynin soketlerini kullanmamalı;
+    # bağlantılar kapatılmadan bırakılır, ilk kullanımda yeni havuz açılır
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+os.register_at_fork(after_in_child=_reset_pool_after_fork)
+
+def _is_healthy(conn, last_used: float) -> bool:
+    if getattr(conn, "closed", 0):
+        return False
+    # Yakın zamanda kullanılan bağlantı için ekstra round-trip yapma
+    if time.monotonic() - last_used < DB_HEALTHCHECK_INTERVAL:
+        return True
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+        cursor.close()
+        conn.rollback()
+        return True
+    except Exception:
+        return False
+
+@contextmanager
+def connection():
+    """
+    Havuzdan sağlıklı bir bağlantı ödünç verir; blok başarıyla biterse commit, hata olursa rollback yapar.
+    """
+    # Bağlantı ve yuva aynı havuz nesnesinden alınır ve ona iade edilir
+    pool = get_pool()
+    pool.slots.acquire()
+    conn = None
+    broken = False
+    try:
+        conn, last_used = pool.getconn()
+        if not _is_healthy(conn, last_used):
+            logger.warning("Sağlıksız bağlantı havuzdan atıldı, yenisi açılıyor.")
+            pool.putconn(conn, close=True)
+            conn, _ = pool.getconn()
+
+        yield conn
+        conn.commit()
+    except Exception:
+        if conn is not None:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+        raise
+    finally:
+        if conn is not None:
+            broken = broken or bool(getattr(conn, "closed", 0))
+            pool.putconn(conn, close=broken)
+        pool.slots.release()
+
+def _placeholder() -> str:
+    # Postgres yer tutucusu %s, SQLite'ınki ? dir.
+    return "?" if DB_BACKEND == "sqlite" else "%s"
+
 def init_db():
     """
     Veritabanını ve gerekli tabloları oluşturur.
     PostgreSQL için tablo yapısı.
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Logs tablosu: Sensör verileri + Model Tahminleri
         # Postgres'te AUTOINCREMENT yerine SERIAL kullanılır.
+        id_column = "INTEGER PRIMARY KEY AUTOINCREMENT" if DB_BACKEND == "sqlite" else "SERIAL PRIMARY KEY"
+
+        with connection() as conn:
+            cursor = conn.cursor()
+
+            # Logs tablosu: Sensör verileri + Model Tahminleri
+            cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS logs (
+                id {id_column},
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                air_temp REAL,
+                process_temp REAL,
+                rpm INTEGER,
+                torque REAL,
+                tool_wear INTEGER,
+                prediction INTEGER,
+                probability REAL,
+                status TEXT
+            )
+            """)
+            cursor.close()
+
+        migrate_db()
+        if DB_PARTITION_LOGS and DB_BACKEND != "sqlite":
+            enable_monthly_partitioning(DB_PARTITION_MONTHS_AHEAD)
+        logger.info(f"Veritabanı ve tablo kontrolü tamamlandı ({DB_BACKEND}).")
+    except Exception as e:
+        logger.error(f"Tablo oluşturma hatası: {e}")
+
+def _migration_add_log_indexes(cursor):
+    # Geçmiş sekmesi zaman aralığı ve duruma göre filtreler
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs (timestamp)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_status ON logs (status)")
+
+# Şema migrasyonları: (versiyon, açıklama, uygulayan fonksiyon). Sadece sona ekleyin.
+MIGRATIONS = [
+    (1, "logs timestamp/status indeksleri", _migration_add_log_indexes),
+]
+
+def migrate_db():
+    """
+    Henüz uygulanmamış şema migrasyonlarını sırayla uygular.
+    Her migrasyon kendi transaction'ında çalışır ve schema_migrations tablosuna işlenir.
+    """
+    with connection() as conn:
+        cursor = conn.cursor()
         cursor.execute("""
-        CREATE TABLE IF NOT EXISTS logs (
-            id SERIAL PRIMARY KEY,
-            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """)
+        cursor.execute("SELECT version FROM schema_migrations")
+        applied = {row[0] for row in cursor.fetchall()}
+        cursor.close()
+
+    for version, name, migration in MIGRATIONS:
+        if version in applied:
+            continue
+        with connection() as conn:
+            cursor = conn.cursor()
+            migration(cursor)
+            cursor.execute(
+                f"INSERT INTO schema_migrations (version, name) VALUES ({_placeholder()}, {_placeholder()})",
+                (version, name)
+            )
+            cursor.close()
+        logger.info(f"Migrasyon uygulandı: {version} - {name}")
+
+def _month_start(value: datetime, offset: int = 0) -> datetime:
+    month_index = value.year * 12 + (value.month - 1) + offset
+    return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+def _create_log_partition(cursor, month: datetime):
+    """
+    month için aylık bölümü oluşturur. O aralıkta logs_default'a düşmüş kayıtlar varsa
+    (süreç months_ahead'i aşacak kadar uzun çalıştıysa) aynı transaction'da yeni bölüme
+    taşınır; aksi halde PostgreSQL bölümü eklemeyi reddeder.
+    """
+    name = f"logs_y{month.year}m{month.month:02d}"
+    cursor.execute("SELECT to_regclass(%s)", (name,))
+    if cursor.fetchone()[0] is not None:
+        return
+    next_month = _month_start(month, 1)
+    bounds = f"FROM ('{month:%Y-%m-%d}') TO ('{next_month:%Y-%m-%d}')"
+    cursor.execute(f"CREATE TABLE {name} (LIKE logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    cursor.execute(f"""
+    WITH moved AS (
+        DELETE FROM logs_default
+        WHERE timestamp >= '{month:%Y-%m-%d}' AND timestamp < '{next_month:%Y-%m-%d}'
+        RETURNING *
+    )
+    INSERT INTO {name} SELECT * FROM moved
+    """)
+    # Ekleme sırasında bölümlü indeksler (birincil anahtar dahil) yeni bölümde oluşturulur
+    cursor.execute(f"ALTER TABLE logs ATTACH PARTITION {name} FOR VALUES {bounds}")
+
+def ensure_log_partitions(months_ahead: int = 3, since: datetime = None, cursor=None):
+    """
+    Bölümlenmiş logs tablosu için since ayından itibaren önümüzdeki months_ahead aya kadar
+    aylık bölümleri oluşturur (varsa dokunmaz). Sadece PostgreSQL.
+    cursor verilirse çağıranın transaction'ında çalışır.
+    """
+    start = _month_start(since or datetime.now())
+    end = _month_start(datetime.now(), months_ahead + 1)
+
+    if cursor is None:
+        with connection() as conn:
+            cursor = conn.cursor()
+            ensure_log_partitions(months_ahead, since, cursor)
+            cursor.close()
+        return
+
+    month = start
+    while month < end:
+        _create_log_partition(cursor, month)
+        month = _month_start(month, 1)
+
+def enable_monthly_partitioning(months_ahead: int = 3):
+    """
+    logs tablosunu timestamp üzerinde aylık RANGE bölümlü tabloya dönüştürür (PostgreSQL).
+    Zaten bölümlüyse sadece ileriye dönük bölümleri oluşturur. Mevcut kayıtlar ve id
+    sırası korunur; aralık dışındaki kayıtlar logs_default bölümüne düşer. Dönüşüm
+    (yeniden adlandırma, yeni tablo, veri taşıma, eski tablonun silinmesi) tek
+    transaction'dır: yarıda kalırsa hiçbir şey değişmemiş olur.
+    """
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+        SELECT 1 FROM pg_partitioned_table pt
+        JOIN pg_class c ON c.oid = pt.partrelid
+        WHERE c.relname = 'logs'
+        """)
+        if cursor.fetchone() is not None:
+            ensure_log_partitions(months_ahead, cursor=cursor)
+            cursor.close()
+            return
+
+        cursor.execute("SELECT MIN(timestamp) FROM logs")
+        oldest = cursor.fetchone()[0]
+
+        # Eski tabloyu kenara al; indeks isimleri yeni tabloda kullanılacak
+        cursor.execute("ALTER TABLE logs RENAME TO logs_unpartitioned")
+        cursor.execute("ALTER INDEX IF EXISTS idx_logs_timestamp RENAME TO idx_logs_unpartitioned_timestamp")
+        cursor.execute("ALTER INDEX IF EXISTS idx_logs_status RENAME TO idx_logs_unpartitioned_status")
+
+        # Bölüm anahtarı birincil anahtarda yer almak zorunda: (id, timestamp)
+        cursor.execute("""
+        CREATE TABLE logs (
+            id INTEGER NOT NULL DEFAULT nextval('logs_id_seq'),
+            timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
             air_temp REAL,
             process_temp REAL,
             rpm INTEGER,
@@ -52,61 +390,268 @@ def init_db():
             tool_wear INTEGER,
             prediction INTEGER,
             probability REAL,
-            status TEXT
-        )
+            status TEXT,
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
         """)
-        conn.commit()
+        cursor.execute("CREATE TABLE logs_default PARTITION OF logs DEFAULT")
+        cursor.execute("CREATE INDEX idx_logs_timestamp ON logs (timestamp)")
+        cursor.execute("CREATE INDEX idx_logs_status ON logs (status)")
+        # Sekans eski tabloyla birlikte silinmesin
+        cursor.execute("ALTER SEQUENCE logs_id_seq OWNED BY logs.id")
+
+        # Veri taşınmadan önce ilgili aylık bölümler hazır olmalı
+        ensure_log_partitions(months_ahead, since=oldest, cursor=cursor)
+
+        cursor.execute("""
+        INSERT INTO logs (id, timestamp, air_temp, process_temp, rpm, torque, tool_wear, prediction, probability, status)
+        SELECT id, COALESCE(timestamp, CURRENT_TIMESTAMP), air_temp, process_temp, rpm, torque, tool_wear, prediction, probability, status
+        FROM logs_unpartitioned
+        """)
+        cursor.execute("DROP TABLE logs_unpartitioned")
         cursor.close()
-        conn.close()
-        logger.info("Veritabanı ve tablo kontrolü tamamlandı (PostgreSQL).")
-    except Exception as e:
-        logger.error(f"Tablo oluşturma hatası: {e}")
+    logger.info("logs tablosu aylık bölümlü yapıya dönüştürüldü.")
 
-def insert_record(data: dict, prediction: int, probability: float):
+def make_record(data: dict, prediction: int, probability: float) -> dict:
     """
-    Bir tahmin sonucunu veritabanına kaydeder.
+    Ham sensör verisi ve tahmin sonucundan logs tablosuna yazılacak kaydı hazırlar.
     """
+    status = "Riskli" if prediction == 1 else "Normal"
+    # Postgres otomatik timestamp atar ama biz yine de gönderelim veya default bırakalım.
+    # Python tarafında zamanı belirlemek daha kontrollü.
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    return {
+        "timestamp": timestamp,
+        "air_temp": data['air_temp'],
+        "process_temp": data['process_temp'],
+        "rpm": data['rpm'],
+        "torque": data['torque'],
+        "tool_wear": data['tool_wear'],
+        "prediction": prediction,
+        "probability": probability,
+        "status": status
+    }
+
+def insert_records(records: list) -> int:
+    """
+    Birden çok kaydı tek round-trip ile yazar (Postgres'te execute_values).
+    Yazılan kayıt sayısını döner; hata durumunda 0.
+    """
+    if not records:
+        return 0
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        status = "Riskli" if prediction == 1 else "Normal"
-        # Postgres otomatik timestamp atar ama biz yine de gönderelim veya default bırakalım.
-        # Python tarafında zamanı belirlemek daha kontrollü.
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        values = [tuple(record[col] for col in LOG_COLUMNS) for record in records]
+        columns = ", ".join(LOG_COLUMNS)
 
-        # Postgres yer tutucusu %s dir.
-        cursor.execute("""
-        INSERT INTO logs (timestamp, air_temp, process_temp, rpm, torque, tool_wear, prediction, probability, status)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
-            timestamp,
-            data['air_temp'],
-            data['process_temp'],
-            data['rpm'],
-            data['torque'],
-            data['tool_wear'],
-            prediction,
-            probability,
-            status
-        ))
-        conn.commit()
-        cursor.close()
-        conn.close()
+        with connection() as conn:
+            cursor = conn.cursor()
+            if DB_BACKEND == "sqlite":
+                placeholders = ", ".join([_placeholder()] * len(LOG_COLUMNS))
+                cursor.executemany(f"INSERT INTO logs ({columns}) VALUES ({placeholders})", values)
+            else:
+                psycopg2.extras.execute_values(
+                    cursor, f"INSERT INTO logs ({columns}) VALUES %s", values, page_size=1000
+                )
+            cursor.close()
+        return len(records)
     except Exception as e:
-        logger.error(f"Kayıt ekleme hatası: {e}")
+        logger.error(f"Toplu kayıt ekleme hatası: {e}")
+        return 0
+
+def insert_record(data: dict, prediction: int, probability: float):
+    """
+    Bir tahmin sonucunu veritabanına kaydeder.
+    """
+    insert_records([make_record(data, prediction, probability)])
 
 def fetch_history(limit=100) -> pd.DataFrame:
     """
     Son kayıtları DataFrame olarak getirir.
     """
+    df, _ = fetch_history_page(limit=limit)
+    return df
+
+def fetch_history_page(limit=100, before_id=None, start=None, end=None, status=None, columns=None):
+    """
+    Kayıtları en yeniden eskiye keyset (cursor) sayfalama ile getirir.
+
+    before_id: önceki sayfanın döndürdüğü imleç; sadece daha eski (id < before_id) kayıtlar gelir.
+    start / end: timestamp aralığı filtresi (start dahil, end hariç).
+    status: "Riskli" / "Normal" filtresi.
+    columns: okunacak sütunlar (id her zaman eklenir); None ise tüm sütunlar.
+
+    (DataFrame, sonraki_imleç) döner; son sayfada imleç None olur.
+    """
+    columns = list(columns) if columns else list(HISTORY_COLUMNS)
+    unknown = [col for col in columns if col not in HISTORY_COLUMNS]
+    if unknown:
+        raise ValueError(f"Bilinmeyen sütun(lar): {unknown}")
+    if "id" not in columns:
+        columns = ["id"] + columns
+
+    ph = _placeholder()
+    conditions, params = [], []
+    if before_id is not None:
+        conditions.append(f"id < {ph}")
+        params.append(int(before_id))
+    if start is not None:
+        conditions.append(f"timestamp >= {ph}")
+        params.append(start)
+    if end is not None:
+        conditions.append(f"timestamp < {ph}")
+        params.append(end)
+    if status is not None:
+        conditions.append(f"status = {ph}")
+        params.append(status)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    params.append(int(limit))
+
+    query = f"SELECT {', '.join(columns)} FROM logs {where} ORDER BY id DESC LIMIT {ph}"
     try:
-        conn = get_connection()
-        query = f"SELECT * FROM logs ORDER BY id DESC LIMIT {limit}"
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        return df
+        with connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            df = pd.DataFrame(cursor.fetchall(), columns=columns)
+            cursor.close()
     except Exception as e:
         logger.error(f"Veri çekme hatası: {e}")
-        return pd.DataFrame() # Hata durumunda boş df dön
+        return pd.DataFrame(), None # Hata durumunda boş df dön
+
+    next_cursor = int(df["id"].iloc[-1]) if len(df) == int(limit) and len(df) > 0 else None
+    return df, next_cursor
+
+class BufferedWriter:
+    """
+    Kayıtları bellekte biriktirip her flush_rows kayıtta veya flush_interval_ms
+    dolduğunda insert_records ile toplu yazan arka plan yazıcısı.
+
+    max_pending verilirse tampon sınırlıdır: doluyken write() en fazla
+    enqueue_timeout_ms kadar yer açılmasını bekler (backpressure), sonra kaydı
+    düşürür ve dropped sayacını artırır.
+    """
+
+    def __init__(self, flush_rows: int = 100, flush_interval_ms: float = 1000,
+                 max_pending: int = None, enqueue_timeout_ms: float = 0):
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_pending = max_pending
+        self.enqueue_timeout = enqueue_timeout_ms / 1000.0
+
+        self._buffer = []
+        self._lock = threading.Lock()
+        # Tamponda yer açıldığında bekleyen yazarları uyandırır
+        self._space = threading.Condition(self._lock)
+        # Flush işlemlerinin sırayla yapılmasını sağlar
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+
+        self.rows_enqueued = 0
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.rows_dropped = 0
+        self.flushes = 0
+
+        self._start()
+        # fork sonrası çocuk süreçte kilitler ve arka plan iş parçacığı yeniden kurulur
+        _writers.add(self)
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name="db-buffered-writer", daemon=True)
+        self._thread.start()
+
+    def _after_fork(self):
+        # Tampondaki kayıtlar ebeveyne aittir; çocuk boş tamponla başlar
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._space = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self.rows_enqueued = self.rows_written = self.rows_failed = self.rows_dropped = self.flushes = 0
+        if not self._closed:
+            self._start()
+
+    def write(self, record: dict) -> bool:
+        """
+        Kaydı tampona ekler. Tampon dolu kaldıysa veya yazıcı kapatıldıysa (kapanış
+        sırasında süren istekler) kaydı düşürür ve False döner.
+        """
+        if self._closed:
+            with self._lock:
+                self.rows_dropped += 1
+            return False
+        with self._space:
+            if self.max_pending is not None and len(self._buffer) >= self.max_pending:
+                # Dolu tampon: yazıcıyı hemen uyandır ve kısa süre yer açılmasını bekle
+                self._wakeup.set()
+                if self.enqueue_timeout <= 0 or not self._space.wait_for(
+                    lambda: len(self._buffer) < self.max_pending, self.enqueue_timeout
+                ):
+                    self.rows_dropped += 1
+                    return False
+            self._buffer.append(record)
+            self.rows_enqueued += 1
+            full = len(self._buffer) >= self.flush_rows
+        if full:
+            self._wakeup.set()
+        return True
+
+    def flush(self) -> int:
+        """
+        Bekleyen kayıtları hemen yazar ve yazılan kayıt sayısını döner.
+        """
+        with self._flush_lock:
+            written = 0
+            while True:
+                with self._space:
+                    batch, self._buffer = self._buffer[:self.flush_rows], self._buffer[self.flush_rows:]
+                    self._space.notify_all()
+                if not batch:
+                    return written
+                batch_written = insert_records(batch)
+                written += batch_written
+                self.flushes += 1
+                self.rows_written += batch_written
+                self.rows_failed += len(batch) - batch_written
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    def close(self):
+        """
+        Arka plan iş parçacığını durdurur ve kalan kayıtları yazar.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending(),
+            "max_pending": self.max_pending,
+            "rows_enqueued": self.rows_enqueued,
+            "rows_written": self.rows_written,
+            "rows_failed": self.rows_failed,
+            "rows_dropped": self.rows_dropped,
+            "flushes": self.flushes,
+        }
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+# Tek bir fork kancası tüm canlı yazıcıları yeniden kurar (yazıcı başına kanca birikmez)
+_writers = weakref.WeakSet()
+
+def _restart_writers_after_fork():
+    for writer in list(_writers):
+        writer._after_fork()
 
+os.register_at_fork(after_in_child=_restart_writers_after_fork)
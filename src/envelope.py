@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import numpy as np
+import polars as pl
+from src.data import feature_source_files, scan_features
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+def data_version(files: list) -> str:
+    """
+    Cheap version of the feature data: path, size and mtime of every source
+    file (the chart does not need a full content hash).
+    """
+    stats = [(path, os.path.getsize(path), os.stat(path).st_mtime_ns) for path in sorted(files)]
+    return hashlib.sha256(json.dumps(stats).encode()).hexdigest()[:16]
+
+def compute_envelope(lf: pl.LazyFrame, x: str = "rpm", y: str = "torque", target: str = "target",
+                     x_bins: int = 60, y_bins: int = 40, max_failure_points: int = 500, seed: int = 42) -> dict:
+    """
+    Pre-aggregates an x/y scatter into a fixed-size 2D histogram (all rows and
+    failures only) plus a failure sample stratified over the histogram cells,
+    so the rendered chart has the same payload for any number of rows.
+    """
+    bounds = lf.select(
+        pl.col(x).min().alias("x_min"), pl.col(x).max().alias("x_max"),
+        pl.col(y).min().alias("y_min"), pl.col(y).max().alias("y_max"),
+    ).collect().row(0, named=True)
+    x_edges = np.linspace(bounds["x_min"], bounds["x_max"], x_bins + 1)
+    y_edges = np.linspace(bounds["y_min"], bounds["y_max"], y_bins + 1)
+
+    def bin_index(column, low, high, n):
+        width = (high - low) / n or 1.0
+        return ((pl.col(column) - low) / width).floor().cast(pl.Int32).clip(0, n - 1)
+
+    binned = lf.select(
+        pl.col(x), pl.col(y), pl.col(target),
+        bin_index(x, bounds["x_min"], bounds["x_max"], x_bins).alias("x_bin"),
+        bin_index(y, bounds["y_min"], bounds["y_max"], y_bins).alias("y_bin"),
+    )
+    cells = binned.group_by("x_bin", "y_bin").agg(
+        pl.len().alias("count"),
+        (pl.col(target) == 1).sum().alias("failures"),
+    ).collect()
+
+    counts = np.zeros((y_bins, x_bins), dtype=np.int64)
+    failures = np.zeros((y_bins, x_bins), dtype=np.int64)
+    counts[cells["y_bin"].to_numpy(), cells["x_bin"].to_numpy()] = cells["count"].to_numpy()
+    failures[cells["y_bin"].to_numpy(), cells["x_bin"].to_numpy()] = cells["failures"].to_numpy()
+
+    # Arıza noktaları: hücre başına, hücredeki arıza payı kadar (en az 1) rastgele örnek
+    total_failures = int(failures.sum())
+    sample = pl.DataFrame({x: [], y: []}, schema={x: pl.Float64, y: pl.Float64})
+    if total_failures:
+        quota = max_failure_points / total_failures
+        sample = (
+            binned.filter(pl.col(target) == 1)
+            .with_columns(
+                pl.int_range(pl.len()).shuffle(seed=seed).over("x_bin", "y_bin").alias("rank"),
+                pl.len().over("x_bin", "y_bin").alias("cell_failures"),
+            )
+            .filter(pl.col("rank") < (pl.col("cell_failures") * quota).ceil().clip(1, None))
+            .select(pl.col(x).cast(pl.Float64), pl.col(y).cast(pl.Float64))
+            .collect()
+        )
+        # Yuvarlama payından gelen fazlalık rastgele atılır
+        if sample.height > max_failure_points:
+            sample = sample.sample(n=max_failure_points, seed=seed)
+
+    return {
+        "x": x,
+        "y": y,
+        "rows": int(counts.sum()),
+        "x_edges": x_edges.tolist(),
+        "y_edges": y_edges.tolist(),
+        "counts": counts.tolist(),
+        "failures": failures.tolist(),
+        "failure_sample": {x: sample[x].to_list(), y: sample[y].to_list()},
+    }
+
+def load_envelope(config: dict) -> dict:
+    """
+    Returns the operating envelope for the current feature data, computing it
+    once per data version and settings and caching the result as JSON.
+    """
+    envelope_config = config.get("envelope", {})
+    settings = {
+        "x_bins": envelope_config.get("x_bins", 60),
+        "y_bins": envelope_config.get("y_bins", 40),
+        "max_failure_points": envelope_config.get("max_failure_points", 500),
+    }
+    version = data_version(feature_source_files(config))
+    key = hashlib.sha256(json.dumps([version, settings], sort_keys=True).encode()).hexdigest()[:16]
+    cache_root = envelope_config.get("cache_path", "data/cache/envelope")
+    cache_file = os.path.join(cache_root, f"{key}.json")
+
+    if os.path.exists(cache_file):
+        with open(cache_file, "r") as f:
+            return json.load(f)
+
+    logger.info(f"Envelope cache miss, computing {cache_file}...")
+    envelope = compute_envelope(scan_features(config), target=config["features"].get("target", "target"),
+                                seed=config.get("base", {}).get("random_state", 42), **settings)
+    envelope["data_version"] = version
+    os.makedirs(cache_root, exist_ok=True)
+    tmp_file = f"{cache_file}.tmp-{os.getpid()}"
+    with open(tmp_file, "w") as f:
+        json.dump(envelope, f)
+    os.replace(tmp_file, cache_file)
+    return envelope
@@ -0,0 +1,182 @@
+import copy
+import numpy as np
+import pandas as pd
+from src.prediction_cache import PredictionCache
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# "exact": tree_path_dependent TreeSHAP, "approximate": Saabas yaklaşımı (hızlı),
+# "interventional": arka plan örneğine göre (background gerekir)
+EXPLAIN_MODES = ("exact", "approximate", "interventional")
+
+def limit_trees(model, max_trees: int = None):
+    """
+    Returns a shallow copy of a bagged forest that only keeps the first
+    ``max_trees`` estimators. Boosted models are limited through
+    ``tree_limit`` at explain time instead.
+    """
+    estimators = getattr(model, "estimators_", None)
+    if not max_trees or not isinstance(estimators, list) or max_trees >= len(estimators):
+        return model
+    limited = copy.copy(model)
+    limited.estimators_ = estimators[:max_trees]
+    limited.n_estimators = max_trees
+    return limited
+
+class Explainer:
+    """
+    Reusable SHAP explainer for the failure class of a tree model.
+
+    The underlying ``shap.TreeExplainer`` is built once; explanations are
+    memoized per input row (keyed by model version), so repeated rows such
+    as unchanged dashboard sliders are not recomputed.
+    """
+
+    def __init__(self, model, feature_names: list, mode: str = "exact", background=None,
+                 max_trees: int = None, version: str = None, cache_size: int = 1024):
+        import shap
+
+        if mode not in EXPLAIN_MODES:
+            raise ValueError(f"Unknown explain mode '{mode}', expected one of {EXPLAIN_MODES}")
+        if mode == "interventional" and background is None:
+            raise ValueError("Interventional explanations need a background sample")
+
+        self.feature_names = list(feature_names)
+        self.mode = mode
+        self.version = version
+        self.model = limit_trees(model, max_trees)
+        # Ormanlar kopyalanarak kısaltılır; boosting modellerinde tree_limit kullanılır
+        self.tree_limit = max_trees if self.model is model and max_trees else None
+
+        if mode == "interventional":
+            self.explainer = shap.TreeExplainer(self.model, data=background, feature_perturbation="interventional")
+        else:
+            self.explainer = shap.TreeExplainer(self.model, feature_perturbation="tree_path_dependent")
+        self.base_value = self._positive_class(np.asarray(self.explainer.expected_value).reshape(-1))
+        self.cache = PredictionCache(self.feature_names, max_size=cache_size, ttl_seconds=float("inf"))
+
+    @staticmethod
+    def _positive_class(values):
+        # Sınıflandırıcılarda son eksen sınıflardır; arıza (1) sınıfını al
+        return values[..., -1] if values.shape[-1] == 2 else values[..., 0]
+
+    def shap_values(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Computes SHAP values of the failure class for every row, shape (n_rows, n_features).
+        """
+        X = X[self.feature_names]
+        values = self.explainer.shap_values(
+            X,
+            tree_limit=self.tree_limit,
+            approximate=self.mode == "approximate",
+            check_additivity=False
+        )
+        values = np.asarray(values)
+        if values.ndim == 3:
+            return values[:, :, -1]
+        return values
+
+    def explain(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Like ``shap_values`` but reuses memoized rows; only unseen rows are explained.
+        """
+        rows = X[self.feature_names].to_dict(orient="records")
+        results = [self.cache.get(self.version, row) for row in rows]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            values = self.shap_values(X.iloc[missing])
+            for i, row_values in zip(missing, values):
+                results[i] = row_values
+                self.cache.put(self.version, rows[i], row_values)
+        return np.vstack(results)
+
+GLOBAL_ARTIFACT = "global_explanations.json"
+
+def stratified_sample(y, sample_size: int, random_state: int = 42) -> np.ndarray:
+    """
+    Returns row indices of a class-stratified sample (all rows if the data is smaller).
+    """
+    y = np.asarray(y)
+    if sample_size >= len(y):
+        return np.arange(len(y))
+    rng = np.random.default_rng(random_state)
+    indices = []
+    for label in np.unique(y):
+        label_idx = np.flatnonzero(y == label)
+        # Her sınıftan en az bir satır (nadir arıza sınıfı kaybolmasın)
+        n = max(1, int(round(sample_size * len(label_idx) / len(y))))
+        indices.append(rng.choice(label_idx, size=min(n, len(label_idx)), replace=False))
+    return np.sort(np.concatenate(indices))
+
+def sample_background(lf, feature_names: list, target: str, sample_size: int,
+                      random_state: int = 42) -> pd.DataFrame:
+    """
+    Stratified background sample from a Polars LazyFrame without collecting
+    it: only the target column is read to pick the rows, then only those
+    rows of the feature columns are fetched.
+    """
+    import polars as pl
+
+    rows = stratified_sample(lf.select(target).collect()[target].to_numpy(), sample_size, random_state)
+    return (lf.select(feature_names)
+            .with_row_index("_row")
+            .filter(pl.col("_row").is_in(rows.tolist()))
+            .drop("_row")
+            .collect()
+            .to_pandas())
+
+def _explain_chunk(model, feature_names, X_chunk, mode, max_trees):
+    # Her worker kendi explainer'ını kurar (TreeExplainer süreçler arasında taşınmaz)
+    return Explainer(model, feature_names, mode=mode, max_trees=max_trees).shap_values(X_chunk)
+
+def compute_global_explanations(model, X: pd.DataFrame, y, feature_names: list, sample_size: int = 2000,
+                                chunk_size: int = 250, n_jobs: int = -1, dependence_features: list = None,
+                                grid_bins: int = 20, mode: str = "exact", max_trees: int = None,
+                                random_state: int = 42) -> dict:
+    """
+    Computes SHAP values on a stratified sample in parallel chunks and reduces
+    them to JSON-serializable summaries: mean |SHAP| per feature, binned
+    dependence curves and the baseline.
+    """
+    from joblib import Parallel, delayed
+
+    idx = stratified_sample(y, sample_size, random_state)
+    X_sample = X.iloc[idx][feature_names]
+    chunks = [X_sample.iloc[start:start + chunk_size] for start in range(0, len(X_sample), chunk_size)]
+    values = np.vstack(Parallel(n_jobs=n_jobs)(
+        delayed(_explain_chunk)(model, feature_names, chunk, mode, max_trees) for chunk in chunks
+    ))
+
+    mean_abs = np.abs(values).mean(axis=0)
+    importance = dict(sorted(zip(feature_names, mean_abs.tolist()), key=lambda item: -item[1]))
+
+    dependence = {}
+    for feature in dependence_features or []:
+        j = feature_names.index(feature)
+        column = X_sample[feature].to_numpy(dtype=float)
+        # Kuantil sınırları: yoğun bölgelerde daha ince ızgara
+        edges = np.unique(np.quantile(column, np.linspace(0, 1, grid_bins + 1)))
+        bins = np.clip(np.searchsorted(edges, column, side="right") - 1, 0, len(edges) - 2)
+        counts = np.bincount(bins, minlength=len(edges) - 1)
+        sums = np.bincount(bins, weights=values[:, j], minlength=len(edges) - 1)
+        keep = counts > 0
+        dependence[feature] = {
+            "bin_edges": edges.tolist(),
+            "bin_centers": ((edges[:-1] + edges[1:]) / 2)[keep].tolist(),
+            "mean_shap": (sums[keep] / counts[keep]).tolist(),
+            "count": counts[keep].tolist(),
+        }
+
+    base_value = Explainer(model, feature_names, mode=mode, max_trees=max_trees).base_value
+    return {
+        "mode": mode,
+        "sample_size": int(len(idx)),
+        "baseline": {
+            "base_value": float(base_value),
+            "mean_prediction": float(base_value + values.sum(axis=1).mean()),
+            "sample_failure_rate": float(np.asarray(y)[idx].mean()),
+        },
+        "mean_abs_shap": importance,
+        "dependence": dependence,
+    }
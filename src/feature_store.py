@@ -0,0 +1,152 @@
+import json
+import os
+import uuid
+from datetime import date, datetime
+import polars as pl
+from src.features import add_rolling_features, create_features
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+STATE_FILE = "_state.json"
+
+class FeatureStore:
+    """
+    Incremental, append-only store of engineered features in Parquet.
+
+    Each update only processes raw rows whose watermark column (``id`` by
+    default, or a timestamp) is greater than the stored high-water mark and
+    writes them as one new file under an ``ingest_date=YYYY-MM-DD`` partition.
+    The state file is replaced atomically after the data file is in place.
+    Part files are numbered by batch, so a part whose number is above the
+    committed batch count is a leftover of an interrupted update; it is
+    removed before the update is redone, and rows are never stored twice.
+
+    With an enabled ``rolling`` config (``features.rolling``), rolling
+    features are added as well. The last ``window - 1`` stored readings of
+    each machine are prepended to the new rows, so windows continue across
+    updates exactly as if all rows were processed at once.
+    """
+
+    def __init__(self, root: str, watermark_column: str = "id", rolling: dict = None):
+        self.root = root
+        self.watermark_column = watermark_column
+        self.rolling = rolling if rolling and rolling.get("enabled", False) else None
+
+    @property
+    def state_path(self) -> str:
+        return os.path.join(self.root, STATE_FILE)
+
+    def _read_state(self) -> dict:
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, "r") as f:
+            return json.load(f)
+
+    def _write_state(self, state: dict):
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def high_water_mark(self):
+        """
+        Returns the largest watermark value already stored, or None if empty.
+        """
+        return self._read_state().get("high_water_mark")
+
+    def _parse_watermark(self, value, dtype):
+        # Zaman damgası watermark'ları state dosyasında isoformat metin olarak tutulur
+        if isinstance(value, str) and dtype == pl.Date:
+            return pl.lit(date.fromisoformat(value), dtype=dtype)
+        if isinstance(value, str) and isinstance(dtype, pl.Datetime):
+            return pl.lit(datetime.fromisoformat(value), dtype=dtype)
+        return pl.lit(value, dtype=dtype)
+
+    def _discard_uncommitted(self, batches: int):
+        for path in self.files():
+            if int(os.path.basename(path)[len("part-"):-len(".parquet")]) > batches:
+                logger.warning(f"Removing uncommitted part from an interrupted update: {path}")
+                os.remove(path)
+
+    def files(self) -> list:
+        paths = []
+        for dirpath, _, filenames in os.walk(self.root):
+            paths.extend(os.path.join(dirpath, name) for name in filenames
+                         if name.startswith("part-") and name.endswith(".parquet"))
+        return sorted(paths)
+
+    def update(self, raw: pl.LazyFrame) -> int:
+        """
+        Computes features for raw rows newer than the high-water mark and
+        appends them to the store. Returns the number of new rows.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        state = self._read_state()
+        hwm = state.get("high_water_mark")
+        self._discard_uncommitted(state.get("batches", 0))
+
+        if hwm is None:
+            new_rows = raw
+        else:
+            dtype = raw.collect_schema()[self.watermark_column]
+            new_rows = raw.filter(pl.col(self.watermark_column) > self._parse_watermark(hwm, dtype))
+        new_rows = new_rows.sort(self.watermark_column)
+
+        tmp_path = os.path.join(self.root, f".tmp-{uuid.uuid4().hex}.parquet")
+        self._features(raw, new_rows, hwm).sink_parquet(tmp_path)
+
+        summary = pl.scan_parquet(tmp_path).select(
+            pl.len().alias("rows"),
+            pl.col(self.watermark_column).max().alias("max")
+        ).collect().row(0, named=True)
+
+        if summary["rows"] == 0:
+            os.remove(tmp_path)
+            logger.info(f"Feature store is up to date (high-water mark: {hwm}).")
+            return 0
+
+        partition = os.path.join(self.root, f"ingest_date={date.today().isoformat()}")
+        os.makedirs(partition, exist_ok=True)
+        batch = state.get("batches", 0) + 1
+        os.replace(tmp_path, os.path.join(partition, f"part-{batch:08d}.parquet"))
+
+        new_hwm = summary["max"]
+        if hasattr(new_hwm, "isoformat"):
+            new_hwm = new_hwm.isoformat()
+        self._write_state({
+            "watermark_column": self.watermark_column,
+            "high_water_mark": new_hwm,
+            "batches": batch,
+            "rows": state.get("rows", 0) + summary["rows"],
+        })
+        logger.info(f"Feature store updated: {summary['rows']} new rows (high-water mark: {new_hwm}).")
+        return summary["rows"]
+
+    def _features(self, raw: pl.LazyFrame, new_rows: pl.LazyFrame, hwm) -> pl.LazyFrame:
+        if self.rolling is None:
+            return create_features(new_rows)
+        if hwm is None or not self.files():
+            return add_rolling_features(create_features(new_rows), self.rolling).sort(self.watermark_column)
+
+        # Pencereler güncellemeler arasında kesilmesin: makine başına son window-1 kayıt bağlam olarak eklenir
+        window = self.rolling.get("window", 10)
+        group_col = self.rolling.get("group_col", "Product ID")
+        order_col = self.rolling.get("order_col", "id")
+        raw_columns = raw.collect_schema().names()
+        context = (self.scan().select(raw_columns).sort(order_col)
+                   .group_by(group_col, maintain_order=True).tail(window - 1).select(raw_columns))
+        combined = pl.concat([context, new_rows.select(raw_columns)], how="vertical_relaxed")
+        dtype = raw.collect_schema()[self.watermark_column]
+        return (add_rolling_features(create_features(combined), self.rolling)
+                .filter(pl.col(self.watermark_column) > self._parse_watermark(hwm, dtype))
+                .sort(self.watermark_column))
+
+    def scan(self) -> pl.LazyFrame:
+        """
+        Returns all stored features as a LazyFrame, in watermark order.
+        """
+        files = self.files()
+        if not files:
+            raise FileNotFoundError(f"Feature store at {self.root} is empty")
+        return pl.scan_parquet(files)
@@ -1,12 +1,16 @@
+import numpy as np
 import polars as pl
+from datetime import datetime
 from src.utils import get_logger
 import os
 
 logger = get_logger(__name__)
 
-def create_features(df: pl.DataFrame) -> pl.DataFrame:
+def create_features(df: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
     """
     Applies feature engineering to the raw dataframe.
+    Accepts a DataFrame or a LazyFrame and returns the same type, so the
+    features can be part of a larger lazy query.
     """
     logger.info("Starting feature engineering...")
     
@@ -32,10 +36,309 @@ def create_features(df: pl.DataFrame) -> pl.DataFrame:
     logger.info("Feature engineering completed.")
     return df
 
-def save_processed_data(df: pl.DataFrame, path: str):
+def save_processed_data(df: pl.DataFrame | pl.LazyFrame, path: str):
     """
-    Saves the processed dataframe to a CSV file.
+    Saves the processed dataframe to a Parquet (.parquet) or CSV file.
+    LazyFrames are streamed with sink_* and never collected in memory.
     """
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    df.write_csv(path)
+    tmp_path = path + ".tmp"
+    is_parquet = path.endswith(".parquet")
+
+    if isinstance(df, pl.LazyFrame):
+        if is_parquet:
+            df.sink_parquet(tmp_path)
+        else:
+            df.sink_csv(tmp_path)
+    elif is_parquet:
+        df.write_parquet(tmp_path)
+    else:
+        df.write_csv(tmp_path)
+
+    os.replace(tmp_path, path)
     logger.info(f"Processed data saved to {path}")
+
+# Columns whose per-machine trends are tracked by the rolling features
+ROLLING_COLUMNS = ["torque", "temp_diff", "tool_wear"]
+
+def create_rolling_features(df: pl.DataFrame | pl.LazyFrame, window: int = 10,
+                            group_col: str = "Product ID", order_col: str = "id",
+                            columns: list = None, window_seconds: float = None,
+                            time_col: str = "timestamp") -> pl.DataFrame | pl.LazyFrame:
+    """
+    Adds per-machine rolling mean, std and least-squares slope over the last
+    `window` readings of each column ({col}_roll_mean/_roll_std/_roll_slope).
+
+    Rows are ordered by `order_col` and windows never cross machines. The
+    first reading of a machine has null std and slope. With `window_seconds`
+    the window is the last `window` readings *or* the readings of the last
+    `window_seconds` seconds by the datetime `time_col`, whichever is fewer
+    (timestamps must increase within a machine). OnlineRollingFeatures
+    produces the same values one reading at a time.
+    """
+    columns = columns or ROLLING_COLUMNS
+    if window_seconds:
+        return _time_rolling_features(df, window, window_seconds, group_col, order_col, columns, time_col)
+    logger.info(f"Computing rolling features (window={window}) per {group_col}...")
+
+    # Position of the reading within its machine (0, 1, 2, ...) and current window size
+    k = pl.int_range(pl.len()).over(group_col)
+    n = (k + 1).clip(upper_bound=window).cast(pl.Float64)
+
+    exprs = []
+    for col in columns:
+        y = pl.col(col).cast(pl.Float64)
+        sum_y = y.rolling_sum(window, min_samples=1).over(group_col)
+        sum_ky = (y * pl.int_range(pl.len())).rolling_sum(window, min_samples=1).over(group_col)
+        # Σ(k - k̄)(y - ȳ) = Σky - Σk·Σy/n; window positions are consecutive
+        sum_k = n * k - n * (n - 1) / 2
+        slope = (sum_ky - sum_k * sum_y / n) / (n * (n * n - 1) / 12)
+
+        exprs.extend([
+            y.rolling_mean(window, min_samples=1).over(group_col).alias(f"{col}_roll_mean"),
+            y.rolling_std(window, min_samples=1).over(group_col).alias(f"{col}_roll_std"),
+            pl.when(n > 1).then(slope).otherwise(None).alias(f"{col}_roll_slope"),
+        ])
+
+    return df.sort(order_col).with_columns(exprs)
+
+def _time_rolling_features(df, window: int, window_seconds: float, group_col: str,
+                           order_col: str, columns: list, time_col: str):
+    logger.info(f"Computing rolling features (window={window} readings / {window_seconds}s) per {group_col}...")
+
+    # Zaman penceresi (t - T, t] içindeki okumaların son `window` tanesi
+    aggs = []
+    for col in columns:
+        y = pl.col(col).cast(pl.Float64).tail(window)
+        k = pl.int_range(y.len()).cast(pl.Float64)
+        slope = ((k - k.mean()) * (y - y.mean())).sum() / ((k - k.mean()) ** 2).sum()
+        aggs.extend([
+            y.mean().alias(f"{col}_roll_mean"),
+            y.std().alias(f"{col}_roll_std"),
+            pl.when(y.len() > 1).then(slope).otherwise(None).alias(f"{col}_roll_slope"),
+        ])
+
+    # rolling() makine + zaman sırasıyla girdi satırı başına bir satır döner; sıralı girdiyle yan yana eklenir
+    ordered = df.sort(group_col, time_col)
+    windows = ordered.rolling(index_column=time_col, period=f"{round(window_seconds * 1_000_000)}us",
+                              group_by=group_col).agg(aggs)
+    return pl.concat([ordered, windows.drop(group_col, time_col)], how="horizontal").sort(order_col)
+
+def add_rolling_features(df: pl.DataFrame | pl.LazyFrame, rolling_config: dict) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Applies create_rolling_features with the ``features.rolling`` settings
+    from params.yaml when ``enabled`` is set; returns df unchanged otherwise.
+    """
+    if not rolling_config or not rolling_config.get("enabled", False):
+        return df
+    return create_rolling_features(
+        df,
+        window=rolling_config.get("window", 10),
+        group_col=rolling_config.get("group_col", "Product ID"),
+        order_col=rolling_config.get("order_col", "id"),
+        columns=rolling_config.get("columns"),
+        window_seconds=rolling_config.get("window_seconds"),
+        time_col=rolling_config.get("time_col", "timestamp"),
+    )
+
+def _seconds(value) -> float:
+    # datetime / pd.Timestamp / np.datetime64 / sayı -> saniye
+    if isinstance(value, np.datetime64):
+        return value.astype("datetime64[us]").astype(np.int64) / 1e6
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+class OnlineRollingFeatures:
+    """
+    Streaming counterpart of create_rolling_features for the live path.
+
+    Keeps a fixed-size ring buffer and running sums (Σy, Σy², Σi·y) per
+    machine, so each update costs O(1) amortised and memory per machine is
+    constant. With ``window_seconds`` readings older than that (by
+    ``time_col`` of the newest reading) are evicted as well. Sums are
+    recomputed from the buffer every ``window`` updates to keep floating
+    point drift bounded.
+    """
+
+    def __init__(self, window: int = 10, columns: list = None, window_seconds: float = None,
+                 time_col: str = "timestamp"):
+        self.window = window
+        self.columns = list(columns or ROLLING_COLUMNS)
+        self.window_seconds = window_seconds
+        self.time_col = time_col
+        self._states = {}
+
+    def __len__(self):
+        return len(self._states)
+
+    def _new_state(self) -> dict:
+        n_cols = len(self.columns)
+        return {
+            "buffer": np.zeros((n_cols, self.window)),
+            "times": np.zeros(self.window),
+            "count": 0,
+            "head": 0,
+            "updates": 0,
+            "sum_y": np.zeros(n_cols),
+            "sum_yy": np.zeros(n_cols),
+            "sum_iy": np.zeros(n_cols),
+        }
+
+    def update(self, machine_id, reading: dict) -> dict:
+        """
+        Adds one reading (must contain the tracked columns, and ``time_col``
+        when ``window_seconds`` is set) for a machine and returns its current
+        rolling features.
+        """
+        state = self._states.get(machine_id)
+        if state is None:
+            state = self._states[machine_id] = self._new_state()
+
+        y = np.array([reading[col] for col in self.columns], dtype=np.float64)
+        w = self.window
+
+        if self.window_seconds:
+            now = _seconds(reading[self.time_col])
+            # Zaman penceresinin dışına düşen en eski okumalar atılır
+            while state["count"] and state["times"][state["head"]] <= now - self.window_seconds:
+                self._evict(state)
+        if state["count"] == w:
+            self._evict(state)
+
+        n = state["count"]
+        tail = (state["head"] + n) % w
+        state["buffer"][:, tail] = y
+        if self.window_seconds:
+            state["times"][tail] = now
+        state["sum_iy"] += n * y
+        state["sum_y"] += y
+        state["sum_yy"] += y * y
+        state["count"] = n + 1
+        state["updates"] += 1
+        if state["updates"] % w == 0:
+            self._recompute(state)
+
+        return self._features(state)
+
+    def _evict(self, state: dict):
+        # En eski okuma düşer, kalanların konumu bir azalır
+        y_old = state["buffer"][:, state["head"]]
+        state["sum_y"] -= y_old
+        state["sum_yy"] -= y_old * y_old
+        state["sum_iy"] -= state["sum_y"]
+        state["head"] = (state["head"] + 1) % self.window
+        state["count"] -= 1
+
+    def _recompute(self, state: dict):
+        ordered = np.roll(state["buffer"], -state["head"], axis=1)[:, :state["count"]]
+        state["sum_y"] = ordered.sum(axis=1)
+        state["sum_yy"] = (ordered * ordered).sum(axis=1)
+        state["sum_iy"] = ordered @ np.arange(state["count"], dtype=np.float64)
+
+    def _features(self, state: dict) -> dict:
+        n = state["count"]
+        mean = state["sum_y"] / n
+        features = {}
+        for j, col in enumerate(self.columns):
+            features[f"{col}_roll_mean"] = float(mean[j])
+            if n > 1:
+                var = (state["sum_yy"][j] - state["sum_y"][j] * mean[j]) / (n - 1)
+                slope = (state["sum_iy"][j] - (n - 1) / 2 * state["sum_y"][j]) / (n * (n * n - 1) / 12)
+                features[f"{col}_roll_std"] = float(np.sqrt(max(var, 0.0)))
+                features[f"{col}_roll_slope"] = float(slope)
+            else:
+                features[f"{col}_roll_std"] = None
+                features[f"{col}_roll_slope"] = None
+        return features
+
+# Serving-side counterparts of the create_features expressions (same float64
+# arithmetic); tests/test_features.py checks them against create_features.
+RAW_INPUTS = ["air_temp", "process_temp", "rpm", "torque", "tool_wear"]
+FEATURE_FORMULAS = {
+    "air_temp": lambda c: c["air_temp"],
+    "process_temp": lambda c: c["process_temp"],
+    "rpm": lambda c: c["rpm"],
+    "torque": lambda c: c["torque"],
+    "tool_wear": lambda c: c["tool_wear"],
+    "air_temp_c": lambda c: c["air_temp"] - 273.15,
+    "process_temp_c": lambda c: c["process_temp"] - 273.15,
+    "power_factor": lambda c: c["torque"] * c["rpm"],
+    "temp_diff": lambda c: c["process_temp"] - c["air_temp"],
+}
+
+def casts_to_float32(model) -> bool:
+    """
+    True for models that convert their input to float32 before predicting, so
+    a float32 feature matrix gives exactly the same output.
+    """
+    from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+    from sklearn.tree import BaseDecisionTree
+    from src.inference import CompiledForest
+    return isinstance(model, (RandomForestClassifier, ExtraTreesClassifier, BaseDecisionTree, CompiledForest))
+
+class FeatureVectorizer:
+    """
+    Computes the model features from raw readings straight into a contiguous
+    NumPy matrix, skipping the dict -> Polars -> pandas round trip.
+
+    The column order is fixed when the vectorizer is built (from the model's
+    ``feature_names_in_`` when available), so the matrix can be passed to
+    the model as a plain array. Values are computed in float64 exactly like
+    create_features. ``for_model`` stores them as float32 only for models
+    that cast their input to float32 themselves (sklearn random forests,
+    extra trees and single trees, CompiledForest), so the predictions equal
+    those on the training-time features. Other models, e.g.
+    HistGradientBoosting, which bins in float64, get float64.
+    """
+
+    def __init__(self, feature_names: list, dtype=np.float64):
+        unknown = [name for name in feature_names if name not in FEATURE_FORMULAS]
+        if unknown:
+            raise ValueError(f"No serving formula for features: {unknown}")
+        self.feature_names = list(feature_names)
+        self.dtype = np.dtype(dtype)
+        self._formulas = [FEATURE_FORMULAS[name] for name in self.feature_names]
+
+    @classmethod
+    def for_model(cls, model, feature_names: list = None, dtype=None):
+        """
+        Uses the feature order the model was fitted with, falling back to
+        ``feature_names`` (params.yaml) for models fitted without names.
+        Without an explicit ``dtype`` the model's own input precision is used.
+        """
+        if dtype is None:
+            dtype = np.float32 if casts_to_float32(model) else np.float64
+        fitted = getattr(model, "feature_names_in_", None)
+        names = list(fitted) if fitted is not None else list(feature_names or [])
+        if feature_names is not None and set(names) != set(feature_names):
+            logger.warning(f"Model features {names} differ from the configured {list(feature_names)}")
+        return cls(names, dtype)
+
+    def __len__(self):
+        return len(self.feature_names)
+
+    def allocate(self, n_rows: int) -> np.ndarray:
+        return np.empty((n_rows, len(self.feature_names)), dtype=self.dtype)
+
+    def transform(self, columns: dict, out: np.ndarray = None) -> np.ndarray:
+        """
+        Column dict of raw readings (equal-length sequences) -> (n_rows, n_features)
+        matrix. ``out`` may be a preallocated buffer with at least n_rows rows.
+        """
+        raw = {name: np.asarray(columns[name], dtype=np.float64) for name in RAW_INPUTS}
+        n_rows = len(raw[RAW_INPUTS[0]])
+        out = self.allocate(n_rows) if out is None else out[:n_rows]
+        for j, formula in enumerate(self._formulas):
+            out[:, j] = formula(raw)
+        return out
+
+    def transform_row(self, row: dict, out: np.ndarray = None) -> np.ndarray:
+        """
+        Single reading -> (1, n_features) matrix, computed with Python floats
+        (no per-column array allocations).
+        """
+        raw = {name: float(row[name]) for name in RAW_INPUTS}
+        out = self.allocate(1) if out is None else out[:1]
+        out[0] = [formula(raw) for formula in self._formulas]
+        return out
@@ -0,0 +1,227 @@
+import copy
+import json
+import os
+import shutil
+import joblib
+import numpy as np
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+ENGINES = ("sklearn", "compiled")
+
+class CompiledForest:
+    """
+    Flat NumPy representation of a fitted sklearn tree ensemble.
+
+    All trees are concatenated into shared node arrays (feature, threshold,
+    left/right children, normalised leaf values). Leaves point to themselves,
+    so every row can be pushed through every tree for ``max_depth`` steps with
+    plain vectorised gathers and no per-tree Python loop during traversal.
+    Probabilities are accumulated tree by tree exactly like sklearn does, so
+    the output matches ``predict_proba`` bit for bit.
+    """
+
+    # Compact artifact contents (one .npy file per array)
+    ARRAYS = ("feature", "threshold", "children", "value", "roots", "classes")
+
+    def __init__(self, feature, threshold, children, value, roots, classes,
+                 max_depth, feature_names=None, chunk_size=256):
+        self.feature = feature
+        self.threshold = threshold
+        # [sağ, sol] çiftleri yan yana: çocuk = children[2 * node + go_left]
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.max_depth = int(max_depth)
+        self.feature_names_in_ = feature_names
+        self.n_features_in_ = int(np.max(feature)) + 1 if feature_names is None else len(feature_names)
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def from_sklearn(cls, model, chunk_size=256):
+        """
+        Exports a fitted RandomForest/ExtraTrees classifier into flat arrays.
+        """
+        estimators = getattr(model, "estimators_", None)
+        if not estimators or not all(hasattr(est, "tree_") for est in estimators):
+            raise TypeError(f"{type(model).__name__} is not a supported tree ensemble")
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        n_classes = len(model.classes_)
+        for est in estimators:
+            tree = est.tree_
+            node_ids = np.arange(tree.node_count, dtype=np.int64) + offset
+            is_leaf = tree.children_left == -1
+
+            # Yapraklar kendilerine işaret eder: derinlik boyunca sabit kalırlar
+            left = np.where(is_leaf, node_ids, tree.children_left + offset)
+            right = np.where(is_leaf, node_ids, tree.children_right + offset)
+            feature = np.where(is_leaf, 0, tree.feature)
+            threshold = np.where(is_leaf, np.inf, tree.threshold)
+
+            # DecisionTreeClassifier.predict_proba ile aynı normalizasyon
+            value = tree.value[:, 0, :n_classes].astype(np.float64)
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            value = value / normalizer
+
+            features.append(feature)
+            thresholds.append(threshold)
+            lefts.append(left)
+            rights.append(right)
+            values.append(value)
+            roots.append(offset)
+            offset += tree.node_count
+
+        feature_names = getattr(model, "feature_names_in_", None)
+        children = np.stack([np.concatenate(rights), np.concatenate(lefts)], axis=1).ravel()
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            children=children.astype(np.intp),
+            value=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.asarray(roots, dtype=np.intp),
+            classes=np.asarray(model.classes_),
+            max_depth=max(est.tree_.max_depth for est in estimators),
+            feature_names=list(feature_names) if feature_names is not None else None,
+            chunk_size=chunk_size,
+        )
+
+    def save(self, path: str):
+        """
+        Writes the compact artifact: a directory of uncompressed .npy arrays
+        plus meta.json. Written to a temporary directory and swapped in.
+        """
+        tmp_path = path.rstrip("/") + ".tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        arrays = {
+            "feature": self.feature, "threshold": self.threshold, "children": self.children,
+            "value": self.value, "roots": self.roots, "classes": self.classes_,
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_path, f"{name}.npy"), np.ascontiguousarray(array))
+        with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+            json.dump({
+                "max_depth": self.max_depth,
+                "feature_names": self.feature_names_in_,
+                "n_trees": int(len(self.roots)),
+                "n_nodes": int(len(self.feature)),
+            }, f, indent=2)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+        logger.info(f"Compact model saved to {path}")
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, chunk_size: int = 256):
+        """
+        Loads a compact artifact. With mmap=True the arrays are memory-mapped
+        read-only, so worker processes share the same physical pages.
+        """
+        with open(os.path.join(path, "meta.json"), "r") as f:
+            meta = json.load(f)
+        mmap_mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode) for name in cls.ARRAYS}
+        return cls(
+            max_depth=meta["max_depth"],
+            feature_names=meta["feature_names"],
+            chunk_size=chunk_size,
+            **arrays,
+        )
+
+    def _as_array(self, X) -> np.ndarray:
+        if hasattr(X, "columns") and self.feature_names_in_ is not None:
+            if list(X.columns) != self.feature_names_in_:
+                raise ValueError(f"Feature names/order mismatch: expected {self.feature_names_in_}")
+        # sklearn ağaçları float32 üzerinde karşılaştırır; aynısını yapıyoruz
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected 2D input with {self.n_features_in_} features, got shape {X.shape}")
+        return X
+
+    def apply(self, X) -> np.ndarray:
+        """
+        Returns the global leaf index reached in every tree, shape (n_rows, n_trees).
+        """
+        X = self._as_array(X)
+        return self._apply(X)
+
+    def _apply(self, X: np.ndarray) -> np.ndarray:
+        n_rows, n_features = X.shape
+        X_flat = np.ascontiguousarray(X).ravel()
+        row_offsets = (np.arange(n_rows) * n_features)[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (n_rows, self.roots.shape[0])).copy()
+        for _ in range(self.max_depth):
+            x = np.take(X_flat, row_offsets + np.take(self.feature, nodes))
+            go_left = x <= np.take(self.threshold, nodes)
+            nodes = np.take(self.children, 2 * nodes + go_left)
+        return nodes
+
+    def predict_proba(self, X) -> np.ndarray:
+        X = self._as_array(X)
+        proba = np.zeros((X.shape[0], self.value.shape[1]), dtype=np.float64)
+
+        # Bellek sınırlı kalsın diye satırları parça parça işle
+        for start in range(0, X.shape[0], self.chunk_size):
+            leaves = self._apply(X[start:start + self.chunk_size])
+            out = proba[start:start + self.chunk_size]
+            # sklearn ağaç çıktısını sırayla topluyor; toplama sırası aynı kalmalı
+            for t in range(leaves.shape[1]):
+                out += self.value[leaves[:, t]]
+
+        proba /= len(self.roots)
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+def load_predictor(model_config: dict):
+    """
+    Loads the predictor described by the "model" section of params.yaml.
+    With engine "compiled" the compact artifact is memory-mapped when present
+    (the pickle is not touched); otherwise the pickle is loaded and compiled.
+    """
+    engine = model_config.get("engine", "sklearn")
+    compact_path = model_config.get("compact_path")
+    if engine == "compiled" and compact_path and os.path.exists(os.path.join(compact_path, "meta.json")):
+        logger.info(f"Loading compact model from {compact_path}")
+        return CompiledForest.load(compact_path, mmap=True)
+
+    model_path = model_config["path"]
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(f"Model dosyası bulunamadı: {model_path}")
+    return build_predictor(joblib.load(model_path), engine)
+
+def array_predictor(predictor):
+    """
+    Returns a predictor that takes plain arrays in FeatureVectorizer order.
+    sklearn models fitted on DataFrames warn on every array input, so a
+    shallow copy without ``feature_names_in_`` is returned for them (the
+    fitted trees are shared, not copied). CompiledForest accepts arrays as is.
+    """
+    if isinstance(predictor, CompiledForest) or not hasattr(predictor, "feature_names_in_"):
+        return predictor
+    stripped = copy.copy(predictor)
+    del stripped.feature_names_in_
+    return stripped
+
+def build_predictor(model, engine: str = "sklearn"):
+    """
+    Returns the object used for inference: the sklearn model itself or its
+    compiled counterpart. Falls back to sklearn for unsupported model types.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown inference engine '{engine}', expected one of {ENGINES}")
+    if engine == "sklearn":
+        return model
+
+    try:
+        predictor = CompiledForest.from_sklearn(model)
+    except TypeError as e:
+        logger.warning(f"Compiled engine unavailable ({e}), falling back to sklearn.")
+        return model
+    logger.info(f"Compiled inference engine ready: {len(predictor.roots)} trees, {predictor.feature.shape[0]} nodes.")
+    return predictor
@@ -0,0 +1,185 @@
+import threading
+import time
+from collections import deque
+from src.database import make_record
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+class RingBuffer:
+    """
+    Bounded, thread-safe buffer of the most recent items with sequence numbers.
+
+    Readers keep the last sequence number they saw and call ``since`` to get
+    only the items added after it, so each poll costs O(new items) no matter
+    how many readers there are or how long the stream has been running.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._items = deque(maxlen=capacity)
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def extend(self, items: list):
+        with self._lock:
+            for item in items:
+                self._seq += 1
+                self._items.append(item)
+
+    def since(self, seq: int) -> tuple:
+        """
+        Returns (items added after ``seq``, latest sequence number). Items that
+        already fell out of the buffer are skipped.
+        """
+        with self._lock:
+            n_new = min(self._seq - seq, len(self._items))
+            # deque uçlara yakın indekslemede O(1): sadece yeni öğeler kopyalanır
+            items = [self._items[i] for i in range(-n_new, 0)] if n_new > 0 else []
+            return items, self._seq
+
+    def latest(self):
+        with self._lock:
+            return self._items[-1] if self._items else None
+
+class LiveProducer:
+    """
+    Background thread that pulls readings from ``source`` every ``interval_s``
+    seconds, enriches them once (model prediction, online rolling features),
+    queues them to the prediction log and publishes them to a shared
+    RingBuffer. Any number of dashboard sessions read from the same buffer,
+    so the work per tick does not grow with the number of viewers.
+
+    ``source`` returns a reading dict or a list of them; ``predict_fn`` takes
+    a list of readings and returns one dict per reading (at least
+    ``prediction`` and ``probability``).
+
+    With ``idle_timeout_s``, the thread pauses once no reader has called
+    ``read``/``latest`` for that long (nothing is predicted or written while
+    nobody is watching) and restarts on the next read.
+    """
+
+    def __init__(self, source, predict_fn=None, interval_s: float = 2.0, capacity: int = 1000,
+                 writer=None, rolling=None, idle_timeout_s: float = None):
+        self.source = source
+        self.predict_fn = predict_fn
+        self.interval = interval_s
+        self.buffer = RingBuffer(capacity)
+        self.writer = writer
+        self.rolling = rolling
+        self.idle_timeout = idle_timeout_s
+
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+        self._last_read = time.monotonic()
+        self.pauses = 0
+        self._thread = None
+        self.ticks = 0
+        self.readings_total = 0
+        self.errors = 0
+
+    def set_predict_fn(self, predict_fn):
+        # Model sürümü değişince yeni tahmin fonksiyonu bir sonraki tick'te kullanılır
+        self.predict_fn = predict_fn
+
+    def tick(self) -> list:
+        """
+        Produces, enriches and publishes one batch of readings.
+        """
+        readings = self.source()
+        if isinstance(readings, dict):
+            readings = [readings]
+        items = [dict(reading) for reading in readings]
+
+        predict_fn = self.predict_fn
+        if predict_fn is not None and items:
+            for item, result in zip(items, predict_fn(items)):
+                item.update(result)
+                if self.writer is not None:
+                    self.writer.write(make_record(item, item["prediction"], item["probability"]))
+
+        # Kayan pencere özellikleri (türetilmiş sütunlar tahmin adımında eklenir)
+        if self.rolling is not None:
+            for item in items:
+                if all(col in item for col in self.rolling.columns):
+                    item.update(self.rolling.update(item.get("machine_id", "live"), item))
+
+        self.buffer.extend(items)
+        self.ticks += 1
+        self.readings_total += len(items)
+        return items
+
+    def read(self, seq: int) -> tuple:
+        """
+        ``buffer.since`` for readers; marks the stream as watched and restarts
+        a paused producer.
+        """
+        self._touch()
+        return self.buffer.since(seq)
+
+    def latest(self):
+        self._touch()
+        return self.buffer.latest()
+
+    def _touch(self):
+        self._last_read = time.monotonic()
+        if not self.running and not self._stop.is_set():
+            self.start()
+
+    def _idle(self) -> bool:
+        return self.idle_timeout is not None and time.monotonic() - self._last_read > self.idle_timeout
+
+    def _run(self):
+        while not self._stop.is_set():
+            # İzleyen yok: tahmin/kayıt üretmeyi bırak, sonraki okumada yeniden başlar.
+            # Karar kilit altında verilir; eşzamanlı bir okuma ya bekletir ya yeniden başlatır.
+            with self._start_lock:
+                if self._idle():
+                    self._thread = None
+                    self.pauses += 1
+                    logger.info("Live producer paused (no readers).")
+                    return
+            try:
+                self.tick()
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Live producer tick failed: {e}")
+            self._stop.wait(self.interval)
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._last_read = time.monotonic()
+                self._thread = threading.Thread(target=self._run, name="live-producer", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self.writer is not None:
+            self.writer.close()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "pauses": self.pauses,
+            "ticks": self.ticks,
+            "readings_total": self.readings_total,
+            "errors": self.errors,
+            "buffered": len(self.buffer),
+            "last_seq": self.buffer.last_seq,
+        }
@@ -0,0 +1,256 @@
+import bisect
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+
+# Saniye cinsinden gecikme kovaları (0.1 ms - 5 s)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+def _format_labels(labelnames, values, *extra: str) -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    parts.extend(part for part in extra if part)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(name, "") for name in self.labelnames)
+
+    def render(self, const: str = "") -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        return lines + self._samples(const)
+
+class Counter(_Metric):
+    """
+    Monotonic counter per label combination.
+    """
+    type_name = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self, const=""):
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key, const)} {_format_value(value)}" for key, value in items]
+
+class Gauge(_Metric):
+    """
+    Current value per label combination; ``set_function`` makes the gauge
+    read its value(s) at scrape time instead.
+    """
+    type_name = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+        self._function = None
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def set_function(self, function):
+        # function() bir sayı veya {etiket demeti: değer} sözlüğü döndürür
+        self._function = function
+
+    def _samples(self, const=""):
+        if self._function is not None:
+            values = self._function()
+            items = values.items() if isinstance(values, dict) else [((), values)]
+        else:
+            with self._lock:
+                items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key, const)} {_format_value(value)}"
+                for key, value in items if value is not None]
+
+class Histogram(_Metric):
+    """
+    Cumulative-bucket histogram per label combination (Prometheus semantics).
+    """
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def _samples(self, const=""):
+        with self._lock:
+            items = [(key, (list(counts), total, n)) for key, (counts, total, n) in self._series.items()]
+        lines = []
+        for key, (counts, total, n) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, const, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key, const)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key, const)} {n}")
+        return lines
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered together in the Prometheus text format.
+
+    Values live in process memory. Under several server processes (gunicorn
+    workers) every process must be scraped separately: ``set_const_labels``
+    adds a label such as ``worker`` to every sample, and ``start_http_server``
+    serves the registry on a per-process port.
+    """
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._metrics = []
+        self._const = ""
+
+    def set_const_labels(self, **labels):
+        self._const = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render(self._const))
+        return "\n".join(lines) + "\n"
+
+    def start_http_server(self, port: int, host: str = "0.0.0.0"):
+        """
+        Serves ``render()`` at /metrics on its own port from a daemon thread.
+        """
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", registry.CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        return server
+
+def process_memory_bytes() -> dict:
+    """
+    Resident and virtual memory of the current process (Linux /proc, with a
+    getrusage fallback for the peak RSS elsewhere).
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            size, resident = (int(value) for value in f.read().split()[:2])
+        page = os.sysconf("SC_PAGE_SIZE")
+        return {"resident": resident * page, "virtual": size * page}
+    except (OSError, ValueError):
+        import resource
+        return {"resident": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024, "virtual": None}
+
+def register_process_metrics(registry: MetricsRegistry):
+    registry.gauge("process_resident_memory_bytes", "Resident memory size in bytes.").set_function(
+        lambda: process_memory_bytes()["resident"])
+    registry.gauge("process_virtual_memory_bytes", "Virtual memory size in bytes.").set_function(
+        lambda: process_memory_bytes()["virtual"])
+    registry.gauge("process_cpu_seconds_total", "Total user and system CPU time in seconds.").set_function(
+        time.process_time)
+    start = time.time()
+    registry.gauge("process_start_time_seconds", "Start time of the process since unix epoch.").set_function(
+        lambda: start)
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware counting requests/errors and timing them per route
+    template (not per raw URL, to keep label cardinality bounded).
+    """
+
+    def __init__(self, app, requests: Counter, errors: Counter, latency: Histogram):
+        self.app = app
+        self.requests = requests
+        self.errors = errors
+        self.latency = latency
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            method = scope.get("method", "")
+            self.latency.observe(time.perf_counter() - start, method=method, path=path)
+            self.requests.inc(method=method, path=path, status=status[0])
+            if status[0] >= 400:
+                self.errors.inc(method=method, path=path, status=status[0])
@@ -1,29 +1,34 @@
 import joblib
 import os
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import RandomForestClassifier, ExtraTreesClassifier, HistGradientBoostingClassifier
 from sklearn.metrics import classification_report, confusion_matrix
 from src.utils import get_logger
 
 logger = get_logger(__name__)
 
-def train_model(X, y, params: dict):
+# Desteklenen model aileleri (params.yaml -> model.family)
+MODEL_FAMILIES = {
+    "random_forest": RandomForestClassifier,
+    "extra_trees": ExtraTreesClassifier,
+    "hist_gradient_boosting": HistGradientBoostingClassifier,
+}
+
+def build_model(family: str = "random_forest", params: dict = None):
     """
-    Trains a Random Forest model.
+    Instantiates an unfitted classifier of the given family.
     """
-    logger.info("Training model...")
-    logger.info("Training model...")
-    # Default parametreleri al
-    params = params or {}
-    n_estimators = params.get("n_estimators", 100)
-    random_state = params.get("random_state", 42)
-    
-    # Parametreleri temizle (sadece sklearn'ün kabul ettiklerini gönderelim diyeceğim ama
-    # kwargs ile hepsini yollamak daha kolay, fakat RandomForestClassifier **kwargs kabul ediyor mu?
-    # Evet ediyor. Ama biz güvenli olsun diye bilinenleri çekip kalanı kwargs olarak verelim.
-    # En kolayı: sözlüğü direkt unpacking yapmak.
-    
-    model = RandomForestClassifier(**params)
+    if family not in MODEL_FAMILIES:
+        raise ValueError(f"Unknown model family '{family}', expected one of {list(MODEL_FAMILIES)}")
+    return MODEL_FAMILIES[family](**(params or {}))
+
+def train_model(X, y, params: dict, family: str = "random_forest"):
+    """
+    Trains a classifier of the given family (Random Forest by default).
+    """
+    logger.info(f"Training model ({family})...")
+    # Parametreler doğrudan sınıfa aktarılır; sklearn bilinmeyen parametrede hata verir
+    model = build_model(family, params)
     model.fit(X, y)
     
     logger.info("Model training completed.")
@@ -44,10 +49,14 @@ def evaluate_model(model, X_test, y_test):
 def save_model(model, path: str):
     """
     Saves the trained model using joblib.
+    The pickle is written to a temporary file and renamed into place, so a
+    reader never loads a partially written model.
     """
     try:
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        joblib.dump(model, path)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, path)
         logger.info(f"Model saved to {path}")
     except Exception as e:
         logger.error(f"Error saving model: {e}")
@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import OrderedDict
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache of prediction results keyed by quantized inputs.
+
+    Readings are snapped to a per-field grid (``quantization`` maps a field
+    to its step; fields without a step, or with step 0, are matched exactly)
+    so near-identical steady-state readings share one entry. Entries expire
+    after ``ttl_seconds`` and the least recently used entry is evicted once
+    ``max_size`` is reached. Results are tied to a model version: looking up
+    or storing with a different version clears the cache.
+    """
+
+    def __init__(self, fields: list, max_size: int = 10000, ttl_seconds: float = 300.0, quantization: dict = None):
+        self.fields = list(fields)
+        self.max_size = max_size
+        self.ttl = ttl_seconds
+        quantization = quantization or {}
+        self.steps = [quantization.get(field) or 0 for field in self.fields]
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def key(self, row: dict) -> tuple:
+        # Izgara indeksine yuvarla (float karşılaştırma hatalarını önlemek için tamsayı anahtar)
+        return tuple(
+            round(row[field] / step) if step else row[field]
+            for field, step in zip(self.fields, self.steps)
+        )
+
+    def _check_version(self, version: str):
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+                logger.info(f"Prediction cache invalidated (model {self._version} -> {version})")
+            self._entries.clear()
+            self._version = version
+
+    def get(self, version: str, row: dict):
+        """
+        Returns the cached result for ``row`` or None.
+        """
+        key = self.key(row)
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, version: str, row: dict, result):
+        key = self.key(row)
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "model_version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+def from_config(fields: list, cache_config: dict):
+    """
+    Builds a PredictionCache from a params.yaml section, or None when disabled.
+    """
+    if not cache_config.get("enabled", False):
+        return None
+    return PredictionCache(
+        fields,
+        max_size=cache_config.get("max_size", 10000),
+        ttl_seconds=cache_config.get("ttl_seconds", 300),
+        quantization=cache_config.get("quantization"),
+    )
@@ -0,0 +1,151 @@
+import json
+import os
+import re
+import uuid
+import shutil
+from datetime import datetime
+import joblib
+from src.inference import CompiledForest, build_predictor, load_predictor
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+CURRENT_FILE = "CURRENT"
+VERSION_PATTERN = re.compile(r"^v(\d+)$")
+# Kayıt defterinde model yoksa kullanılan sürüm etiketi (params.yaml -> model.path)
+LEGACY_VERSION = "legacy"
+
+class ModelRegistry:
+    """
+    Versioned local model store.
+
+    Every published model gets its own directory (v0001, v0002, ...) holding
+    the pickle, the compact artifact and metadata. A version directory is
+    fully written under a temporary name and then renamed into place, and the
+    CURRENT pointer file is replaced atomically, so readers never see a
+    half-written model.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def versions(self) -> list:
+        if not os.path.isdir(self.root):
+            return []
+        names = [name for name in os.listdir(self.root) if VERSION_PATTERN.match(name)]
+        return sorted(names, key=lambda name: int(VERSION_PATTERN.match(name).group(1)))
+
+    def version_path(self, version: str) -> str:
+        return os.path.join(self.root, version)
+
+    def current_version(self):
+        path = os.path.join(self.root, CURRENT_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            return f.read().strip() or None
+
+    def set_current(self, version: str):
+        """
+        Points CURRENT at an existing version (also used for rollbacks).
+        """
+        if version not in self.versions():
+            raise ValueError(f"Unknown model version '{version}'")
+        tmp_path = os.path.join(self.root, f".{CURRENT_FILE}.{uuid.uuid4().hex}")
+        with open(tmp_path, "w") as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self.root, CURRENT_FILE))
+        logger.info(f"Current model version: {version}")
+
+    def publish(self, model, metadata: dict = None, make_current: bool = True, artifacts: dict = None) -> str:
+        """
+        Stores a fitted model as a new version and (by default) activates it.
+        ``artifacts`` maps file names to JSON-serializable objects stored
+        alongside the model (e.g. precomputed explanations).
+        """
+        os.makedirs(self.root, exist_ok=True)
+        tmp_dir = os.path.join(self.root, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp_dir)
+
+        for name, content in (artifacts or {}).items():
+            with open(os.path.join(tmp_dir, name), "w") as f:
+                json.dump(content, f, default=str)
+
+        joblib.dump(model, os.path.join(tmp_dir, "model.pkl"))
+        try:
+            CompiledForest.from_sklearn(model).save(os.path.join(tmp_dir, "compact"))
+        except TypeError as e:
+            logger.warning(f"Compact artifact skipped: {e}")
+
+        # Sürüm numarası yarışında rename başarısız olursa bir sonrakini dene
+        while True:
+            existing = self.versions()
+            number = int(VERSION_PATTERN.match(existing[-1]).group(1)) + 1 if existing else 1
+            version = f"v{number:04d}"
+            with open(os.path.join(tmp_dir, "metadata.json"), "w") as f:
+                json.dump({"version": version, "created_at": datetime.now().isoformat(timespec="seconds"),
+                           "model_type": type(model).__name__, **(metadata or {})}, f, indent=2, default=str)
+            try:
+                os.rename(tmp_dir, self.version_path(version))
+                break
+            except OSError:
+                if not os.path.exists(self.version_path(version)):
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
+                    raise
+
+        logger.info(f"Model published as {version} in {self.root}")
+        if make_current:
+            self.set_current(version)
+        return version
+
+    def metadata(self, version: str) -> dict:
+        with open(os.path.join(self.version_path(version), "metadata.json"), "r") as f:
+            return json.load(f)
+
+    def load_artifact(self, version: str, name: str):
+        """
+        Reads a JSON artifact stored with a version, or None if it has none.
+        """
+        path = os.path.join(self.version_path(version), name)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def load_model(self, version: str):
+        return joblib.load(os.path.join(self.version_path(version), "model.pkl"))
+
+    def load_predictor(self, version: str, engine: str = "sklearn"):
+        """
+        Loads a version for inference; the compiled engine memory-maps the
+        compact artifact when the version has one.
+        """
+        compact_path = os.path.join(self.version_path(version), "compact")
+        if engine == "compiled" and os.path.exists(os.path.join(compact_path, "meta.json")):
+            return CompiledForest.load(compact_path, mmap=True)
+        return build_predictor(self.load_model(version), engine)
+
+def load_active_predictor(config: dict):
+    """
+    Returns (version, predictor) for the registry's CURRENT version, or the
+    legacy model.path pickle when the registry is empty.
+    """
+    registry_config = config.get("registry", {})
+    engine = config["model"].get("engine", "sklearn")
+    if registry_config.get("path"):
+        registry = ModelRegistry(registry_config["path"])
+        version = registry.current_version()
+        if version:
+            return version, registry.load_predictor(version, engine)
+    return LEGACY_VERSION, load_predictor(config["model"])
+
+def load_model_version(config: dict, version: str):
+    """
+    Loads the sklearn model behind a version (e.g. for SHAP), including the
+    legacy model.path pickle.
+    """
+    if version == LEGACY_VERSION:
+        return joblib.load(config["model"]["path"])
+    return ModelRegistry(config["registry"]["path"]).load_model(version)
@@ -0,0 +1,201 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from src.utils import load_config, get_logger
+
+logger = get_logger(__name__)
+
+def worker_count(value=None) -> int:
+    """
+    Serving process count; 0 or None means one per available CPU core.
+    """
+    if value:
+        return int(value)
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return multiprocessing.cpu_count()
+
+def free_slot(used) -> int:
+    """
+    Smallest worker slot number not in ``used``; a replacement worker takes
+    over the slot (metrics port, ``worker`` label) of the one it replaces.
+    """
+    used = set(used)
+    slot = 0
+    while slot in used:
+        slot += 1
+    return slot
+
+class Overloaded(RuntimeError):
+    """
+    Raised when a bounded queue is full; the API answers 429.
+    """
+
+# --- Inference process pool ---
+
+# Pool süreçlerinde sürüm başına yüklenen predictor'lar
+_pool_models = {}
+
+def _pool_predictor(version: str):
+    predictor = _pool_models.get(version)
+    if predictor is None:
+        from src.inference import array_predictor, load_predictor
+        from src.registry import LEGACY_VERSION, ModelRegistry
+        config = load_config()
+        if version == LEGACY_VERSION:
+            predictor = load_predictor(config["model"])
+        else:
+            predictor = ModelRegistry(config["registry"]["path"]).load_predictor(
+                version, config["model"].get("engine", "sklearn"))
+        # Eski sürümleri bırak; süreç başına tek model bellekte kalır
+        _pool_models.clear()
+        _pool_models[version] = predictor = array_predictor(predictor)
+    return predictor
+
+def _pool_init(version: str):
+    if version:
+        _pool_predictor(version)
+
+def _pool_predict_proba(version: str, features):
+    return _pool_predictor(version).predict_proba(features)
+
+class InferencePool:
+    """
+    Runs predict_proba in a bounded pool of worker processes, so CPU-bound
+    tree inference is not limited to one core by the GIL.
+
+    Only the feature matrix and the probabilities cross the process boundary;
+    each worker loads the model version it is asked for once (compiled
+    artifacts are memory-mapped, so their pages are shared). At most
+    ``max_pending`` calls may be queued or running: a call that finds the
+    pool full waits up to ``queue_timeout_ms`` and then raises Overloaded.
+    Workers are started with "spawn" because the API process runs threads.
+    """
+
+    def __init__(self, processes: int, max_pending: int = None, queue_timeout_ms: float = 0,
+                 version: str = None):
+        self.processes = worker_count(processes)
+        self.max_pending = max_pending or 4 * self.processes
+        self.queue_timeout = queue_timeout_ms / 1000.0
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = ProcessPoolExecutor(
+            self.processes, mp_context=multiprocessing.get_context("spawn"),
+            initializer=_pool_init, initargs=(version,)
+        )
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.calls_total = 0
+        self.rejected_total = 0
+
+    def predict_proba(self, version: str, features):
+        """
+        Blocking call (from a threadpool thread); the GIL is released while
+        the worker process computes.
+        """
+        if self.queue_timeout > 0:
+            acquired = self._slots.acquire(timeout=self.queue_timeout)
+        else:
+            acquired = self._slots.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                self.rejected_total += 1
+            raise Overloaded(f"Inference pool is full ({self.max_pending} pending calls)")
+        with self._lock:
+            self.pending += 1
+            self.calls_total += 1
+        try:
+            return self._executor.submit(_pool_predict_proba, version, features).result()
+        finally:
+            with self._lock:
+                self.pending -= 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "processes": self.processes,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "calls_total": self.calls_total,
+            "rejected_total": self.rejected_total,
+        }
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+# --- Load shedding ---
+
+class ConcurrencyLimitMiddleware:
+    """
+    Pure ASGI middleware bounding concurrent requests under ``paths``.
+
+    Up to ``max_concurrency`` requests run at once and up to ``max_queue``
+    more wait for a slot; anything beyond that is rejected immediately with
+    429 and a Retry-After header instead of piling up in the threadpool.
+    Limits are per process (per gunicorn worker). Other paths (health,
+    metrics) are never limited.
+    """
+
+    def __init__(self, app, max_concurrency: int, max_queue: int = 0,
+                 paths: tuple = ("/predict", "/explain"), retry_after: int = 1, shed=None):
+        self.app = app
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.paths = tuple(paths)
+        self.retry_after = retry_after
+        self.shed = shed
+        self._loop = None
+        self._semaphore = None
+        self.admitted = 0
+        self.shed_total = 0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        # Event loop değiştiyse (ör. test istemcisi) semafor yeniden kurulur
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    @property
+    def active(self) -> int:
+        return min(self.admitted, self.max_concurrency)
+
+    @property
+    def queued(self) -> int:
+        return max(0, self.admitted - self.max_concurrency)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+
+        if self.admitted >= self.max_concurrency + self.max_queue:
+            self.shed_total += 1
+            if self.shed is not None:
+                self.shed.inc(path=scope["path"])
+            await self._reject(send)
+            return
+
+        self.admitted += 1
+        try:
+            async with self._get_semaphore():
+                await self.app(scope, receive, send)
+        finally:
+            self.admitted -= 1
+
+    async def _reject(self, send):
+        body = json.dumps({"detail": "Sunucu kapasitesi dolu, daha sonra tekrar deneyin."}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
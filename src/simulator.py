@@ -1,5 +1,10 @@
+import os
 import random
+from datetime import datetime
+from statistics import NormalDist
+import numpy as np
 import pandas as pd
+import polars as pl
 import time
 
 def generate_live_data():
@@ -32,3 +37,119 @@ def generate_live_data():
         "tool_wear": tool_wear,
         "timestamp": pd.Timestamp.now()
     }
+
+class FleetSimulator:
+    """
+    NumPy ile vektörize filo simülatörü: N makine × T tick tek seferde üretilir.
+
+    generate_live_data ile aynı fizik kullanılır (RPM-Tork ters ilişkisi, %5 anomali).
+    Her makinenin kendi rastgele üreteci (seed'den türetilir) ve durumu vardır:
+    takım aşınması tick'ler arasında birikir, 250 dakikayı geçince takım değişir.
+    Aynı seed ile makine başına akış filo boyutundan ve batch bölünmesinden bağımsızdır.
+    """
+
+    MAX_TOOL_WEAR = 250
+
+    def __init__(self, n_machines: int, seed: int = None, anomaly_rate: float = 0.05,
+                 tick_seconds: float = 1.0, start=None):
+        self.n_machines = n_machines
+        self.anomaly_rate = anomaly_rate
+        # Standart normalin bu eşiğin altında kalma olasılığı anomaly_rate'tir
+        if anomaly_rate <= 0:
+            self._anomaly_threshold = -np.inf
+        elif anomaly_rate >= 1:
+            self._anomaly_threshold = np.inf
+        else:
+            self._anomaly_threshold = NormalDist().inv_cdf(anomaly_rate)
+        self.tick_seconds = tick_seconds
+        self.machine_ids = np.array([f"M{i:05d}" for i in range(n_machines)])
+
+        # Makine başına bağımsız üreteç
+        self.rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n_machines)]
+
+        # Makine durumu: başlangıç aşınması rastgele (filo farklı yaşlarda)
+        self.tool_wear = np.array([rng.integers(0, self.MAX_TOOL_WEAR + 1) for rng in self.rngs], dtype=np.int64)
+        self.start = np.datetime64(start if start is not None else datetime.now(), "ms")
+        self.tick = 0
+
+    def generate(self, n_ticks: int) -> pl.DataFrame:
+        """
+        Sonraki n_ticks tick'i tüm makineler için üretir (tick-major sırada).
+        """
+        n, t = self.n_machines, n_ticks
+        # Makine başına tek çağrıda (t, 5) standart normal: tick başına sabit sayıda değer
+        # tüketildiği için akış batch bölünmesinden bağımsızdır
+        z = np.empty((5, t, n))
+        for i, rng in enumerate(self.rngs):
+            z[:, :, i] = rng.standard_normal((t, 5)).T
+
+        air_temp = 300 + 2 * z[0]
+        temp_offset = 10 + z[1]  # Proses genelde havadan 10 derece sıcak
+        rpm = 1500 + 100 * z[2]
+        torque_noise = 5 * z[3]
+        # Anomali: beşinci normal değişken alt kuyruğa düşerse (olasılık = anomaly_rate)
+        anomaly = z[4] < self._anomaly_threshold
+
+        # RPM ve Tork ters orantılı
+        torque = (40 * 1500) / rpm + torque_noise
+
+        # Aşınma her tick 1 dakika artar, sınırı aşınca takım değişir (0'dan başlar)
+        ticks = np.arange(1, t + 1)[:, None]
+        wear = (self.tool_wear[None, :] + ticks) % (self.MAX_TOOL_WEAR + 1)
+        self.tool_wear = wear[-1].copy()
+
+        # Anomali: tork fırlar, aşınma artmış görünür
+        torque = torque + 30 * anomaly
+        tool_wear = wear + 100 * anomaly
+
+        offsets = ((self.tick + np.arange(t)) * self.tick_seconds * 1000).astype("timedelta64[ms]")
+        timestamps = np.repeat(self.start + offsets, n)
+        self.tick += t
+
+        return pl.DataFrame({
+            "machine_id": np.tile(self.machine_ids, t),
+            "timestamp": timestamps,
+            "air_temp": air_temp.ravel(),
+            "process_temp": (air_temp + temp_offset).ravel(),
+            "rpm": rpm.astype(np.int64).ravel(),
+            "torque": torque.ravel(),
+            "tool_wear": tool_wear.ravel(),
+            "anomaly": anomaly.ravel(),
+        })
+
+    def stream(self, n_ticks: int = None, batch_ticks: int = 100):
+        """
+        batch_ticks'lik DataFrame'ler üretir; n_ticks verilmezse sonsuz akış.
+        """
+        produced = 0
+        while n_ticks is None or produced < n_ticks:
+            size = batch_ticks if n_ticks is None else min(batch_ticks, n_ticks - produced)
+            yield self.generate(size)
+            produced += size
+
+    def write_parquet(self, path: str, n_ticks: int, batch_ticks: int = 100) -> int:
+        """
+        Akışı parça parça tek bir Parquet dosyasına yazar (bellek batch boyutuyla sınırlı).
+        """
+        import pyarrow.parquet as pq
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        rows = 0
+        writer = None
+        try:
+            for batch in self.stream(n_ticks, batch_ticks):
+                table = batch.to_arrow()
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                rows += batch.height
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+def generate_fleet_data(n_machines: int, n_ticks: int, seed: int = None, **kwargs) -> pl.DataFrame:
+    """
+    n_machines × n_ticks okumayı tek seferde üretir (FleetSimulator kısayolu).
+    """
+    return FleetSimulator(n_machines, seed=seed, **kwargs).generate(n_ticks)
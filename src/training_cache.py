@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from src.data import feature_source_files, scan_features
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+ARRAYS = ["X_train", "X_test", "y_train", "y_test", "fold_ids"]
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def cache_key(config: dict) -> str:
+    """
+    Hash of the processed data contents plus every setting that changes the
+    cached arrays (feature list, target, split and fold settings, dtype).
+    """
+    cache_config = config.get("training_cache", {})
+    payload = {
+        "data": [file_digest(path) for path in feature_source_files(config)],
+        "features": config["features"]["numerical"],
+        "target": config["features"].get("target", "target"),
+        "test_size": config.get("base", {}).get("test_size", 0.2),
+        "random_state": config.get("base", {}).get("random_state", 42),
+        "cv_folds": config.get("tuning", {}).get("cv_folds", 3),
+        "dtype": cache_config.get("dtype", "float32"),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16]
+
+def _feature_dtype(X: np.ndarray, requested: str):
+    # sklearn ağaç modelleri X'i zaten float32'ye çevirir; aralık dışı değer varsa float64 kalır
+    if requested == "float32" and np.all(np.abs(X[np.isfinite(X)]) < np.finfo(np.float32).max):
+        return np.float32
+    return np.float64
+
+def _build(config: dict, cache_dir: str, key: str):
+    features = config["features"]["numerical"]
+    target = config["features"].get("target", "target")
+    test_size = config.get("base", {}).get("test_size", 0.2)
+    random_state = config.get("base", {}).get("random_state", 42)
+    cv_folds = config.get("tuning", {}).get("cv_folds", 3)
+
+    df = scan_features(config).select(features + [target]).collect()
+    X = df.select(features).to_numpy()
+    y = df[target].to_numpy()
+    X = X.astype(_feature_dtype(X, config.get("training_cache", {}).get("dtype", "float32")))
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state, stratify=y
+    )
+    # Her eğitim satırının ait olduğu doğrulama fold'u
+    fold_ids = np.empty(len(y_train), dtype=np.int8)
+    for fold, (_, valid_idx) in enumerate(StratifiedKFold(n_splits=cv_folds).split(X_train, y_train)):
+        fold_ids[valid_idx] = fold
+
+    tmp_dir = cache_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    arrays = {"X_train": X_train, "X_test": X_test, "y_train": y_train, "y_test": y_test, "fold_ids": fold_ids}
+    for name, array in arrays.items():
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(array))
+    with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+        json.dump({"key": key, "features": features, "target": target, "dtype": str(X.dtype),
+                   "n_train": len(y_train), "n_test": len(y_test), "cv_folds": cv_folds}, f, indent=2)
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(tmp_dir, cache_dir)
+
+def load_training_data(config: dict):
+    """
+    Returns (X_train, X_test, y_train, y_test, folds) as read-only memory-mapped
+    arrays, building the cache on the first call for a given cache key.
+    folds is a list of (train_idx, valid_idx) pairs over X_train.
+    """
+    cache_root = config.get("training_cache", {}).get("path", "data/cache/training")
+    key = cache_key(config)
+    cache_dir = os.path.join(cache_root, key)
+
+    if os.path.exists(os.path.join(cache_dir, "meta.json")):
+        logger.info(f"Training cache hit: {cache_dir}")
+    else:
+        logger.info(f"Training cache miss, building {cache_dir}...")
+        _build(config, cache_dir, key)
+
+    arrays = {name: np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode="r") for name in ARRAYS}
+    fold_ids = np.asarray(arrays["fold_ids"])
+    folds = [(np.flatnonzero(fold_ids != fold), np.flatnonzero(fold_ids == fold))
+             for fold in range(int(fold_ids.max()) + 1)]
+    return arrays["X_train"], arrays["X_test"], arrays["y_train"], arrays["y_test"], folds
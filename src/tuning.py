@@ -0,0 +1,179 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import optuna
+from optuna.trial import TrialState
+from optuna.study import MaxTrialsCallback
+from optuna.storages import JournalStorage, RDBStorage
+from optuna.storages.journal import JournalFileBackend
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold
+from src.model import build_model
+from src.utils import get_logger
+
+logger = get_logger(__name__)
+
+# Deneme sayısına dahil edilen (bitmiş) durumlar
+FINISHED_STATES = (TrialState.COMPLETE, TrialState.PRUNED)
+
+def make_storage(spec: str):
+    """
+    Builds an Optuna storage from a config string: "sqlite:///path.db" (or any
+    SQLAlchemy URL) for RDB storage, otherwise a journal file path.
+    """
+    if "://" in spec:
+        return RDBStorage(spec)
+    os.makedirs(os.path.dirname(spec) or ".", exist_ok=True)
+    return JournalStorage(JournalFileBackend(spec))
+
+def make_pruner(name: str):
+    if name == "median":
+        return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=0)
+    if name == "hyperband":
+        return optuna.pruners.HyperbandPruner()
+    if name in (None, "none"):
+        return optuna.pruners.NopPruner()
+    raise ValueError(f"Unknown pruner '{name}'")
+
+def suggest_params(trial, family: str = "random_forest") -> dict:
+    """
+    Search space for each model family.
+    """
+    # Denenecek parametre aralıkları
+    if family in ("random_forest", "extra_trees"):
+        return {
+            "n_estimators": trial.suggest_int("n_estimators", 50, 300),
+            "max_depth": trial.suggest_int("max_depth", 5, 30),
+            "min_samples_split": trial.suggest_int("min_samples_split", 2, 10),
+            "min_samples_leaf": trial.suggest_int("min_samples_leaf", 1, 5),
+        }
+    if family == "hist_gradient_boosting":
+        return {
+            "max_iter": trial.suggest_int("max_iter", 50, 300),
+            "max_depth": trial.suggest_int("max_depth", 3, 15),
+            "learning_rate": trial.suggest_float("learning_rate", 0.01, 0.3, log=True),
+            "min_samples_leaf": trial.suggest_int("min_samples_leaf", 5, 50),
+            "l2_regularization": trial.suggest_float("l2_regularization", 1e-6, 1.0, log=True),
+        }
+    raise ValueError(f"No search space for model family '{family}'")
+
+def make_objective(X, y, cv_folds: int = 3, random_state: int = 42, n_jobs: int = 1, folds=None,
+                   family: str = "random_forest"):
+    """
+    Returns an objective that reports the running mean F1 after every CV fold,
+    so the pruner can stop unpromising trials before all folds are fitted.
+    """
+    if folds is None:
+        folds = list(StratifiedKFold(n_splits=cv_folds).split(X, y))
+
+    def objective(trial):
+        params = suggest_params(trial, family)
+        params["random_state"] = random_state
+        if family != "hist_gradient_boosting":
+            params["n_jobs"] = n_jobs
+
+        scores = []
+        for step, (train_idx, valid_idx) in enumerate(folds):
+            model = build_model(family, params)
+            model.fit(X[train_idx], y[train_idx])
+            scores.append(f1_score(y[valid_idx], model.predict(X[valid_idx])))
+
+            trial.report(float(np.mean(scores)), step)
+            if trial.should_prune():
+                raise optuna.TrialPruned()
+        return float(np.mean(scores))
+
+    return objective
+
+def _run_worker(storage_spec: str, study_name: str, n_trials: int, X, y, folds,
+                tuning_config: dict, random_state: int, family: str, seed: int):
+    """
+    Process entry point: attaches to the shared study and runs trials until
+    the study holds n_trials finished trials.
+    """
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = optuna.load_study(
+        study_name=study_name,
+        storage=make_storage(storage_spec),
+        sampler=optuna.samplers.TPESampler(seed=seed),
+        pruner=make_pruner(tuning_config.get("pruner", "median"))
+    )
+    objective = make_objective(
+        X, y,
+        cv_folds=tuning_config.get("cv_folds", 3),
+        random_state=random_state,
+        n_jobs=tuning_config.get("model_n_jobs", 1),
+        folds=folds,
+        family=family
+    )
+    study.optimize(objective, n_trials=n_trials, callbacks=[MaxTrialsCallback(n_trials, states=FINISHED_STATES)])
+
+def _recover_stale_trials(study: optuna.Study) -> int:
+    """
+    Marks trials left RUNNING by a crashed run as FAIL and re-enqueues their
+    parameters so the resumed study evaluates them again.
+    """
+    stale = study.get_trials(deepcopy=False, states=(TrialState.RUNNING,))
+    for trial in stale:
+        study.tell(trial.number, state=TrialState.FAIL)
+        study.enqueue_trial(trial.params, skip_if_exists=True)
+    if stale:
+        logger.warning(f"{len(stale)} interrupted trial(s) re-enqueued.")
+    return len(stale)
+
+DEFAULT_FAMILY = "random_forest"
+
+def study_name_for(base_name: str, family: str) -> str:
+    return base_name if family == DEFAULT_FAMILY else f"{base_name}-{family}"
+
+def tune(X, y, config: dict, folds=None) -> optuna.Study:
+    """
+    Runs (or resumes) the hyperparameter search described by config["tuning"]
+    across n_workers processes sharing one persistent Optuna storage.
+    Must not be run concurrently with another process tuning the same study.
+    Precomputed CV folds (list of (train_idx, valid_idx)) can be passed in.
+    """
+    tuning_config = config.get("tuning", {})
+    random_state = config.get("base", {}).get("random_state", 42)
+    n_trials = tuning_config.get("n_trials", 20)
+    n_workers = max(1, tuning_config.get("n_workers", 1))
+    storage_spec = tuning_config.get("storage", "optuna/maintenance_study.log")
+    family = config.get("model", {}).get("family", "random_forest")
+    # Her model ailesinin arama uzayı farklı: aile başına ayrı çalışma. Varsayılan aile
+    # (random_forest) yapılandırılan adı kullanmaya devam eder; önceki çalışmalar kaldığı yerden sürer.
+    study_name = study_name_for(tuning_config.get("study_name", "maintenance"), family)
+
+    X = np.asarray(X)
+    y = np.asarray(y).ravel()
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING) # Sadece önemli mesajları göster
+    study = optuna.create_study(
+        study_name=study_name,
+        storage=make_storage(storage_spec),
+        direction="maximize",
+        load_if_exists=True
+    )
+    _recover_stale_trials(study)
+
+    finished = len(study.get_trials(deepcopy=False, states=FINISHED_STATES))
+    if finished >= n_trials:
+        logger.info(f"Study '{study_name}' already has {finished}/{n_trials} trials.")
+        return study
+
+    logger.info(f"Tuning '{study_name}': {finished}/{n_trials} trials done, {n_workers} worker(s), storage={storage_spec}")
+    args = (storage_spec, study_name, n_trials, X, y, folds, tuning_config, random_state, family)
+    if n_workers == 1:
+        _run_worker(*args, seed=random_state + finished)
+    else:
+        # spawn: worker süreçleri Polars/BLAS thread durumunu fork ile devralmasın
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=context) as executor:
+            futures = [executor.submit(_run_worker, *args, seed=random_state + finished + i) for i in range(n_workers)]
+            for future in futures:
+                future.result()
+
+    study = optuna.load_study(study_name=study_name, storage=make_storage(storage_spec))
+    pruned = len(study.get_trials(deepcopy=False, states=(TrialState.PRUNED,)))
+    logger.info(f"Tuning finished: best F1={study.best_value:.4f}, {pruned} trial(s) pruned.")
+    return study
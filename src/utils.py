@@ -1,6 +1,8 @@
 import yaml
 import logging
 import os
+import time
+from contextlib import ContextDecorator
 
 def load_config(config_path="params.yaml"):
     """
@@ -27,3 +29,37 @@ def get_logger(name, log_level=logging.INFO):
         logger.addHandler(handler)
         logger.setLevel(log_level)
     return logger
+
+class timed(ContextDecorator):
+    """
+    Measures the wall time of a block or function.
+
+    Usable as ``with timed("stage", logger):`` or as a ``@timed("stage", logger)``
+    decorator. The elapsed seconds are logged when a logger is given and
+    passed to ``observer(stage, seconds)`` when one is given (e.g. a metrics
+    histogram). Only a perf_counter call on each side, so it can stay on in
+    hot paths.
+    """
+
+    def __init__(self, stage: str, logger=None, observer=None):
+        self.stage = stage
+        self.logger = logger
+        self.observer = observer
+        self.elapsed = None
+
+    def _recreate_cm(self):
+        # Dekoratör olarak her çağrıda yeni örnek (eşzamanlı çağrılar birbirini ezmesin)
+        return type(self)(self.stage, self.logger, self.observer)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.elapsed = time.perf_counter() - self._start
+        if self.observer is not None:
+            self.observer(self.stage, self.elapsed)
+        if self.logger is not None:
+            status = "failed" if exc_type is not None else "completed"
+            self.logger.info(f"[timing] {self.stage} {status} in {self.elapsed:.3f}s")
+        return False
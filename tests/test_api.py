@@ -9,6 +9,11 @@ def test_read_root():
     assert response.status_code == 200
     assert response.json() == {"message": "API Çalışıyor. Tahmin için /predict endpoint'ini kullanın."}
 
+def test_ready():
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
+
 def test_predict_normal_case():
     """
     Geçerli bir veri ile tahmin isteği atıldığında doğru formatta cevap dönmeli.
@@ -47,5 +52,181 @@ def test_predict_missing_field():
     response = client.post("/predict", json=payload)
     assert response.status_code == 422
 
+def test_predict_batch_matches_single():
+    """
+    Toplu tahmin, tekil tahminlerle aynı sonuçları giriş sırasıyla dönmeli.
+    """
+    rows = [
+        {"air_temp": 300.0, "process_temp": 310.0, "rpm": 1500, "torque": 40.0, "tool_wear": 100},
+        {"air_temp": 302.0, "process_temp": 311.5, "rpm": 1300, "torque": 68.0, "tool_wear": 230},
+        {"air_temp": 298.5, "process_temp": 308.9, "rpm": 2100, "torque": 22.0, "tool_wear": 10},
+    ]
+
+    response = client.post("/predict/batch", json={"rows": rows})
+    assert response.status_code == 200
+    predictions = response.json()["predictions"]
+    assert len(predictions) == len(rows)
+
+    for row, batch_result in zip(rows, predictions):
+        single_result = client.post("/predict", json=row).json()
+        assert batch_result["prediction"] == single_result["prediction"]
+        assert batch_result["probability"] == pytest.approx(single_result["probability"])
+
+    # Sütun (columnar) formatı aynı sonucu vermeli
+    columns = {key: [row[key] for row in rows] for key in rows[0]}
+    columnar = client.post("/predict/batch", json={"columns": columns}).json()["predictions"]
+    assert columnar == predictions
+
+def test_predict_batch_too_large():
+    """
+    params.yaml'daki max_batch_size aşıldığında 413 dönmeli.
+    """
+    from src.api import MAX_BATCH_SIZE
+    row = {"air_temp": 300.0, "process_temp": 310.0, "rpm": 1500, "torque": 40.0, "tool_wear": 100}
+
+    response = client.post("/predict/batch", json={"rows": [row] * (MAX_BATCH_SIZE + 1)})
+    assert response.status_code == 413
+
+    # Sınır şemada: sütun formatında tek bir uzun dizi de 413 almalı
+    columns = {key: [value] for key, value in row.items()}
+    columns["rpm"] = [1500] * (MAX_BATCH_SIZE + 1)
+    assert client.post("/predict/batch", json={"columns": columns}).status_code == 413
+
+def test_batching_stats():
+    response = client.get("/batching/stats")
+    assert response.status_code == 200
+    assert "enabled" in response.json()
+
+def test_predictions_are_queued_for_logging(tmp_path, monkeypatch):
+    """
+    Tahminler istek yolunda veritabanına yazılmaz, write-behind kuyruğuna alınır.
+    Yazıcı uygulama açılışında kurulur, kapanışta kuyruğu boşaltır.
+    """
+    from src import api, database
+    if not api.logging_config.get("enabled", False):
+        pytest.skip("prediction_logging kapalı")
+    database.close_pool()
+    monkeypatch.setattr(database, "DB_BACKEND", "sqlite")
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "test.db"))
+    monkeypatch.setattr(api, "prediction_log", None)
+
+    payload = {"air_temp": 300.0, "process_temp": 310.0, "rpm": 1500, "torque": 40.0, "tool_wear": 100}
+    try:
+        with TestClient(app) as lifespan_client:
+            before = lifespan_client.get("/logging/stats").json()
+            assert before["enabled"]
+            lifespan_client.post("/predict", json=payload)
+            after = lifespan_client.get("/logging/stats").json()
+            assert after["rows_enqueued"] == before["rows_enqueued"] + 1
+        assert api.prediction_log.stats()["rows_written"] == after["rows_enqueued"]
+        assert len(database.fetch_history(limit=10)) == after["rows_enqueued"]
+    finally:
+        database.close_pool()
+
 # Not: Modelin doğruluğunu test etmiyoruz (o MLflow'un işi), 
 # sadece API'nin çalışıp çalışmadığını (kontrat testi) yapıyoruz.
+
+def test_model_hot_reload(tmp_path, monkeypatch):
+    """
+    Kayıt defterine yeni sürüm yayınlanınca /model/reload ile aktif model değişmeli
+    ve yanıtlar yeni sürümü raporlamalı.
+    """
+    import joblib
+    from src import api
+    from src.registry import ModelRegistry, LEGACY_VERSION
+
+    monkeypatch.setitem(api.registry_config, "path", str(tmp_path / "registry"))
+    monkeypatch.setattr(api, "_active_model", None)
+    monkeypatch.setattr(api, "_global_explanations", {})
+    payload = {"air_temp": 300.0, "process_temp": 310.0, "rpm": 1500, "torque": 40.0, "tool_wear": 100}
+
+    # Kayıt defteri boşken legacy pickle kullanılır
+    assert client.post("/predict", json=payload).json()["model_version"] == LEGACY_VERSION
+
+    # Kayıt defteri yokken global açıklama artefaktı da yok
+    assert client.get("/explain/global").status_code == 404
+
+    model = joblib.load(api.config["model"]["path"])
+    ModelRegistry(api.registry_config["path"]).publish(
+        model, artifacts={"global_explanations.json": {"mean_abs_shap": {"torque": 0.1}}})
+
+    response = client.post("/model/reload").json()
+    assert response == {"previous_version": LEGACY_VERSION, "model_version": "v0001", "reloaded": True}
+    assert client.post("/predict", json=payload).json()["model_version"] == "v0001"
+    assert client.get("/model").json()["model_version"] == "v0001"
+    assert client.get("/batching/stats").json()["model_version"] == "v0001"
+    assert client.get("/explain/global").json() == {"model_version": "v0001", "mean_abs_shap": {"torque": 0.1}}
+
+def test_prediction_cache_hits():
+    """
+    Aynı okuma tekrar geldiğinde model yerine önbellekten cevap dönmeli.
+    """
+    from src import api
+    if api.prediction_cache is None:
+        pytest.skip("Tahmin önbelleği kapalı")
+
+    payload = {"air_temp": 297.3, "process_temp": 308.1, "rpm": 1411, "torque": 51.3, "tool_wear": 17}
+    before = client.get("/cache/stats").json()
+    first = client.post("/predict/batch", json={"rows": [payload, payload]}).json()["predictions"]
+    second = client.post("/predict", json=payload).json()
+    after = client.get("/cache/stats").json()
+
+    assert first[0] == first[1] == second
+    assert after["hits"] - before["hits"] >= 1
+
+def test_explain_batch():
+    """
+    /explain, satır başına özellik sayısı kadar SHAP değeri dönmeli.
+    """
+    rows = [
+        {"air_temp": 300.0, "process_temp": 310.0, "rpm": 1500, "torque": 40.0, "tool_wear": 100},
+        {"air_temp": 302.0, "process_temp": 311.5, "rpm": 1300, "torque": 68.0, "tool_wear": 230},
+    ]
+    response = client.post("/explain", json={"rows": rows, "mode": "approximate", "max_trees": 10})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["mode"] == "approximate"
+    assert len(data["shap_values"]) == 2
+    assert all(len(values) == len(data["feature_names"]) for values in data["shap_values"])
+
+    assert client.post("/explain", json={"rows": []}).status_code == 422
+    assert client.post("/explain", json={"rows": rows, "mode": "unknown"}).status_code == 422
+
+def test_metrics_endpoint():
+    """
+    /metrics, Prometheus formatında istek, aşama ve model metriklerini dönmeli.
+    """
+    payload = {"air_temp": 301.1, "process_temp": 310.4, "rpm": 1622, "torque": 33.3, "tool_wear": 42}
+    client.post("/predict/batch", json={"rows": [payload]})
+    client.post("/predict", json={"air_temp": 300.0})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+
+    assert 'api_requests_total{method="POST",path="/predict/batch",status="200"}' in text
+    assert 'api_request_errors_total{method="POST",path="/predict",status="422"}' in text
+    for stage in ("validation", "create_features", "inference"):
+        assert f'api_stage_duration_seconds_count{{stage="{stage}"}}' in text
+    assert "api_prediction_batch_rows_bucket" in text
+    assert "api_model_info{version=" in text
+    assert "process_resident_memory_bytes" in text
+
+def test_full_inference_pool_returns_429(monkeypatch):
+    """
+    Çıkarım havuzu doluysa istek beklemeden 429 ve Retry-After ile reddedilmeli.
+    """
+    import src.api as api
+    from src.serving import Overloaded
+
+    class FullPool:
+        def predict_proba(self, version, features):
+            raise Overloaded("full")
+
+    monkeypatch.setattr(api, "get_inference_pool", lambda: FullPool())
+    # Önbellekte olmayan bir okuma (model çağrılmalı)
+    payload = {"rows": [{"air_temp": 297.3, "process_temp": 308.9, "rpm": 1777, "torque": 33.3, "tool_wear": 77}]}
+    response = client.post("/predict/batch", json=payload)
+    assert response.status_code == 429
+    assert "retry-after" in response.headers
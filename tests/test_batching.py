@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+from src.batching import MicroBatcher
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    """
+    Aynı anda gelen istekler tek batch'te işlenmeli ve sonuçlar doğru isteğe dönmeli.
+    """
+    calls = []
+
+    def predict_fn(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(predict_fn, max_batch_size=8, max_wait_ms=50)
+
+    async def run():
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(run())
+
+    assert results == [0, 2, 4, 6, 8]
+    assert len(calls) == 1
+    stats = batcher.stats()
+    assert stats["batches_total"] == 1
+    assert stats["items_total"] == 5
+    assert stats["max_batch_size_seen"] == 5
+
+def test_micro_batcher_respects_max_batch_size():
+    batcher = MicroBatcher(lambda items: list(items), max_batch_size=3, max_wait_ms=50)
+
+    async def run():
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(7)))
+        await batcher.stop()
+        return results
+
+    assert asyncio.run(run()) == list(range(7))
+    assert batcher.stats()["max_batch_size_seen"] <= 3
+
+def test_micro_batcher_propagates_errors():
+    def predict_fn(items):
+        raise ValueError("model hatası")
+
+    batcher = MicroBatcher(predict_fn, max_batch_size=4, max_wait_ms=1)
+
+    async def run():
+        try:
+            await batcher.submit(1)
+        finally:
+            await batcher.stop()
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+
+def test_micro_batcher_stop_cancels_pending_callers():
+    """
+    stop() sırasında hesaplanan batch'teki ve kuyrukta bekleyen istekler asılı kalmamalı.
+    """
+    import threading
+    release = threading.Event()
+
+    def predict_fn(items):
+        release.wait(5)
+        return list(items)
+
+    batcher = MicroBatcher(predict_fn, max_batch_size=2, max_wait_ms=1)
+
+    async def run():
+        tasks = [asyncio.create_task(batcher.submit(i)) for i in range(5)]
+        # İlk batch executor'da çalışırken geri kalanlar kuyrukta
+        while batcher.batches_total == 0:
+            await asyncio.sleep(0.01)
+        await batcher.stop()
+        release.set()
+        return await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), 2)
+
+    results = asyncio.run(run())
+    assert len(results) == 5
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
@@ -0,0 +1,34 @@
+import polars as pl
+from src.data import stream_ingest, scan_raw, RAW_COLUMN_MAP
+
+def test_stream_ingest_renames_and_splits_into_parquet(tmp_path):
+    """
+    Ham UCI sütunları lazy olarak yeniden adlandırılıp parça parça Parquet'e yazılmalı.
+    """
+    raw = pl.DataFrame({
+        "UDI": list(range(1, 11)),
+        "Air temperature [K]": [300.0] * 10,
+        "Process temperature [K]": [310.0] * 10,
+        "Rotational speed [rpm]": [1500] * 10,
+        "Torque [Nm]": [40.0] * 10,
+        "Tool wear [min]": list(range(10)),
+        "Machine failure": [0] * 9 + [1],
+    })
+    raw_path = str(tmp_path / "raw.csv")
+    raw.write_csv(raw_path)
+
+    parquet_dir = str(tmp_path / "raw_parquet")
+    stream_ingest(raw_path, parquet_dir, rows_per_file=4)
+
+    assert len(list((tmp_path / "raw_parquet").glob("*.parquet"))) == 3
+    result = scan_raw(raw_path, parquet_dir).collect().sort("id")
+    assert result.columns == list(RAW_COLUMN_MAP.values())
+    assert result["tool_wear"].to_list() == list(range(10))
+    assert result["target"].sum() == 1
+
+def test_scan_raw_falls_back_to_csv(tmp_path):
+    raw_path = str(tmp_path / "raw.csv")
+    pl.DataFrame({"UDI": [1], "Torque [Nm]": [40.0]}).write_csv(raw_path)
+
+    result = scan_raw(raw_path, str(tmp_path / "missing")).collect()
+    assert result.columns == ["id", "torque"]
@@ -0,0 +1,149 @@
+import pytest
+from src import database
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """
+    Postgres yerine geçici bir SQLite veritabanı kullanır.
+    """
+    database.close_pool()
+    monkeypatch.setattr(database, "DB_BACKEND", "sqlite")
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "test.db"))
+    database.init_db()
+    yield database
+    database.close_pool()
+
+RAW = {"air_temp": 300.0, "process_temp": 310.0, "rpm": 1500, "torque": 40.0, "tool_wear": 100}
+
+def test_insert_and_fetch_history(sqlite_db):
+    sqlite_db.insert_record(RAW, 1, 0.9)
+    sqlite_db.insert_record(RAW, 0, 0.1)
+
+    df = sqlite_db.fetch_history(limit=10)
+    assert len(df) == 2
+    # En yeni kayıt başta olmalı
+    assert df["prediction"].tolist() == [0, 1]
+    assert df["status"].tolist() == ["Normal", "Riskli"]
+
+def test_insert_records_bulk(sqlite_db):
+    records = [sqlite_db.make_record(RAW, i % 2, i / 100) for i in range(250)]
+    assert sqlite_db.insert_records(records) == 250
+    assert len(sqlite_db.fetch_history(limit=1000)) == 250
+    assert len(sqlite_db.fetch_history(limit=5)) == 5
+
+def test_pool_reuses_connections(sqlite_db):
+    with sqlite_db.connection() as first:
+        pass
+    with sqlite_db.connection() as second:
+        pass
+    assert first is second
+
+def test_close_pool_with_open_connection(sqlite_db):
+    """
+    Havuz kapatılırken ödünç alınmış bağlantı, eski havuzun yuvasını iade etmeli; yeni havuz etkilenmemeli.
+    """
+    with sqlite_db.connection():
+        old_pool = sqlite_db.get_pool()
+        sqlite_db.close_pool()
+        new_pool = sqlite_db.get_pool()
+    assert new_pool is not old_pool
+    # Yeni havuzun yuvaları eksiksiz; fazladan release ValueError fırlatırdı
+    with pytest.raises(ValueError):
+        new_pool.slots.release()
+    with sqlite_db.connection() as conn:
+        assert conn.execute("SELECT 1").fetchone() == (1,)
+
+def test_pool_tracks_only_idle_connections(sqlite_db):
+    with sqlite_db.connection() as conn:
+        # Ödünçteki bağlantının son kullanım kaydı tutulmaz
+        assert conn not in sqlite_db.get_pool()._last_used
+    assert list(sqlite_db.get_pool()._last_used) == [conn]
+
+def test_buffered_writer_flushes_on_size_and_close(sqlite_db):
+    writer = sqlite_db.BufferedWriter(flush_rows=10, flush_interval_ms=60_000)
+    for i in range(25):
+        writer.write(sqlite_db.make_record(RAW, 0, 0.1))
+
+    # 10'luk eşik iki kez aşıldı; kalan 5 kayıt close() ile yazılmalı
+    writer.close()
+    assert writer.rows_written == 25
+    assert writer.pending() == 0
+    assert len(sqlite_db.fetch_history(limit=100)) == 25
+
+def test_migrations_create_indexes_and_are_idempotent(sqlite_db):
+    # init_db fixture'da bir kez çalıştı; ikinci çalıştırma hata vermemeli
+    sqlite_db.migrate_db()
+
+    with sqlite_db.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'logs'")
+        indexes = {row[0] for row in cursor.fetchall()}
+        cursor.execute("SELECT version FROM schema_migrations")
+        versions = [row[0] for row in cursor.fetchall()]
+
+    assert {"idx_logs_timestamp", "idx_logs_status"} <= indexes
+    assert versions == [version for version, _, _ in sqlite_db.MIGRATIONS]
+
+def test_fetch_history_page_keyset_pagination(sqlite_db):
+    records = [sqlite_db.make_record(RAW, i % 2, i / 100) for i in range(25)]
+    sqlite_db.insert_records(records)
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = sqlite_db.fetch_history_page(limit=10, before_id=cursor, columns=["probability"])
+        assert list(page.columns) == ["id", "probability"]
+        seen.extend(page["id"].tolist())
+        if cursor is None:
+            break
+
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) == len(set(seen)) == 25
+
+def test_fetch_history_page_filters(sqlite_db):
+    old = dict(sqlite_db.make_record(RAW, 1, 0.9), timestamp="2024-01-15 10:00:00")
+    new = dict(sqlite_db.make_record(RAW, 0, 0.1), timestamp="2024-02-15 10:00:00")
+    sqlite_db.insert_records([old, new])
+
+    january, _ = sqlite_db.fetch_history_page(start="2024-01-01 00:00:00", end="2024-02-01 00:00:00")
+    assert january["status"].tolist() == ["Riskli"]
+
+    normal, _ = sqlite_db.fetch_history_page(status="Normal", columns=["timestamp", "status"])
+    assert normal["timestamp"].tolist() == ["2024-02-15 10:00:00"]
+
+    with pytest.raises(ValueError):
+        sqlite_db.fetch_history_page(columns=["id; DROP TABLE logs"])
+
+def test_buffered_writer_drops_when_full(sqlite_db):
+    writer = sqlite_db.BufferedWriter(flush_rows=100, flush_interval_ms=60_000, max_pending=3)
+    accepted = [writer.write(sqlite_db.make_record(RAW, 0, 0.1)) for _ in range(5)]
+
+    # Yazıcı uyandırılmış olabilir; en az ilk 3 kayıt kabul edilmeli, reddedilenler sayılmalı
+    assert accepted[:3] == [True, True, True]
+    assert writer.rows_dropped == accepted.count(False)
+
+    writer.close()
+    assert writer.rows_written == accepted.count(True)
+    assert writer.stats()["pending"] == 0
+
+def test_buffered_writers_share_one_fork_hook(sqlite_db):
+    """
+    Yazıcılar tek bir modül düzeyi fork kancasına zayıf referansla kaydolmalı (kanca birikmez).
+    """
+    import gc
+    registered = len(database._writers)
+    writer = database.BufferedWriter(flush_rows=10, flush_interval_ms=50)
+    assert writer in database._writers
+    writer.close()
+    del writer
+    gc.collect()
+    assert len(database._writers) == registered
+
+def test_buffered_writer_drops_after_close(sqlite_db):
+    """
+    Kapanıştan sonra gelen kayıt (süren istek) hata fırlatmamalı, düşürülmüş sayılmalı.
+    """
+    writer = database.BufferedWriter(flush_rows=10, flush_interval_ms=50)
+    writer.close()
+    assert writer.write(database.make_record(RAW, 0, 0.1)) is False
+    assert writer.stats()["rows_dropped"] == 1
@@ -0,0 +1,51 @@
+import os
+import numpy as np
+import polars as pl
+from src.envelope import compute_envelope, load_envelope
+
+def make_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pl.DataFrame({
+        "rpm": rng.normal(1500, 180, n),
+        "torque": rng.normal(40, 10, n),
+        "target": (rng.random(n) < 0.05).astype(int),
+    })
+
+def test_envelope_payload_is_constant_size():
+    small = compute_envelope(make_frame(1_000).lazy(), x_bins=20, y_bins=10, max_failure_points=30)
+    large = compute_envelope(make_frame(200_000).lazy(), x_bins=20, y_bins=10, max_failure_points=30)
+
+    for envelope, n in [(small, 1_000), (large, 200_000)]:
+        counts = np.asarray(envelope["counts"])
+        assert counts.shape == (10, 20)
+        assert counts.sum() == envelope["rows"] == n
+        assert len(envelope["failure_sample"]["rpm"]) <= 30
+    assert len(large["failure_sample"]["rpm"]) == 30
+
+def test_failure_sample_and_counts():
+    df = make_frame(5_000)
+    envelope = compute_envelope(df.lazy(), x_bins=10, y_bins=10, max_failure_points=1_000)
+
+    # Arıza sayısı kotadan azsa tüm arızalar örneğe girer
+    failures = df.filter(pl.col("target") == 1)
+    assert np.asarray(envelope["failures"]).sum() == failures.height
+    assert sorted(envelope["failure_sample"]["rpm"]) == sorted(failures["rpm"].to_list())
+
+def test_load_envelope_caches_per_data_version(tmp_path):
+    path = tmp_path / "processed.csv"
+    make_frame(500).write_csv(path)
+    config = {
+        "data": {"processed_path": str(path)},
+        "features": {"target": "target"},
+        "envelope": {"cache_path": str(tmp_path / "envelope"), "x_bins": 5, "y_bins": 5},
+    }
+
+    first = load_envelope(config)
+    assert first["rows"] == 500
+    assert len(os.listdir(tmp_path / "envelope")) == 1
+    assert load_envelope(config) == first
+
+    # Veri değişince yeni sürüm hesaplanır
+    make_frame(800, seed=1).write_csv(path)
+    assert load_envelope(config)["rows"] == 800
+    assert len(os.listdir(tmp_path / "envelope")) == 2
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from src.explain import Explainer, limit_trees, stratified_sample, sample_background, compute_global_explanations
+
+FEATURES = ["a", "b", "c", "d"]
+
+@pytest.fixture
+def data():
+    X, y = make_classification(n_samples=300, n_features=4, random_state=0)
+    return pd.DataFrame(X, columns=FEATURES), y
+
+def test_exact_values_are_additive(data):
+    X, y = data
+    model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+    explainer = Explainer(model, FEATURES)
+
+    values = explainer.explain(X.head(20))
+    assert values.shape == (20, 4)
+    np.testing.assert_allclose(values.sum(axis=1) + explainer.base_value,
+                               model.predict_proba(X.head(20))[:, 1], atol=1e-6)
+
+def test_explanations_are_memoized(data):
+    X, y = data
+    model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+    explainer = Explainer(model, FEATURES, version="v1")
+
+    first = explainer.explain(X.head(5))
+    second = explainer.explain(X.head(5))
+    np.testing.assert_array_equal(first, second)
+    assert explainer.cache.stats()["hits"] == 5
+
+def test_fast_modes_and_tree_cap(data):
+    X, y = data
+    model = RandomForestClassifier(n_estimators=20, random_state=0).fit(X, y)
+
+    limited = limit_trees(model, 5)
+    assert len(limited.estimators_) == 5 and len(model.estimators_) == 20
+
+    capped = Explainer(model, FEATURES, max_trees=5)
+    np.testing.assert_allclose(capped.explain(X.head(10)).sum(axis=1) + capped.base_value,
+                               limited.predict_proba(X.head(10))[:, 1], atol=1e-6)
+
+    approximate = Explainer(model, FEATURES, mode="approximate")
+    assert approximate.explain(X.head(10)).shape == (10, 4)
+
+    interventional = Explainer(model, FEATURES, mode="interventional", background=X.head(30))
+    assert interventional.explain(X.head(10)).shape == (10, 4)
+
+    with pytest.raises(ValueError):
+        Explainer(model, FEATURES, mode="interventional")
+
+def test_boosted_model(data):
+    X, y = data
+    model = HistGradientBoostingClassifier(max_iter=10).fit(X, y)
+    assert Explainer(model, FEATURES, max_trees=5).explain(X.head(5)).shape == (5, 4)
+
+def test_stratified_sample_keeps_class_ratio():
+    y = np.array([0] * 970 + [1] * 30)
+    idx = stratified_sample(y, 100)
+    assert len(idx) == 100
+    assert y[idx].sum() == 3
+    assert len(stratified_sample(y, 5000)) == len(y)
+
+def test_sample_background_matches_eager_sample(data):
+    """
+    Tembel (LazyFrame) arka plan örneği, tablo belleğe alınıp seçilen satırlarla aynı olmalı.
+    """
+    import polars as pl
+    X, y = data
+    frame = pl.from_pandas(X.assign(target=y))
+    background = sample_background(frame.lazy(), FEATURES, "target", 50, random_state=7)
+    expected = X.iloc[stratified_sample(y, 50, 7)].reset_index(drop=True)
+    pd.testing.assert_frame_equal(background, expected)
+
+def test_global_explanations(data):
+    X, y = data
+    model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+    summary = compute_global_explanations(model, X, y, FEATURES, sample_size=100, chunk_size=30,
+                                          n_jobs=2, dependence_features=["a"], grid_bins=5)
+
+    assert summary["sample_size"] == 100
+    assert list(summary["mean_abs_shap"]) == sorted(summary["mean_abs_shap"], key=lambda f: -summary["mean_abs_shap"][f])
+
+    # Paralel parçalar tek seferlik hesapla aynı olmalı
+    idx = stratified_sample(y, 100)
+    direct = np.abs(Explainer(model, FEATURES).shap_values(X.iloc[idx])).mean(axis=0)
+    np.testing.assert_allclose([summary["mean_abs_shap"][f] for f in FEATURES], direct)
+
+    curve = summary["dependence"]["a"]
+    assert sum(curve["count"]) == 100
+    assert len(curve["bin_centers"]) == len(curve["mean_shap"]) <= 5
@@ -0,0 +1,96 @@
+import pytest
+import polars as pl
+from src.feature_store import FeatureStore
+
+def make_raw(n: int) -> pl.LazyFrame:
+    return pl.LazyFrame({
+        "id": list(range(1, n + 1)),
+        "air_temp": [300.0] * n,
+        "process_temp": [310.0] * n,
+        "rpm": [1500] * n,
+        "torque": [40.0] * n,
+        "tool_wear": list(range(n)),
+    })
+
+def test_feature_store_only_processes_new_rows(tmp_path):
+    """
+    İkinci güncelleme sadece high-water mark'tan yeni satırları işlemeli.
+    """
+    store = FeatureStore(str(tmp_path / "store"))
+
+    assert store.update(make_raw(5)) == 5
+    assert store.high_water_mark() == 5
+
+    # Aynı veriyle tekrar çalıştırmak yeni dosya yazmamalı
+    assert store.update(make_raw(5)) == 0
+    assert len(store.files()) == 1
+
+    assert store.update(make_raw(8)) == 3
+    assert store.high_water_mark() == 8
+    assert len(store.files()) == 2
+
+    result = store.scan().collect()
+    assert result["id"].to_list() == list(range(1, 9))
+    assert result["power_factor"].to_list() == [60000.0] * 8
+    assert "temp_diff" in result.columns
+
+def make_timed_raw(n: int) -> pl.LazyFrame:
+    from datetime import datetime, timedelta
+    start = datetime(2024, 1, 1, 8, 0, 0)
+    return make_raw(n).with_columns(
+        pl.Series("timestamp", [start + timedelta(seconds=i) for i in range(n)])
+    )
+
+def test_feature_store_timestamp_watermark(tmp_path):
+    """
+    Zaman damgası watermark'ı state dosyasından geri okunup sütun tipiyle karşılaştırılmalı.
+    """
+    store = FeatureStore(str(tmp_path / "store"), "timestamp")
+
+    assert store.update(make_timed_raw(5)) == 5
+    assert store.high_water_mark() == "2024-01-01T08:00:04"
+    assert store.update(make_timed_raw(5)) == 0
+    assert store.update(make_timed_raw(7)) == 2
+    assert store.scan().collect()["id"].to_list() == list(range(1, 8))
+
+def test_feature_store_discards_uncommitted_parts(tmp_path):
+    """
+    Dosya yerine taşındıktan sonra state yazılamadıysa, yarım kalan part silinip
+    güncelleme tekrarlanmalı (satırlar iki kez saklanmamalı).
+    """
+    import os
+    store = FeatureStore(str(tmp_path / "store"))
+    store.update(make_raw(3))
+
+    # Önceki günden kalan, state'e işlenmemiş 2 numaralı part
+    orphan_dir = tmp_path / "store" / "ingest_date=2000-01-01"
+    orphan_dir.mkdir()
+    make_raw(5).filter(pl.col("id") > 3).collect().write_parquet(orphan_dir / "part-00000002.parquet")
+
+    assert store.update(make_raw(5)) == 2
+    assert not os.path.exists(orphan_dir / "part-00000002.parquet")
+    assert store.scan().collect()["id"].to_list() == list(range(1, 6))
+
+def test_feature_store_rolling_windows_continue_across_updates(tmp_path):
+    """
+    Parça parça güncellenen kayan pencere özellikleri, tüm veri tek seferde işlenmiş gibi olmalı.
+    """
+    from src.features import create_features, create_rolling_features
+    rolling = {"enabled": True, "window": 3, "group_col": "Product ID", "columns": ["torque", "tool_wear"]}
+
+    def raw(n):
+        return make_raw(n).with_columns(
+            (pl.col("id") % 2).cast(pl.String).alias("Product ID"),
+            (pl.col("torque") + pl.col("id") ** 2).alias("torque")
+        )
+
+    store = FeatureStore(str(tmp_path / "store"), rolling=rolling)
+    assert store.update(raw(5)) == 5
+    assert store.update(raw(9)) == 4
+    assert store.update(raw(12)) == 3
+
+    expected = create_rolling_features(create_features(raw(12)), window=3, columns=["torque", "tool_wear"]).collect()
+    result = store.scan().collect()
+    assert result["id"].to_list() == list(range(1, 13))
+    for col in ("torque_roll_mean", "torque_roll_std", "torque_roll_slope", "tool_wear_roll_slope"):
+        assert result[col].to_list() == pytest.approx(expected[col].to_list(), nan_ok=True)
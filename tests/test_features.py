@@ -1,6 +1,7 @@
 import pytest
+import numpy as np
 import polars as pl
-from src.features import create_features
+from src.features import create_features, FeatureVectorizer
 
 def test_create_features_correct_logic():
     """
@@ -47,3 +48,177 @@ def test_create_features_empty_dataframe():
     result_df = create_features(df_schema)
     assert result_df.height == 0
     assert "air_temp_c" in result_df.columns
+
+def test_create_features_lazyframe_matches_eager():
+    """
+    LazyFrame verildiğinde LazyFrame dönmeli ve sonuçlar eager ile aynı olmalı.
+    """
+    raw_data = {
+        "air_temp": [300.0, 298.1],
+        "process_temp": [310.0, 308.6],
+        "rpm": [1500, 1551],
+        "torque": [40.0, 42.8],
+        "tool_wear": [100, 0]
+    }
+    eager = create_features(pl.DataFrame(raw_data))
+    lazy = create_features(pl.LazyFrame(raw_data))
+
+    assert isinstance(lazy, pl.LazyFrame)
+    assert lazy.collect().equals(eager)
+
+def test_rolling_features_batch_and_online_agree():
+    """
+    Polars rolling (batch) ve ring buffer (online) yolları aynı değerleri üretmeli.
+    """
+    import numpy as np
+    from src.features import create_rolling_features, OnlineRollingFeatures, ROLLING_COLUMNS
+
+    rng = np.random.default_rng(0)
+    n = 150
+    df = pl.DataFrame({
+        "id": list(range(n)),
+        "Product ID": rng.choice(["M1", "M2", "M3"], size=n).tolist(),
+        "torque": rng.normal(40, 5, n).tolist(),
+        "temp_diff": rng.normal(10, 1, n).tolist(),
+        "tool_wear": rng.integers(0, 250, n).tolist(),
+    })
+
+    batch = create_rolling_features(df, window=7)
+    online = OnlineRollingFeatures(window=7)
+
+    for row in df.iter_rows(named=True):
+        features = online.update(row["Product ID"], row)
+        expected = batch.row(row["id"], named=True)
+        for name, value in features.items():
+            if value is None:
+                assert expected[name] is None
+            else:
+                assert value == pytest.approx(expected[name], rel=1e-9, abs=1e-9)
+
+    assert len(online) == 3
+
+def test_time_window_rolling_batch_matches_online():
+    """
+    "N okuma veya T saniye" penceresinde de batch (Polars) ve online yollar aynı değerleri üretmeli.
+    """
+    import numpy as np
+    from datetime import datetime, timedelta
+    from src.features import create_rolling_features, OnlineRollingFeatures
+
+    rng = np.random.default_rng(1)
+    n = 200
+    # Düzensiz aralıklar: bazı boşluklar pencereden uzun, pencere tamamen boşalır
+    gaps = rng.choice([0.5, 1.0, 2.0, 9.0], size=n, p=[0.4, 0.3, 0.2, 0.1])
+    start = datetime(2024, 1, 1)
+    df = pl.DataFrame({
+        "id": list(range(n)),
+        "Product ID": rng.choice(["M1", "M2"], size=n).tolist(),
+        "timestamp": [start + timedelta(seconds=float(s)) for s in np.cumsum(gaps)],
+        "torque": rng.normal(40, 5, n).tolist(),
+        "temp_diff": rng.normal(10, 1, n).tolist(),
+        "tool_wear": rng.integers(0, 250, n).tolist(),
+    })
+
+    batch = create_rolling_features(df.lazy(), window=6, window_seconds=5).collect()
+    online = OnlineRollingFeatures(window=6, window_seconds=5)
+
+    counts = set()
+    for row in df.iter_rows(named=True):
+        features = online.update(row["Product ID"], row)
+        counts.add(online._states[row["Product ID"]]["count"])
+        expected = batch.row(row["id"], named=True)
+        for name, value in features.items():
+            if value is None:
+                assert expected[name] is None
+            else:
+                assert value == pytest.approx(expected[name], rel=1e-9, abs=1e-9)
+
+    # Hem zaman (kısmi pencere) hem okuma sayısı sınırı devreye girmiş olmalı
+    assert 1 in counts and 6 in counts
+
+def test_rolling_slope_of_linear_trend():
+    from src.features import create_rolling_features
+
+    df = pl.DataFrame({
+        "id": [1, 2, 3, 4, 5],
+        "Product ID": ["M1"] * 5,
+        "torque": [40.0, 42.0, 44.0, 46.0, 48.0],
+        "temp_diff": [10.0] * 5,
+        "tool_wear": [0, 1, 2, 3, 4],
+    })
+    result = create_rolling_features(df, window=3)
+
+    assert result["torque_roll_slope"].to_list() == [None, 2.0, 2.0, 2.0, 2.0]
+    assert result["torque_roll_mean"][-1] == pytest.approx(46.0)
+    assert result["temp_diff_roll_std"][-1] == pytest.approx(0.0)
+
+def test_vectorizer_matches_create_features():
+    """
+    Doğrudan NumPy'a yazan serving yolu create_features ile aynı değerleri üretmelidir
+    (float64'te birebir, float32'de aynı yuvarlama), tekil ve toplu çağrıda aynı sonuçla.
+    """
+    rng = np.random.default_rng(0)
+    n = 500
+    raw = {
+        "air_temp": rng.normal(300, 2, n).tolist(),
+        "process_temp": rng.normal(310, 1.5, n).tolist(),
+        "rpm": rng.integers(1200, 2900, n).tolist(),
+        "torque": rng.normal(40, 10, n).tolist(),
+        "tool_wear": rng.integers(0, 250, n).tolist()
+    }
+    # Sıra params.yaml'dakinden farklı: sıranın vectorizer'a göre belirlendiğini doğrular
+    names = ["temp_diff", "air_temp_c", "process_temp_c", "rpm", "torque", "tool_wear", "power_factor"]
+    expected = create_features(pl.DataFrame(raw)).select(names).to_numpy()
+
+    exact = FeatureVectorizer(names, dtype=np.float64).transform(raw)
+    assert exact.flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(exact, expected)
+
+    vectorizer = FeatureVectorizer(names, dtype=np.float32)
+    batch = vectorizer.transform(raw)
+    assert batch.dtype == np.float32
+    np.testing.assert_array_equal(batch, expected.astype(np.float32))
+
+    # Önceden ayrılmış tampon yeniden kullanılabilir
+    buffer = vectorizer.allocate(n + 10)
+    np.testing.assert_array_equal(vectorizer.transform(raw, out=buffer), batch)
+
+    for i in (0, 17, n - 1):
+        row = {field: values[i] for field, values in raw.items()}
+        np.testing.assert_array_equal(vectorizer.transform_row(row)[0], batch[i])
+
+def test_vectorizer_preserves_model_outputs():
+    """
+    Serving matrisiyle alınan olasılıklar, eğitimdeki (float64) özelliklerle alınanla aynı olmalı.
+    HistGradientBoosting float64'te binler; float32'ye yuvarlanmış girdi sonucu değiştirebilir.
+    """
+    from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+    from src.inference import CompiledForest, array_predictor
+
+    rng = np.random.default_rng(1)
+    n = 4000
+    raw = {
+        "air_temp": rng.normal(300, 2, n).tolist(),
+        "process_temp": rng.normal(310, 1.5, n).tolist(),
+        "rpm": rng.integers(1200, 2900, n).tolist(),
+        "torque": rng.normal(40, 10, n).tolist(),
+        "tool_wear": rng.integers(0, 250, n).tolist()
+    }
+    names = ["air_temp_c", "process_temp_c", "rpm", "torque", "tool_wear", "power_factor", "temp_diff"]
+    X = create_features(pl.DataFrame(raw)).select(names).to_pandas()
+    y = ((X["torque"] > 50) & (X["tool_wear"] > 150)) | (X["temp_diff"] < 8.6)
+
+    forest = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+    for model, dtype in [
+        (HistGradientBoostingClassifier(max_iter=50, random_state=0).fit(X, y), np.float64),
+        (forest, np.float32),
+        (CompiledForest.from_sklearn(forest), np.float32),
+    ]:
+        vectorizer = FeatureVectorizer.for_model(model, names)
+        assert vectorizer.dtype == dtype
+        served = array_predictor(model).predict_proba(vectorizer.transform(raw))
+        np.testing.assert_array_equal(served, model.predict_proba(X))
+
+def test_vectorizer_rejects_unknown_features():
+    with pytest.raises(ValueError):
+        FeatureVectorizer(["air_temp_c", "rolling_mean_torque"])
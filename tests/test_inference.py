@@ -0,0 +1,69 @@
+import numpy as np
+import polars as pl
+import joblib
+import pytest
+from src.inference import CompiledForest, build_predictor
+from src.utils import load_config
+
+config = load_config()
+
+@pytest.fixture(scope="module")
+def model():
+    return joblib.load(config["model"]["path"])
+
+@pytest.fixture(scope="module")
+def X():
+    df = pl.read_csv(config["data"]["processed_path"])
+    return df.select(config["features"]["numerical"]).to_pandas()
+
+def test_compiled_forest_matches_sklearn_probabilities(model, X):
+    """
+    Derlenmiş motor, işlenmiş veri setinin tamamında sklearn ile birebir aynı olasılıkları üretmeli.
+    """
+    compiled = CompiledForest.from_sklearn(model)
+
+    expected = model.predict_proba(X)
+    actual = compiled.predict_proba(X)
+
+    assert actual.shape == expected.shape
+    assert np.array_equal(actual, expected)
+    assert np.array_equal(compiled.predict(X), model.predict(X))
+
+def test_compiled_forest_chunking_does_not_change_results(model, X):
+    compiled = CompiledForest.from_sklearn(model, chunk_size=333)
+    assert np.array_equal(compiled.predict_proba(X[:1000]), model.predict_proba(X[:1000]))
+
+def test_compiled_forest_rejects_wrong_feature_order(model, X):
+    compiled = CompiledForest.from_sklearn(model)
+    with pytest.raises(ValueError):
+        compiled.predict_proba(X[X.columns[::-1]])
+
+def test_build_predictor_engines(model):
+    assert build_predictor(model, "sklearn") is model
+    assert isinstance(build_predictor(model, "compiled"), CompiledForest)
+    with pytest.raises(ValueError):
+        build_predictor(model, "onnx")
+
+def test_compact_artifact_roundtrip(model, X, tmp_path):
+    """
+    Kompakt (.npy) artefakt memory-map ile yüklendiğinde aynı olasılıkları üretmeli.
+    """
+    path = str(tmp_path / "compact")
+    CompiledForest.from_sklearn(model).save(path)
+
+    loaded = CompiledForest.load(path, mmap=True)
+    assert isinstance(loaded.threshold, np.memmap)
+    assert np.array_equal(loaded.predict_proba(X[:2000]), model.predict_proba(X[:2000]))
+    assert loaded.feature_names_in_ == list(model.feature_names_in_)
+
+def test_load_predictor_prefers_compact_artifact(model, tmp_path):
+    from src.inference import load_predictor
+
+    path = str(tmp_path / "compact")
+    CompiledForest.from_sklearn(model).save(path)
+
+    model_config = {"path": str(tmp_path / "missing.pkl"), "engine": "compiled", "compact_path": path}
+    assert isinstance(load_predictor(model_config), CompiledForest)
+
+    with pytest.raises(FileNotFoundError):
+        load_predictor({**model_config, "engine": "sklearn"})
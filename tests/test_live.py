@@ -0,0 +1,104 @@
+import itertools
+import time
+from src.live import RingBuffer, LiveProducer
+from src.features import OnlineRollingFeatures
+
+def test_ring_buffer_since_returns_only_new_items():
+    buffer = RingBuffer(capacity=5)
+    buffer.extend([1, 2, 3])
+
+    items, seq = buffer.since(0)
+    assert items == [1, 2, 3] and seq == 3
+
+    buffer.extend([4])
+    assert buffer.since(seq) == ([4], 4)
+    assert buffer.since(4) == ([], 4)
+
+    # Geride kalan okuyucu taşan öğeleri atlar
+    buffer.extend(range(5, 12))
+    items, seq = buffer.since(4)
+    assert items == [7, 8, 9, 10, 11] and seq == 11
+    assert buffer.latest() == 11
+
+class FakeWriter:
+    def __init__(self):
+        self.records = []
+        self.closed = False
+
+    def write(self, record):
+        self.records.append(record)
+        return True
+
+    def close(self):
+        self.closed = True
+
+def make_source():
+    counter = itertools.count()
+    def source():
+        i = next(counter)
+        return [{"machine_id": m, "air_temp": 300.0, "process_temp": 310.0, "rpm": 1500,
+                 "torque": 40.0 + i, "tool_wear": i, "timestamp": i} for m in ("A", "B")]
+    return source
+
+def predict(readings):
+    return [{"prediction": int(r["torque"] > 41), "probability": 0.9 if r["torque"] > 41 else 0.1,
+             "temp_diff": r["process_temp"] - r["air_temp"]} for r in readings]
+
+def test_tick_enriches_once_and_writes():
+    writer = FakeWriter()
+    producer = LiveProducer(make_source(), predict_fn=predict, writer=writer,
+                            rolling=OnlineRollingFeatures(window=3))
+    for _ in range(3):
+        producer.tick()
+
+    items, seq = producer.buffer.since(0)
+    assert seq == 6 and len(writer.records) == 6
+    last_a = [item for item in items if item["machine_id"] == "A"][-1]
+    assert last_a["prediction"] == 1
+    assert last_a["torque_roll_mean"] == 41.0
+    assert writer.records[-1]["status"] == "Riskli"
+
+    # Tahmin fonksiyonu yoksa okumalar yine yayınlanır, kayıt yazılmaz
+    producer.set_predict_fn(None)
+    producer.tick()
+    assert len(writer.records) == 6
+    assert "prediction" not in producer.buffer.latest()
+
+def test_background_thread():
+    producer = LiveProducer(make_source(), predict_fn=predict, interval_s=0.01, writer=FakeWriter())
+    producer.start()
+    deadline = time.time() + 2
+    while producer.ticks < 3 and time.time() < deadline:
+        time.sleep(0.01)
+    producer.stop()
+
+    stats = producer.stats()
+    assert stats["ticks"] >= 3 and not stats["running"] and stats["errors"] == 0
+    assert producer.writer.closed
+
+def test_producer_pauses_without_readers_and_resumes_on_read():
+    """
+    İzleyen yokken üretici durmalı (tahmin/kayıt yok), ilk okumada yeniden başlamalı.
+    """
+    writer = FakeWriter()
+    producer = LiveProducer(make_source(), predict_fn=predict, interval_s=0.01, writer=writer,
+                            idle_timeout_s=0.05)
+    producer.start()
+    deadline = time.time() + 2
+    while producer.running and time.time() < deadline:
+        time.sleep(0.01)
+    assert not producer.running and producer.stats()["pauses"] == 1
+
+    written = len(writer.records)
+    time.sleep(0.05)
+    assert len(writer.records) == written
+
+    _, seq = producer.read(0)
+    assert producer.running
+    # İzleyen gibi düzenli okunur (yavaş makinede ilk tick'ten önce yeniden duraklamasın)
+    deadline = time.time() + 2
+    while producer.read(seq)[1] == seq and time.time() < deadline:
+        time.sleep(0.01)
+    assert producer.buffer.last_seq > seq
+    producer.stop()
+    assert not producer.running and writer.closed
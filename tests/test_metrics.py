@@ -0,0 +1,85 @@
+import socket
+import urllib.request
+import pytest
+from src.metrics import MetricsRegistry, process_memory_bytes
+from src.utils import timed
+
+def test_counter_and_histogram_render():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("path",))
+    latency = registry.histogram("latency_seconds", "Latency.", ("stage",), buckets=(0.01, 0.1))
+
+    requests.inc(path="/predict")
+    requests.inc(2, path="/predict")
+    for value in (0.005, 0.05, 0.5):
+        latency.observe(value, stage="inference")
+
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{path="/predict"} 3' in text
+    # Kümülatif kovalar
+    assert 'latency_seconds_bucket{stage="inference",le="0.01"} 1' in text
+    assert 'latency_seconds_bucket{stage="inference",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{stage="inference",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{stage="inference"} 3' in text
+    assert latency.count(stage="inference") == 3
+
+def test_gauge_function_and_label_escaping():
+    registry = MetricsRegistry()
+    registry.gauge("info", "Info.", ("version",)).set_function(lambda: {('v"1',): 1})
+    registry.gauge("missing", "Skipped when None.").set_function(lambda: None)
+
+    text = registry.render()
+    assert 'info{version="v\\"1"} 1' in text
+    assert "\nmissing " not in text
+
+def test_process_memory():
+    memory = process_memory_bytes()
+    assert memory["resident"] > 0
+
+def test_timed_context_and_decorator():
+    observed = []
+
+    with timed("block", observer=lambda stage, seconds: observed.append((stage, seconds))) as timer:
+        pass
+    assert timer.elapsed >= 0
+    assert observed[0][0] == "block"
+
+    @timed("function", observer=lambda stage, seconds: observed.append((stage, seconds)))
+    def work(x):
+        return x * 2
+
+    assert work(2) == 4 and work(3) == 6
+    assert [stage for stage, _ in observed] == ["block", "function", "function"]
+
+    # Hata olsa da süre kaydedilir ve hata yutulmaz
+    with pytest.raises(ValueError):
+        with timed("failing", observer=lambda stage, seconds: observed.append((stage, seconds))):
+            raise ValueError()
+    assert observed[-1][0] == "failing"
+
+def test_worker_label_and_per_process_endpoint():
+    """
+    Çok süreçli modda her worker'ın serileri worker etiketiyle kendi portundan sunulmalı.
+    """
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests.", ("path",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1,))
+    requests.inc(path="/predict")
+    latency.observe(0.05)
+    registry.set_const_labels(worker=2)
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = registry.start_http_server(port, host="127.0.0.1")
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            text = response.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert 'requests_total{path="/predict",worker="2"} 1' in text
+    assert 'latency_seconds_bucket{worker="2",le="0.1"} 1' in text
+    assert 'latency_seconds_count{worker="2"} 1' in text
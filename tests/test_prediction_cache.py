@@ -0,0 +1,52 @@
+import time
+from src.prediction_cache import PredictionCache, from_config
+
+FIELDS = ["air_temp", "torque"]
+
+def test_quantized_hits_and_misses():
+    cache = PredictionCache(FIELDS, quantization={"air_temp": 0.5})
+    cache.put("v1", {"air_temp": 300.1, "torque": 40.0}, "a")
+
+    # Aynı ızgara hücresi -> isabet; torque birebir eşleşmeli
+    assert cache.get("v1", {"air_temp": 299.9, "torque": 40.0}) == "a"
+    assert cache.get("v1", {"air_temp": 300.1, "torque": 40.1}) is None
+    assert cache.get("v1", {"air_temp": 301.0, "torque": 40.0}) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert stats["hit_rate"] == 1 / 3
+
+def test_lru_eviction():
+    cache = PredictionCache(FIELDS, max_size=2)
+    cache.put("v1", {"air_temp": 1, "torque": 1}, "a")
+    cache.put("v1", {"air_temp": 2, "torque": 2}, "b")
+    cache.get("v1", {"air_temp": 1, "torque": 1})  # "a" en son kullanılan olur
+    cache.put("v1", {"air_temp": 3, "torque": 3}, "c")
+
+    assert cache.get("v1", {"air_temp": 2, "torque": 2}) is None
+    assert cache.get("v1", {"air_temp": 1, "torque": 1}) == "a"
+    assert cache.stats()["evictions"] == 1
+
+def test_ttl_expiry():
+    cache = PredictionCache(FIELDS, ttl_seconds=0.05)
+    cache.put("v1", {"air_temp": 1, "torque": 1}, "a")
+    assert cache.get("v1", {"air_temp": 1, "torque": 1}) == "a"
+    time.sleep(0.1)
+    assert cache.get("v1", {"air_temp": 1, "torque": 1}) is None
+    assert cache.stats()["size"] == 0
+
+def test_model_version_change_invalidates():
+    cache = PredictionCache(FIELDS)
+    cache.put("v1", {"air_temp": 1, "torque": 1}, "a")
+    assert cache.get("v2", {"air_temp": 1, "torque": 1}) is None
+
+    stats = cache.stats()
+    assert stats["size"] == 0
+    assert stats["invalidations"] == 1
+    assert stats["model_version"] == "v2"
+
+def test_from_config():
+    assert from_config(FIELDS, {"enabled": False}) is None
+    cache = from_config(FIELDS, {"enabled": True, "max_size": 5, "quantization": {"torque": 0.1}})
+    assert cache.max_size == 5
+    assert cache.steps == [0, 0.1]
@@ -0,0 +1,51 @@
+import os
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier
+from src.registry import ModelRegistry, load_active_predictor, LEGACY_VERSION
+from src.inference import CompiledForest
+
+@pytest.fixture
+def fitted():
+    X, y = make_classification(n_samples=200, n_features=4, random_state=0)
+    return RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y), X
+
+def test_publish_creates_versions_and_moves_current(tmp_path, fitted):
+    model, X = fitted
+    registry = ModelRegistry(str(tmp_path / "registry"))
+
+    assert registry.current_version() is None
+    assert registry.publish(model, {"f1_score": 0.8}) == "v0001"
+    assert registry.publish(model) == "v0002"
+    assert registry.versions() == ["v0001", "v0002"]
+    assert registry.current_version() == "v0002"
+    assert registry.metadata("v0001")["f1_score"] == 0.8
+
+    # Geçici dizin veya pointer dosyası ortada kalmamalı
+    leftovers = [name for name in os.listdir(registry.root) if name.startswith(".")]
+    assert leftovers == []
+
+    # Geri alma (rollback)
+    registry.set_current("v0001")
+    assert registry.current_version() == "v0001"
+    with pytest.raises(ValueError):
+        registry.set_current("v0099")
+
+def test_load_active_predictor(tmp_path, fitted):
+    model, X = fitted
+    config = {
+        "model": {"path": str(tmp_path / "missing.pkl"), "engine": "compiled"},
+        "registry": {"path": str(tmp_path / "registry")},
+    }
+
+    # Kayıt defteri boş ve legacy pickle yok
+    with pytest.raises(FileNotFoundError):
+        load_active_predictor(config)
+
+    ModelRegistry(config["registry"]["path"]).publish(model)
+    version, predictor = load_active_predictor(config)
+    assert version == "v0001"
+    assert isinstance(predictor, CompiledForest)
+    assert np.array_equal(predictor.predict_proba(X), model.predict_proba(X))
+    assert LEGACY_VERSION != version
@@ -0,0 +1,75 @@
+import asyncio
+import httpx
+import numpy as np
+import pytest
+from src.serving import ConcurrencyLimitMiddleware, InferencePool, Overloaded, free_slot, worker_count
+
+def make_app(release: asyncio.Event, started: list):
+    async def app(scope, receive, send):
+        started.append(scope["path"])
+        if scope["path"].startswith("/predict"):
+            await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+    return app
+
+def test_concurrency_limit_sheds_beyond_queue():
+    """
+    Sınır + kuyruk doluyken gelen istek beklemeden 429 almalı; sınırsız yollar etkilenmemeli.
+    """
+    async def run():
+        release, started = asyncio.Event(), []
+        limited = ConcurrencyLimitMiddleware(make_app(release, started), max_concurrency=1, max_queue=1)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=limited), base_url="http://test") as client:
+            first = asyncio.create_task(client.post("/predict", json={}))
+            second = asyncio.create_task(client.post("/predict", json={}))
+            while limited.admitted < 2:
+                await asyncio.sleep(0.01)
+            assert (limited.active, limited.queued) == (1, 1)
+            # Üçüncü istek reddedilir, metrik yolu sınırlanmaz
+            shed = await client.post("/predict", json={})
+            metrics = await client.get("/metrics")
+            release.set()
+            return shed, metrics, await first, await second, limited, started
+
+    shed, metrics, first, second, limited, started = asyncio.run(run())
+    assert shed.status_code == 429
+    assert shed.headers["retry-after"] == "1"
+    assert metrics.status_code == 200
+    assert first.status_code == second.status_code == 200
+    assert limited.shed_total == 1
+    assert limited.admitted == 0
+    assert started.count("/predict") == 2
+
+def test_inference_pool_rejects_when_full():
+    # İşlem havuzu ilk submit'e kadar süreç başlatmaz; dolu yuva doğrudan denenebilir
+    pool = InferencePool(1, max_pending=1)
+    try:
+        pool._slots.acquire()
+        with pytest.raises(Overloaded):
+            pool.predict_proba("legacy", np.zeros((1, 7), dtype=np.float32))
+        assert pool.stats()["rejected_total"] == 1
+    finally:
+        pool.shutdown()
+
+def test_inference_pool_matches_in_process_predictions():
+    from src.api import get_active_model
+    version, predictor, vectorizer = get_active_model()
+    X = vectorizer.transform({
+        "air_temp": [300.0, 302.5], "process_temp": [310.0, 311.2], "rpm": [1500, 1380],
+        "torque": [40.0, 65.3], "tool_wear": [100, 230]
+    })
+    pool = InferencePool(1, version=version)
+    try:
+        np.testing.assert_array_equal(pool.predict_proba(version, X), predictor.predict_proba(X))
+    finally:
+        pool.shutdown()
+
+def test_worker_count_defaults_to_cpus():
+    assert worker_count(3) == 3
+    assert worker_count(0) >= 1
+
+def test_free_slot_reuses_gaps():
+    assert free_slot([]) == 0
+    assert free_slot([0, 1, 3]) == 2
+    assert free_slot([None, 0]) == 1
@@ -0,0 +1,46 @@
+import numpy as np
+import polars as pl
+from src.simulator import FleetSimulator, generate_fleet_data, generate_live_data
+
+def test_generate_live_data_schema():
+    reading = generate_live_data()
+    assert set(reading) == {"air_temp", "process_temp", "rpm", "torque", "tool_wear", "timestamp"}
+
+def test_fleet_shape_and_physics():
+    df = generate_fleet_data(200, 500, seed=0)
+    assert df.shape == (100_000, 8)
+    assert df["machine_id"].n_unique() == 200
+
+    # %5 anomali, proses sıcaklığı ~10 K fazla, RPM ile tork ters ilişkili
+    assert abs(df["anomaly"].mean() - 0.05) < 0.005
+    assert abs((df["process_temp"] - df["air_temp"]).mean() - 10) < 0.05
+    normal = df.filter(~pl.col("anomaly"))
+    assert np.corrcoef(normal["rpm"], normal["torque"])[0, 1] < -0.2
+    assert df.filter(pl.col("anomaly"))["torque"].mean() > normal["torque"].mean() + 25
+
+def test_machine_streams_are_reproducible_and_stateful():
+    one_shot = FleetSimulator(5, seed=7, start="2024-01-01").generate(20)
+
+    # Aynı seed, parçalı üretimde de aynı akışı vermeli
+    batched = pl.concat(list(FleetSimulator(5, seed=7, start="2024-01-01").stream(20, batch_ticks=6)))
+    assert batched.equals(one_shot)
+
+    # Makine akışı filo boyutundan bağımsız
+    bigger = FleetSimulator(8, seed=7, start="2024-01-01").generate(20)
+    machine = pl.col("machine_id") == "M00002"
+    assert bigger.filter(machine).equals(one_shot.filter(machine))
+
+    # Aşınma tick başına 1 artar (takım değişiminde sıfırlanır)
+    history = one_shot.filter(machine)
+    wear = history["tool_wear"].to_numpy() - 100 * history["anomaly"].to_numpy()
+    assert set(np.diff(wear).tolist()) <= {1, -FleetSimulator.MAX_TOOL_WEAR}
+    assert 0 <= wear.min() and wear.max() <= FleetSimulator.MAX_TOOL_WEAR
+
+    timestamps = one_shot.filter(machine)["timestamp"]
+    assert timestamps.diff().drop_nulls().dt.total_milliseconds().unique().to_list() == [1000]
+
+def test_write_parquet(tmp_path):
+    path = tmp_path / "fleet.parquet"
+    rows = FleetSimulator(10, seed=1).write_parquet(str(path), n_ticks=25, batch_ticks=10)
+    assert rows == 250
+    assert pl.read_parquet(path).height == 250
@@ -0,0 +1,53 @@
+import numpy as np
+import polars as pl
+from src.training_cache import load_training_data, cache_key
+
+def make_config(tmp_path, features):
+    rng = np.random.default_rng(0)
+    n = 200
+    path = tmp_path / "processed.csv"
+    pl.DataFrame({
+        "rpm": rng.integers(1200, 2800, n),
+        "torque": rng.normal(40, 10, n),
+        "tool_wear": rng.integers(0, 250, n),
+        "target": (rng.random(n) < 0.2).astype(int),
+    }).write_csv(path)
+    return {
+        "base": {"random_state": 42, "test_size": 0.2},
+        "data": {"processed_path": str(path)},
+        "features": {"numerical": features, "target": "target"},
+        "tuning": {"cv_folds": 3},
+        "training_cache": {"path": str(tmp_path / "cache"), "dtype": "float32"},
+    }
+
+def test_training_cache_builds_once_and_memory_maps(tmp_path):
+    config = make_config(tmp_path, ["rpm", "torque", "tool_wear"])
+
+    X_train, X_test, y_train, y_test, folds = load_training_data(config)
+    assert isinstance(X_train, np.memmap)
+    assert X_train.dtype == np.float32
+    assert X_train.shape == (160, 3) and X_test.shape == (40, 3)
+
+    # Fold'lar eğitim kümesini ayrık ve eksiksiz bölmeli, sınıf oranı korunmalı
+    assert len(folds) == 3
+    valid = np.concatenate([valid_idx for _, valid_idx in folds])
+    assert sorted(valid.tolist()) == list(range(len(y_train)))
+
+    # İkinci çağrı cache'ten okumalı (dosyalar yeniden yazılmamalı)
+    meta = tmp_path / "cache" / cache_key(config) / "meta.json"
+    mtime = meta.stat().st_mtime_ns
+    X_train_again, *_ = load_training_data(config)
+    assert meta.stat().st_mtime_ns == mtime
+    assert np.array_equal(X_train, X_train_again)
+
+def test_training_cache_key_depends_on_features_and_content(tmp_path):
+    config = make_config(tmp_path, ["rpm", "torque"])
+    key = cache_key(config)
+
+    config["features"]["numerical"] = ["rpm", "torque", "tool_wear"]
+    assert cache_key(config) != key
+
+    config["features"]["numerical"] = ["rpm", "torque"]
+    with open(config["data"]["processed_path"], "a") as f:
+        f.write("1500,40.0,10,0\n")
+    assert cache_key(config) != key
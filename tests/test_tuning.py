@@ -0,0 +1,57 @@
+import optuna
+from sklearn.datasets import make_classification
+from src.tuning import tune, make_storage
+
+def make_config(tmp_path, n_trials, n_workers):
+    return {
+        "base": {"random_state": 0},
+        "tuning": {
+            "n_trials": n_trials,
+            "n_workers": n_workers,
+            "cv_folds": 3,
+            "pruner": "median",
+            "storage": str(tmp_path / "study.log"),
+            "study_name": "test_study",
+        },
+    }
+
+def test_tune_runs_in_parallel_and_resumes(tmp_path):
+    """
+    Çalışma kalıcı storage'da tutulmalı; tekrar çalıştırıldığında kaldığı yerden devam etmeli.
+    """
+    X, y = make_classification(n_samples=120, n_features=5, random_state=0)
+
+    study = tune(X, y, make_config(tmp_path, n_trials=4, n_workers=2))
+    finished = [t for t in study.trials if t.state in (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)]
+    assert len(finished) >= 4
+    assert 0.0 <= study.best_value <= 1.0
+
+    # Her tamamlanan deneme fold başına ara skor raporlamalı
+    complete = [t for t in finished if t.state == optuna.trial.TrialState.COMPLETE]
+    assert all(len(t.intermediate_values) == 3 for t in complete)
+
+    # Devam: hedef artırılınca sadece eksik denemeler koşmalı
+    resumed = tune(X, y, make_config(tmp_path, n_trials=6, n_workers=1))
+    assert len(resumed.trials) == max(6, len(study.trials))
+
+def test_tune_supports_other_model_families(tmp_path):
+    X, y = make_classification(n_samples=120, n_features=5, random_state=0)
+    config = make_config(tmp_path, n_trials=2, n_workers=1)
+    config["model"] = {"family": "hist_gradient_boosting"}
+
+    study = tune(X, y, config)
+    assert study.study_name == "test_study-hist_gradient_boosting"
+    assert "learning_rate" in study.best_params
+
+def test_tune_recovers_interrupted_trials(tmp_path):
+    X, y = make_classification(n_samples=120, n_features=5, random_state=0)
+    config = make_config(tmp_path, n_trials=2, n_workers=1)
+
+    # Çöken bir çalışmayı taklit et: RUNNING durumunda kalmış deneme
+    study = optuna.create_study(study_name="test_study", storage=make_storage(config["tuning"]["storage"]), direction="maximize")
+    trial = study.ask({"n_estimators": optuna.distributions.IntDistribution(50, 300)})
+
+    resumed = tune(X, y, config)
+    states = [t.state for t in resumed.trials]
+    assert optuna.trial.TrialState.RUNNING not in states
+    assert states[0] == optuna.trial.TrialState.FAIL